@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import timeit
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, cast
+from uuid import UUID, uuid4
+
+import click
+from dotenv import load_dotenv
+from edgedb import create_async_client
+
+from swole_v2.database.repositories.base import to_columns, to_rows
+from swole_v2.dependencies.settings import get_settings
+from swole_v2.errors.exceptions import BusinessError
+from swole_v2.errors.messages import FIELD_CANNOT_BE_EMPTY
+from swole_v2.schemas import SetAdd
+from swole_v2.schemas.validators import check_date_format, check_non_empty
+
+from .db import ROOT_PATH
+
+if TYPE_CHECKING:
+    from edgedb import AsyncIOClient
+    from pydantic import ValidationInfo, ValidatorFunctionWrapHandler
+
+LEGACY_SET_INSERT = """
+    FOR data IN array_unpack(<array<json>>$data) UNION (
+        INSERT ExerciseSet {
+            weight := <int64>data['weight'],
+            rep_count := <int64>data['rep_count'],
+            workout := (SELECT Workout FILTER .id = <uuid>data['workout_id']),
+            exercise := (SELECT Exercise FILTER .id = <uuid>data['exercise_id'])
+        }
+    )
+"""
+TYPED_SET_INSERT = """
+    WITH
+        weights := <array<int64>>$weight,
+        rep_counts := <array<int64>>$rep_count,
+        workout_ids := <array<uuid>>$workout_id,
+        exercise_ids := <array<uuid>>$exercise_id
+    FOR i IN range_unpack(range(0, len(weights))) UNION (
+        INSERT ExerciseSet {
+            weight := weights[i],
+            rep_count := rep_counts[i],
+            workout := (SELECT Workout FILTER .id = workout_ids[i]),
+            exercise := (SELECT Exercise FILTER .id = exercise_ids[i])
+        }
+    )
+"""
+SET_FIXTURE = """
+    WITH user := (INSERT User {username := <str>$username, hashed_password := '', disabled := false})
+    SELECT {
+        workout_id := (INSERT Workout {name := 'Bench', date := <cal::local_date>'2020-01-01', user := user}).id,
+        exercise_id := (INSERT Exercise {name := 'Bench', user := user}).id
+    }
+"""
+
+# Runs in a fresh interpreter, since only the first import of the app pays for loading its modules
+STARTUP_SCRIPT = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from swole_v2.app import SwoleApp
+imported = time.perf_counter()
+app = SwoleApp().app
+built = time.perf_counter()
+from httpx import ASGITransport, AsyncClient
+async def serve():
+    # The lifespan runs like it does in a worker, warming up the queries before the first request is served
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            (await client.get("/health/live")).raise_for_status()
+        return ready, time.perf_counter()
+ready, served = asyncio.run(serve())
+deferred = [name for name in ("passlib", "jose", "edgedb") if name not in sys.modules]
+timings = {"import": imported - started, "build": built - imported, "lifespan": ready - built, "first_request": served - ready}
+print(json.dumps({**timings, "deferred": deferred}))
+"""
+
+
+class FieldInfo:
+    """Stands in for the validation info pydantic passes to the checks, which only read the field's name."""
+
+    field_name = "name"
+
+
+# The wrap validators never call pydantic's handler, so none is needed to call them directly
+HANDLER = cast("ValidatorFunctionWrapHandler", None)
+INFO = cast("ValidationInfo", FieldInfo())
+
+
+class Rollback(Exception):
+    """Raised to roll back the transaction a database benchmark runs in."""
+
+
+@click.group()
+def bench() -> None:
+    """Runs micro-benchmarks against the hot paths of the API."""
+
+
+@bench.command()
+@click.option("--size", default=10_000, show_default=True, help="Number of items in each payload.")
+@click.option("--repeat", default=5, show_default=True, help="Number of timed runs; the best one is reported.")
+def validators(size: int, repeat: int) -> None:
+    """Compares the field validators against their previous implementations."""
+    names = [f"  Workout {i}  " for i in range(size)]
+    dates = [(date(2020, 1, 1) + timedelta(days=i % 1000)).isoformat() for i in range(size)]
+    _report(
+        "non-empty check",
+        repeat,
+        lambda: [_legacy_check_non_empty(n, HANDLER, INFO) for n in names],
+        lambda: [check_non_empty(n, HANDLER, INFO) for n in names],
+    )
+    _report(
+        "date format",
+        repeat,
+        lambda: [_legacy_check_date_format(d) for d in dates],
+        lambda: [check_date_format(d) for d in dates],
+    )
+
+
+@bench.command()
+@click.option("--size", default=10_000, show_default=True, help="Number of sets in each batch.")
+@click.option("--repeat", default=5, show_default=True, help="Number of timed runs; the best one is reported.")
+@click.option(
+    "--database", is_flag=True, help="Also time the inserts against the database, inside rolled back transactions."
+)
+def params(size: int, repeat: int, database: bool) -> None:
+    """Compares sending /sets/add batches as JSON strings against typed arrays."""
+    data = _sets(size, uuid4(), uuid4())
+    _report(
+        "set encoding",
+        repeat,
+        lambda: [d.model_dump_json() for d in data],
+        lambda: to_columns(SetAdd, to_rows(data, unique=False)),
+    )
+    if database:
+        if os.getenv("EDGEDB_INSTANCE") is None:
+            load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+        before_time, after_time = asyncio.run(_time_set_inserts(size, repeat))
+        _echo("set insert", before_time, after_time)
+
+
+@bench.command()
+@click.option("--repeat", default=5, show_default=True, help="Number of fresh interpreters; the best one is reported.")
+def startup(repeat: int) -> None:
+    """Times importing the app, building it, starting it up and serving its first request in a fresh interpreter."""
+    if os.getenv("EDGEDB_INSTANCE") is None:
+        load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+    runs = [_time_startup() for _ in range(repeat)]
+    for stage in ("import", "build", "lifespan", "first_request"):
+        click.echo(f"{stage:<16} {min(run[stage] for run in runs) * 1000:9.2f}ms")
+    click.echo(f"{'deferred':<16} {', '.join(runs[0]['deferred']) or 'nothing'}")
+
+
+def _time_startup() -> dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, check=True, text=True, env=os.environ
+    )
+    timings: dict[str, Any] = json.loads(result.stdout)
+    return timings
+
+
+async def _time_set_inserts(size: int, repeat: int) -> tuple[float, float]:
+    client = create_async_client(dsn=get_settings().EDGEDB_INSTANCE)
+    try:
+        before = [await _time_set_insert(client, size, typed=False) for _ in range(repeat)]
+        after = [await _time_set_insert(client, size, typed=True) for _ in range(repeat)]
+        return min(before), min(after)
+    finally:
+        await client.aclose()  # type: ignore[no-untyped-call]
+
+
+async def _time_set_insert(client: AsyncIOClient, size: int, typed: bool) -> float:
+    elapsed = 0.0
+    try:
+        async for transaction in client.transaction():
+            async with transaction:
+                fixture = await transaction.query_required_single(SET_FIXTURE, username=f"bench_{uuid4()}")
+                data = _sets(size, fixture.workout_id, fixture.exercise_id)
+                started = time.perf_counter()
+                if typed:
+                    await transaction.query(TYPED_SET_INSERT, **to_columns(SetAdd, to_rows(data, unique=False)))
+                else:
+                    await transaction.query(LEGACY_SET_INSERT, data=[d.model_dump_json() for d in data])
+                elapsed = time.perf_counter() - started
+                raise Rollback
+    except Rollback:
+        pass
+    return elapsed
+
+
+def _sets(size: int, workout_id: UUID, exercise_id: UUID) -> list[SetAdd]:
+    return [
+        SetAdd.model_construct(
+            rep_count=i % 500 + 1, weight=i % 10000 + 1, workout_id=workout_id, exercise_id=exercise_id
+        )
+        for i in range(size)
+    ]
+
+
+def _report(label: str, repeat: int, before: Callable[[], Any], after: Callable[[], Any]) -> None:
+    before_time = min(timeit.repeat(before, number=1, repeat=repeat))
+    after_time = min(timeit.repeat(after, number=1, repeat=repeat))
+    _echo(label, before_time, after_time)
+
+
+def _echo(label: str, before_time: float, after_time: float) -> None:
+    click.echo(
+        f"{label:<16} before {before_time * 1000:9.2f}ms  after {after_time * 1000:9.2f}ms  "
+        f"speedup {before_time / after_time:6.2f}x"
+    )
+
+
+def _legacy_check_non_empty(value: str, _: ValidatorFunctionWrapHandler, info: ValidationInfo) -> str:
+    if not re.compile(r"(.|\s)*\S(.|\s)*").match(value):
+        raise BusinessError(FIELD_CANNOT_BE_EMPTY.format(info.field_name))
+    return value
+
+
+def _legacy_check_date_format(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
@@ -1,58 +1,312 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
 from pathlib import Path
-from random import choice
-from typing import TYPE_CHECKING
+from random import Random
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
 import click
 from dotenv import load_dotenv
+from edgedb import create_async_client
 
+from swole_v2.database.queries import generated as queries
+from swole_v2.database.repositories import PurgeRepository, VolumeRepository
+from swole_v2.database.repositories.base import chunked, to_columns, to_rows
 from swole_v2.dependencies.passwords import hash_password
 from swole_v2.dependencies.settings import get_settings
-from tests.factories import Sample
+from swole_v2.jobs.purge import Purge
+from swole_v2.models import PurgeSummary
+from swole_v2.schemas import SetAdd, WorkoutCreate
 
 if TYPE_CHECKING:
+    from edgedb import AsyncIOClient
+
     from swole_v2.settings import Settings
 
 
 ROOT_PATH = Path(__file__).resolve().parents[1]
 
+EXERCISE_NAMES = [
+    "Bench Press",
+    "Squat",
+    "Deadlift",
+    "Overhead Press",
+    "Barbell Row",
+    "Pull Up",
+    "Dip",
+    "Lunge",
+    "Romanian Deadlift",
+    "Incline Press",
+]
+WORKOUT_NAMES = ["Push", "Pull", "Legs", "Upper", "Lower", "Full Body"]
+# Workouts are dated from a fixed day so the same seed always produces the same dataset
+START_DATE = date(2020, 1, 1)
+EXERCISES_PER_WORKOUT = 4
+
+
+@dataclass(frozen=True)
+class Profile:
+    users: int
+    workouts_per_user: int
+    exercises_per_user: int
+    sets_per_workout: int
+
+    @property
+    def total_sets(self) -> int:
+        return self.users * self.workouts_per_user * self.sets_per_workout
+
+
+PROFILES = {
+    "small": Profile(users=10, workouts_per_user=20, exercises_per_user=15, sets_per_workout=10),
+    "medium": Profile(users=100, workouts_per_user=150, exercises_per_user=30, sets_per_workout=20),
+    "huge": Profile(users=1000, workouts_per_user=250, exercises_per_user=40, sets_per_workout=20),
+}
+
+
+@dataclass
+class SeedStats:
+    started: float = field(default_factory=time.perf_counter)
+    rows: dict[str, int] = field(default_factory=lambda: {"users": 0, "exercises": 0, "workouts": 0, "sets": 0})
+
+    def add(self, table: str, count: int) -> None:
+        self.rows[table] += count
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.rows.values())
+        counts = ", ".join(f"{count} {table}" for table, count in self.rows.items())
+        return f"Inserted {counts} in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)."
+
 
 @click.command()
-def seed() -> None:
+@click.option("--profile", type=click.Choice([*PROFILES]), default="small", show_default=True, help="Dataset size.")
+@click.option("--seed", "random_seed", default=42, show_default=True, help="Random seed for a reproducible dataset.")
+@click.option("--concurrency", default=8, show_default=True, help="Number of users seeded in parallel.")
+@click.option("--batch-size", default=1000, show_default=True, help="Max rows inserted per statement.")
+def seed(profile: str, random_seed: int, concurrency: int, batch_size: int) -> None:
     """Seeds the development database."""
     if os.getenv("EDGEDB_INSTANCE") is None:
         load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
     settings = get_settings()
     try:
-        click.secho(f"Seeding {settings.EDGEDB_INSTANCE} instance...", fg="blue", bold=True)
-        asyncio.run(create_instances(settings))
-        click.secho("Seeding complete.", fg="green", bold=True)
+        dataset = PROFILES[profile]
+        click.secho(
+            f"Seeding {settings.EDGEDB_INSTANCE} instance with the {profile} profile ({dataset.total_sets:,} sets)...",
+            fg="blue",
+            bold=True,
+        )
+        seeder = Seeder(settings, dataset, random_seed, concurrency, batch_size)
+        stats = asyncio.run(seeder.run())
+        click.secho(f"Seeding complete. {stats.report()}", fg="green", bold=True)
     except Exception as e:
         click.secho(f"Exception when adding instances to database:\n\n {e!s}", fg="red")
 
 
-async def create_instances(settings: Settings) -> None:
-    sample = Sample()
-    # Create admin user
-    admin = await sample.user(
-        username=settings.DUMMY_USERNAME,
-        hashed_password=await hash_password(settings.DUMMY_PASSWORD),
-        disabled=False,
+@click.command()
+def rebuild_volume() -> None:
+    """Recomputes every user's weekly and monthly volume from their sets."""
+    if os.getenv("EDGEDB_INSTANCE") is None:
+        load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+    count = asyncio.run(_rebuild_volume(get_settings()))
+    click.secho(f"Rebuilt the volume of {count} users.", fg="green", bold=True)
+
+
+async def _rebuild_volume(settings: Settings) -> int:
+    client = create_async_client(dsn=settings.EDGEDB_INSTANCE)
+    try:
+        repository = VolumeRepository(client, settings)
+        users = json.loads(await queries.volume_users(client))
+        for user in users:
+            await repository.rebuild(UUID(user["id"]))
+        return len(users)
+    finally:
+        await client.aclose()  # type: ignore[no-untyped-call]
+
+
+@click.command()
+def purge() -> None:
+    """Removes every deleted workout and exercise whose background purge didn't finish."""
+    if os.getenv("EDGEDB_INSTANCE") is None:
+        load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+    summary = asyncio.run(_purge(get_settings()))
+    click.secho(
+        f"Purged {summary.workouts} workouts, {summary.exercises} exercises and {summary.sets} sets.",
+        fg="green",
+        bold=True,
     )
-    # Create other users
-    users = await sample.users(size=10)
-
-    # Create workout and exercise instances
-    for _ in range(20):
-        user = choice([*users, admin])
-
-        # Create some workouts without exercises
-        workouts = await sample.workouts(user=user, size=choice(range(10, 20)))
-        # Create some exercises without workouts
-        exercises = await sample.exercises(user=user, size=choice(range(10, 20)))
-        # Add some sets to the exercises
-        for _ in range(5):
-            await sample.sets(workout=choice(workouts), exercise=choice(exercises), size=choice(range(10)))
+
+
+async def _purge(settings: Settings) -> PurgeSummary:
+    client = create_async_client(dsn=settings.EDGEDB_INSTANCE)
+    try:
+        repository = PurgeRepository(client, settings)
+        total = PurgeSummary()
+        for user_id in await repository.users():
+            summary = await Purge(repository, user_id, settings.PURGE_CHUNK_SIZE)()
+            total = PurgeSummary(
+                sets=total.sets + summary.sets,
+                workouts=total.workouts + summary.workouts,
+                exercises=total.exercises + summary.exercises,
+            )
+        return total
+    finally:
+        await client.aclose()  # type: ignore[no-untyped-call]
+
+
+class Seeder:
+    def __init__(
+        self, settings: Settings, profile: Profile, random_seed: int, concurrency: int, batch_size: int
+    ) -> None:
+        self.settings = settings
+        self.profile = profile
+        self.random_seed = random_seed
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats = SeedStats()
+        self.client: AsyncIOClient = create_async_client(dsn=settings.EDGEDB_INSTANCE, max_concurrency=concurrency)
+
+    async def run(self) -> SeedStats:
+        # Every user shares one hash, bcrypt is far too slow to run once per generated user
+        hashed_password = await hash_password(self.settings.DUMMY_PASSWORD)
+        usernames = [self.settings.DUMMY_USERNAME, *(f"user_{self.random_seed}_{i}" for i in range(self.profile.users))]
+        user_ids: list[UUID] = []
+        for batch in chunked(usernames, self.batch_size):
+            user_ids += await self.insert_users(batch, hashed_password)
+        await asyncio.gather(*(self.seed_user(user_id, index) for index, user_id in enumerate(user_ids)))
+        await self.client.aclose()  # type: ignore[no-untyped-call]
+        return self.stats
+
+    async def seed_user(self, user_id: UUID, index: int) -> None:
+        async with self.semaphore:
+            # Each user gets its own generator so the dataset doesn't depend on the order tasks run in
+            random = Random(f"{self.random_seed}-{index}")
+            exercise_ids = await self.insert_exercises(user_id, random)
+            workouts = self.generate_workouts(random)
+            # Every workout gets the same number of exercises, so their ids can be sent as one flat array
+            per_workout = min(len(exercise_ids), EXERCISES_PER_WORKOUT)
+            workout_exercises = [random.sample(exercise_ids, k=per_workout) for _ in workouts]
+            workout_ids = []
+            for workout_batch in chunked(list(zip(workouts, workout_exercises, strict=True)), self.batch_size):
+                workout_ids += await self.insert_workouts(user_id, workout_batch, per_workout)
+            sets = [
+                exercise_set
+                for workout_id, exercises in zip(workout_ids, workout_exercises, strict=True)
+                for exercise_set in self.generate_sets(random, workout_id, exercises)
+            ]
+            for batch in chunked(sets, self.batch_size):
+                await self.insert_sets(batch)
+            # Sets are inserted directly rather than through the repositories, so the rollups are built afterwards
+            await VolumeRepository(self.client, self.settings).rebuild(user_id)
+
+    def generate_workouts(self, random: Random) -> list[WorkoutCreate]:
+        # The values are generated within the schemas' limits, so validating them would only slow seeding down
+        return [
+            WorkoutCreate.model_construct(name=random.choice(WORKOUT_NAMES), date=START_DATE + timedelta(days=day))
+            for day in range(self.profile.workouts_per_user)
+        ]
+
+    def generate_sets(self, random: Random, workout_id: UUID, exercise_ids: list[UUID]) -> list[SetAdd]:
+        return [
+            SetAdd.model_construct(
+                rep_count=random.randint(1, 500),
+                weight=random.randint(1, 10000),
+                workout_id=workout_id,
+                exercise_id=random.choice(exercise_ids),
+            )
+            for _ in range(self.profile.sets_per_workout)
+        ]
+
+    async def insert_users(self, usernames: list[str], hashed_password: str) -> list[UUID]:
+        users = await self.insert(
+            "users",
+            """
+            FOR username IN array_unpack(<array<str>>$data) UNION (
+                INSERT User {
+                    username := username,
+                    hashed_password := <str>$hashed_password,
+                    email := username ++ '@example.com',
+                    disabled := false
+                }
+            )
+            """,
+            data=usernames,
+            hashed_password=hashed_password,
+        )
+        return [UUID(user["id"]) for user in users]
+
+    async def insert_exercises(self, user_id: UUID, random: Random) -> list[UUID]:
+        names = [f"{random.choice(EXERCISE_NAMES)} {i}" for i in range(self.profile.exercises_per_user)]
+        exercises = await self.insert(
+            "exercises",
+            """
+            FOR name IN array_unpack(<array<str>>$data) UNION (
+                INSERT Exercise {name := name, user := (SELECT User FILTER .id = <uuid>$user_id)}
+            )
+            """,
+            data=names,
+            user_id=user_id,
+        )
+        return [UUID(exercise["id"]) for exercise in exercises]
+
+    async def insert_workouts(
+        self, user_id: UUID, workouts: list[tuple[WorkoutCreate, list[UUID]]], per_workout: int
+    ) -> list[UUID]:
+        inserted = await self.insert(
+            "workouts",
+            """
+            WITH
+                names := <array<str>>$name,
+                dates := <array<cal::local_date>>$date,
+                exercise_ids := <array<uuid>>$exercise_id,
+                per_workout := <int64>$per_workout
+            FOR i IN range_unpack(range(0, len(names))) UNION (
+                INSERT Workout {
+                    name := names[i],
+                    date := dates[i],
+                    user := (SELECT User FILTER .id = <uuid>$user_id),
+                    exercises := (
+                        SELECT Exercise
+                        FILTER .id IN array_unpack(exercise_ids[i * per_workout:(i + 1) * per_workout])
+                    )
+                }
+            )
+            """,
+            **to_columns(WorkoutCreate, to_rows([workout for workout, _ in workouts], unique=False)),
+            exercise_id=[exercise_id for _, exercise_ids in workouts for exercise_id in exercise_ids],
+            per_workout=per_workout,
+            user_id=user_id,
+        )
+        return [UUID(workout["id"]) for workout in inserted]
+
+    async def insert_sets(self, sets: list[SetAdd]) -> None:
+        await self.insert(
+            "sets",
+            """
+            WITH
+                rep_counts := <array<int64>>$rep_count,
+                weights := <array<int64>>$weight,
+                workout_ids := <array<uuid>>$workout_id,
+                exercise_ids := <array<uuid>>$exercise_id
+            FOR i IN range_unpack(range(0, len(weights))) UNION (
+                INSERT ExerciseSet {
+                    weight := weights[i],
+                    rep_count := rep_counts[i],
+                    workout := (SELECT Workout FILTER .id = workout_ids[i]),
+                    exercise := (SELECT Exercise FILTER .id = exercise_ids[i])
+                }
+            )
+            """,
+            **to_columns(SetAdd, to_rows(sets, unique=False)),
+        )
+
+    async def insert(self, table: str, query: str, **kwargs: Any) -> list[dict[str, Any]]:
+        # Statements return bare objects, so only the ids come back over the wire
+        results = json.loads(await self.client.query_json(query, **kwargs))
+        self.stats.add(table, len(results))
+        return results
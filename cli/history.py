@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from dotenv import load_dotenv
+
+from swole_v2.database.database import get_async_client
+from swole_v2.database.repositories import HistoryRepository, UserRepository
+from swole_v2.dependencies.settings import get_settings
+from swole_v2.errors.exceptions import BusinessError
+from swole_v2.history.importer import HistoryImporter
+from swole_v2.history.parsers import HistoryFormat, read_rows
+
+if TYPE_CHECKING:
+    from swole_v2.models import ImportSummary
+    from swole_v2.settings import Settings
+
+ROOT_PATH = Path(__file__).resolve().parents[1]
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--username", help="User the history belongs to. Defaults to the dummy user.")
+@click.option("--resume-from", default=0, show_default=True, help="Number of rows already imported to skip.")
+@click.option("--batch-size", type=int, help="Rows committed per transaction. Defaults to IMPORT_BATCH_SIZE.")
+def import_history(path: Path, username: str | None, resume_from: int, batch_size: int | None) -> None:
+    """Imports a CSV or JSON history file into the database."""
+    if os.getenv("EDGEDB_INSTANCE") is None:
+        load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+    settings = get_settings()
+    try:
+        summary = asyncio.run(run_import(settings, path, username or settings.DUMMY_USERNAME, resume_from, batch_size))
+        click.secho(f"Import complete. {summary.sets} sets from {summary.rows} rows.", fg="green", bold=True)
+    except BusinessError as e:
+        click.secho(f"Import stopped: {e!s}", fg="red")
+
+
+async def run_import(
+    settings: Settings, path: Path, username: str, resume_from: int, batch_size: int | None
+) -> ImportSummary:
+    client = get_async_client()
+    if (user := await UserRepository(client, settings).get_user_by_username(username)) is None:
+        raise BusinessError(f"User {username} does not exist")
+    importer = HistoryImporter(
+        HistoryRepository(client, settings), batch_size or settings.IMPORT_BATCH_SIZE, on_progress=report_progress
+    )
+    with path.open("rb") as stream:
+        return await importer.run(user.id, read_rows(stream, HistoryFormat.from_filename(path.name)), resume_from)
+
+
+def report_progress(summary: ImportSummary) -> None:
+    click.echo(f"Committed {summary.rows} rows ({summary.sets} sets) in {summary.batches} batches")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import click
+
+from swole_v2.database.queries.shapes import PROJECTED
+
+from .db import ROOT_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+QUERIES_PATH = ROOT_PATH.joinpath("src", "swole_v2", "database", "queries")
+GENERATED_PATH = QUERIES_PATH.joinpath("generated.py")
+# Matches parameter casts like <uuid>$user_id, <optional int64>$weight and <array<cal::local_date>>$date
+PARAMETER = re.compile(r"<((?:optional )?[\w:]+(?:<[\w:]+>)?)>\$(\w+)")
+# Statements whose shape callers can narrow down take an extra fields argument
+PROJECTED_ARGUMENT = "    fields: tuple[str, ...] | None = None,\n"
+PYTHON_TYPES = {
+    "bool": "bool",
+    "cal::local_date": "date",
+    "int64": "int",
+    "json": "str",
+    "str": "str",
+    "uuid": "UUID",
+}
+HEADER = """\
+# Generated by `just generate-queries` from the .edgeql files next to this module, do not edit it by hand.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .shapes import project
+
+if TYPE_CHECKING:
+    from datetime import date
+    from uuid import UUID
+
+    from edgedb import AsyncIOExecutor
+"""
+
+
+@dataclass(frozen=True)
+class Query:
+    name: str
+    text: str
+    parameters: dict[str, str]
+
+    @property
+    def constant(self) -> str:
+        return self.name.upper()
+
+    @property
+    def projected(self) -> bool:
+        return PROJECTED.search(self.text) is not None
+
+
+@click.command()
+@click.option("--check", is_flag=True, help="Fail instead of writing when the generated module is out of date.")
+def generate_queries(check: bool) -> None:
+    """Generates typed query functions from the .edgeql files in the query catalog."""
+    source = render(read_queries(QUERIES_PATH))
+    if check:
+        if GENERATED_PATH.read_text() != source:
+            raise click.ClickException("The generated queries are out of date, run 'just generate-queries'.")
+        return
+    GENERATED_PATH.write_text(source)
+    click.secho(f"Generated {GENERATED_PATH.relative_to(ROOT_PATH)}.", fg="green")
+
+
+def read_queries(path: Path) -> list[Query]:
+    # Queries are named after their folder and file, e.g. workouts/detail.edgeql becomes workouts_detail
+    return [parse(f"{file.parent.name}_{file.stem}", file.read_text()) for file in sorted(path.glob("*/*.edgeql"))]
+
+
+def parse(name: str, text: str) -> Query:
+    parameters: dict[str, str] = {}
+    for kind, parameter in PARAMETER.findall(text):
+        if parameters.setdefault(parameter, kind) != kind:
+            raise click.ClickException(f"${parameter} is cast to both {parameters[parameter]} and {kind} in {name}.")
+    return Query(name, text, parameters)
+
+
+def python_type(kind: str) -> str:
+    if kind.startswith("optional "):
+        return f"{python_type(kind.removeprefix('optional '))} | None"
+    if kind.startswith("array<"):
+        return f"list[{python_type(kind.removeprefix('array<').removesuffix('>'))}]"
+    try:
+        return PYTHON_TYPES[kind]
+    except KeyError as error:
+        raise click.ClickException(f"No Python type for the EdgeQL type {kind}.") from error
+
+
+def render(queries: list[Query]) -> str:
+    blocks = [HEADER]
+    for query in queries:
+        blocks.append(f'{query.constant} = """\\\n{query.text}"""\n')
+        blocks.append(render_function(query))
+    queries_mapping = render_mapping({query.name: query.constant for query in queries})
+    parameters_mapping = render_mapping(
+        {
+            query.name: render_mapping({name: f'"{kind}"' for name, kind in query.parameters.items()}, indent=4)
+            for query in queries
+        }
+    )
+    blocks.append(f"QUERIES: dict[str, str] = {queries_mapping}\n")
+    blocks.append(f"PARAMETERS: dict[str, dict[str, str]] = {parameters_mapping}\n")
+    return "\n\n".join(blocks)
+
+
+def render_function(query: Query) -> str:
+    arguments = "".join(f"    {name}: {python_type(kind)},\n" for name, kind in query.parameters.items())
+    keywords = "".join(f"        {name}={name},\n" for name in query.parameters)
+    statement = query.constant
+    if query.projected:
+        arguments += PROJECTED_ARGUMENT
+        statement = f"project({query.constant}, fields)"
+    keyword_only = "    *,\n" if arguments else ""  # A bare * is a syntax error when nothing follows it
+    return (
+        f"async def {query.name}(\n"
+        f"    executor: AsyncIOExecutor,\n"
+        f"{keyword_only}"
+        f"{arguments}"
+        f") -> str:\n"
+        f"    return await executor.query_json(\n"
+        f"        {statement},\n"
+        f"{keywords}"
+        f"    )\n"
+    )
+
+
+def render_mapping(items: dict[str, str], indent: int = 0) -> str:
+    if not items:
+        return "{}"
+    padding = " " * indent
+    lines = "".join(f'{padding}    "{key}": {value},\n' for key, value in items.items())
+    return f"{{\n{lines}{padding}}}"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import click
+from dotenv import load_dotenv
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from swole_v2.dependencies.settings import get_settings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from swole_v2.settings import Settings
+
+ROOT_PATH = Path(__file__).resolve().parents[1]
+CPU_MAX_PATH = Path("/sys/fs/cgroup/cpu.max")
+SOMAXCONN_PATH = Path("/proc/sys/net/core/somaxconn")
+SHARED_MEMORY_PATH = Path("/dev/shm")
+
+
+class SwoleWorker(UvicornWorker):
+    # Named explicitly rather than left on "auto", which quietly falls back to asyncio and h11 when they're missing
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}  # noqa: RUF012
+
+
+def available_cpus() -> int:
+    """Counts the CPUs this process may run on, honouring affinity masks and container CPU quotas."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        quota, period = CPU_MAX_PATH.read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def max_backlog(requested: int) -> int:
+    # The kernel silently truncates anything above somaxconn, so the effective value is reported instead
+    try:
+        return min(requested, int(SOMAXCONN_PATH.read_text()))
+    except (OSError, ValueError):
+        return requested
+
+
+def server_options(settings: Settings, cpus: int, bind: str, workers: int | None = None) -> dict[str, Any]:
+    options = {
+        "bind": bind,
+        "workers": workers or settings.SERVER_WORKERS or max(2, cpus * settings.SERVER_WORKERS_PER_CPU),
+        "worker_class": "cli.serve.SwoleWorker",
+        "keepalive": settings.SERVER_KEEP_ALIVE,
+        "backlog": max_backlog(settings.SERVER_BACKLOG),
+        "timeout": settings.SERVER_TIMEOUT,
+        "preload_app": settings.SERVER_PRELOAD,
+    }
+    # Worker heartbeats are written to a temporary file, which can block on disk backed /tmp in containers
+    if SHARED_MEMORY_PATH.is_dir():
+        options["worker_tmp_dir"] = str(SHARED_MEMORY_PATH)
+    return options
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> FastAPI:
+        from swole_v2.main import app  # noqa: PLC0415
+
+        return app
+
+
+@click.command()
+@click.option("--host", help="Address to bind to. Defaults to SERVER_HOST.")
+@click.option("--port", type=int, envvar="PORT", help="Port to bind to. Defaults to $PORT, then SERVER_PORT.")
+@click.option("--workers", type=int, help="Worker processes. Defaults to SERVER_WORKERS or one per available CPU.")
+@click.option("--dry-run", is_flag=True, help="Print the effective configuration without starting the server.")
+def serve(host: str | None, port: int | None, workers: int | None, dry_run: bool) -> None:
+    """Runs the API behind gunicorn, with worker settings derived from the machine and the settings."""
+    if os.getenv("EDGEDB_INSTANCE") is None:
+        load_dotenv(dotenv_path=ROOT_PATH.joinpath(".env"), override=True)
+    settings = get_settings()
+    cpus = available_cpus()
+    options = server_options(
+        settings, cpus, f"{host or settings.SERVER_HOST}:{port or settings.SERVER_PORT}", workers=workers
+    )
+    click.echo(f"{'cpus':<16} {cpus}")
+    for key, value in {**options, **SwoleWorker.CONFIG_KWARGS}.items():
+        click.echo(f"{key:<16} {value}")
+    click.echo(f"{'db in flight':<16} {settings.DATABASE_MAX_IN_FLIGHT} per worker")
+    if not dry_run:
+        Server(options).run()
+
+
+if __name__ == "__main__":
+    # Run as a module by the Procfile, images installed with --no-root don't get the poetry scripts
+    serve()
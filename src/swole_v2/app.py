@@ -1,29 +1,51 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.exceptions import RequestValidationError
 
+from .database.database import close_async_client, get_async_client
+from .database.warmup import warm_up
 from .dependencies.settings import get_settings
 from .errors.exceptions import BusinessError
 from .errors.handlers import business_error_handler, http_exception_handler, request_validation_error_handler
+from .jobs.runner import get_job_runner
+from .middleware import (
+    CompressionMiddleware,
+    NegotiatedResponse,
+    NegotiationMiddleware,
+    ProfilerMiddleware,
+    RateLimitMiddleware,
+    TracingMiddleware,
+)
+from .routers import health
 from .routers import router as api_router
 from .schemas import ErrorResponse
+from .tracing import BackgroundExporter, get_exporter
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from .settings import Settings
 
 
 class SwoleApp:
-    def __init__(self, settings: Settings = get_settings()) -> None:
-        self.settings = settings
+    def __init__(self, settings: Settings | None = None) -> None:
+        # Settings are resolved when the app is built rather than when this module is imported
+        self.settings = settings or get_settings()
+        self.exporter: BackgroundExporter | None = None
         self.app = self.create_app()
+        self.register_middleware()
         self.register_error_handlers()
 
     def create_app(self) -> FastAPI:
         app = FastAPI(
             title="Swole App",
+            lifespan=self.lifespan,
+            default_response_class=NegotiatedResponse,
             responses={
                 status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponse},
                 status.HTTP_403_FORBIDDEN: {"model": ErrorResponse},
@@ -33,9 +55,56 @@ class SwoleApp:
         )
 
         app.include_router(api_router)
+        app.include_router(health.router)
 
         return app
 
+    @asynccontextmanager
+    async def lifespan(self, _: FastAPI) -> AsyncIterator[None]:
+        # Runs in each worker after it's forked, so the shared client is only ever created by the worker using it
+        try:
+            if self.settings.WARM_UP_QUERIES:
+                await warm_up(get_async_client())
+            runner = get_job_runner()
+            yield
+            await runner.stop(self.settings.JOB_SHUTDOWN_TIMEOUT)
+        finally:
+            await close_async_client()
+            if self.exporter is not None:
+                await asyncio.to_thread(self.exporter.close)
+
+    def register_middleware(self) -> None:
+        self.app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=self.settings.COMPRESSION_MINIMUM_SIZE,
+            levels=self.settings.COMPRESSION_LEVELS,
+            cache_size=self.settings.COMPRESSION_CACHE_SIZE,
+        )
+        # Runs before compression and routing, so rejected requests skip the rest
+        if self.settings.RATE_LIMIT_ENABLED:
+            self.app.add_middleware(RateLimitMiddleware, settings=self.settings)
+        # Runs before rate limiting, so rejections are encoded the way the client asked like any other error
+        # Binary bodies are buffered to be decoded, so they're capped like the largest upload the API accepts
+        self.app.add_middleware(
+            NegotiationMiddleware,
+            media_types=self.settings.MEDIA_TYPES,
+            max_body_size=self.settings.IMPORT_MAX_UPLOAD_SIZE,
+        )
+        # Traces cover the whole request, rate limiting included, and are exported off the event loop
+        if (exporter := get_exporter(self.settings)) is not None:
+            self.exporter = BackgroundExporter(exporter)
+            self.app.add_middleware(
+                TracingMiddleware, exporter=self.exporter, sample_rate=self.settings.TRACING_SAMPLE_RATE
+            )
+        # Added last so it runs first and profiles cover every other middleware too
+        if self.settings.PROFILER_SECRET is not None:
+            self.app.add_middleware(
+                ProfilerMiddleware,
+                secret=self.settings.PROFILER_SECRET,
+                directory=self.settings.PROFILER_DIRECTORY,
+                interval=self.settings.PROFILER_INTERVAL,
+            )
+
     def register_error_handlers(self) -> None:
         self.app.add_exception_handler(HTTPException, http_exception_handler)  # type: ignore[arg-type]
         self.app.add_exception_handler(RequestValidationError, request_validation_error_handler)  # type: ignore[arg-type]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import TYPE_CHECKING
 
 from edgedb import create_async_client
@@ -9,10 +10,23 @@ from ..dependencies.settings import get_settings
 if TYPE_CHECKING:
     from edgedb import AsyncIOClient
 
+# Keyed by process id, so a worker forked from a preloaded master never shares the master's connections
+_clients: dict[int, AsyncIOClient] = {}
+
 
 def get_async_client() -> AsyncIOClient:
-    settings = get_settings()
-    return create_async_client(
-        dsn=settings.EDGEDB_INSTANCE,
-        secret_key=settings.EDGEDB_SECRET_KEY,  # type: ignore[arg-type]
-    )
+    """Returns the client shared by every request in this process, creating it on first use."""
+    pid = os.getpid()
+    if (client := _clients.get(pid)) is None:
+        _clients.clear()
+        settings = get_settings()
+        client = _clients[pid] = create_async_client(
+            dsn=settings.EDGEDB_INSTANCE,
+            secret_key=settings.EDGEDB_SECRET_KEY,  # type: ignore[arg-type]
+        )
+    return client
+
+
+async def close_async_client() -> None:
+    if (client := _clients.pop(os.getpid(), None)) is not None:
+        await client.aclose()  # type: ignore[no-untyped-call]
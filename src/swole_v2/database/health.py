@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from edgedb import EdgeDBError
+
+from ..dependencies.settings import get_settings
+from .queries import generated as queries
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from edgedb import AsyncIOClient
+
+
+@dataclass(frozen=True)
+class Ping:
+    ok: bool
+    checked_at: float
+    latency: float | None = None  # Seconds the round trip took, when it succeeded
+    error: str | None = None
+
+
+class DatabaseProbe:
+    """Pings the database through the shared client at most once per interval.
+
+    Probes arriving while a ping is running wait for that ping rather than starting their own, so however
+    often the orchestrator and load balancers ask, each worker sends at most one ping per interval.
+    """
+
+    def __init__(self, interval: float, timeout: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.clock = clock
+        self.last: Ping | None = None
+        self.pending: asyncio.Task[Ping] | None = None
+
+    async def check(self, client: AsyncIOClient) -> Ping:
+        if self.last is not None and self.clock() - self.last.checked_at < self.interval:
+            return self.last
+        if self.pending is None:
+            self.pending = asyncio.create_task(self.ping(client))
+            self.pending.add_done_callback(self.finish)
+        # Shielded so a probe that disconnects doesn't cancel the ping the others are waiting on
+        return await asyncio.shield(self.pending)
+
+    async def ping(self, client: AsyncIOClient) -> Ping:
+        started = self.clock()
+        try:
+            await asyncio.wait_for(queries.health_ping(client), self.timeout)
+        except (EdgeDBError, OSError, asyncio.TimeoutError) as error:
+            self.last = Ping(ok=False, checked_at=self.clock(), error=type(error).__name__)
+        else:
+            self.last = Ping(ok=True, checked_at=self.clock(), latency=self.clock() - started)
+        return self.last
+
+    def finish(self, _: asyncio.Task[Ping]) -> None:
+        self.pending = None
+
+
+@lru_cache
+def get_probe() -> DatabaseProbe:
+    settings = get_settings()
+    return DatabaseProbe(interval=settings.HEALTH_CHECK_INTERVAL, timeout=settings.HEALTH_CHECK_TIMEOUT)
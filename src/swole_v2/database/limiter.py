@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException, status
+
+from ..dependencies.settings import get_settings
+from ..errors.messages import DATABASE_BUSY
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class Priority(IntEnum):
+    """Lower values are let through first when operations are queued."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass
+class LimiterStats:
+    in_flight: int = 0
+    peak_queued: int = 0
+    admitted: int = 0
+    shed: int = 0  # Rejected straight away because the queue was full
+    timed_out: int = 0  # Rejected after waiting too long in the queue
+
+
+class ConcurrencyLimiter:
+    """Caps the database operations a worker runs at once, queueing the rest by priority.
+
+    When the database slows down, requests wait here for a bounded time instead of piling up on the
+    connection pool, and anything beyond the queue is shed straight away with a 503.
+    """
+
+    def __init__(self, max_in_flight: int, max_queued: int, queue_timeout: float) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.waiters: list[tuple[Priority, int, asyncio.Future[None]]] = []
+        self.order = itertools.count()
+        self.stats = LimiterStats()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.NORMAL) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Priority) -> None:
+        if self.stats.in_flight < self.max_in_flight and not self.waiters:
+            self.stats.in_flight += 1
+            self.stats.admitted += 1
+            return
+        if len(self.waiters) >= self.max_queued:
+            self.stats.shed += 1
+            raise overloaded()
+        await self.wait(priority)
+
+    async def wait(self, priority: Priority) -> None:
+        waiter = (priority, next(self.order), asyncio.get_running_loop().create_future())
+        heapq.heappush(self.waiters, waiter)
+        self.stats.peak_queued = max(self.stats.peak_queued, len(self.waiters))
+        try:
+            await asyncio.wait_for(waiter[2], self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            self.abandon(waiter)
+            if isinstance(error, asyncio.TimeoutError):
+                self.stats.timed_out += 1
+                raise overloaded() from error
+            raise
+
+    def abandon(self, waiter: tuple[Priority, int, asyncio.Future[None]]) -> None:
+        if waiter in self.waiters:
+            self.waiters.remove(waiter)
+            heapq.heapify(self.waiters)
+        elif waiter[2].done() and not waiter[2].cancelled():
+            # The slot was handed over just as the wait ended, so it's passed on to the next waiter
+            self.release()
+
+    def release(self) -> None:
+        # A freed slot goes straight to the highest priority waiter, so in_flight only drops when nobody waits
+        while self.waiters:
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                future.set_result(None)
+                self.stats.admitted += 1
+                return
+        self.stats.in_flight -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**asdict(self.stats), "queued": len(self.waiters)}
+
+
+def overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=DATABASE_BUSY, headers={"Retry-After": "1"}
+    )
+
+
+@lru_cache
+def get_limiter() -> ConcurrencyLimiter:
+    # One limiter per worker process, shared by every request it serves
+    settings = get_settings()
+    return ConcurrencyLimiter(
+        max_in_flight=settings.DATABASE_MAX_IN_FLIGHT,
+        max_queued=settings.DATABASE_MAX_QUEUED,
+        queue_timeout=settings.DATABASE_QUEUE_TIMEOUT,
+    )
@@ -0,0 +1,1657 @@
+# Generated by `just generate-queries` from the .edgeql files next to this module, do not edit it by hand.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .shapes import project
+
+if TYPE_CHECKING:
+    from datetime import date
+    from uuid import UUID
+
+    from edgedb import AsyncIOExecutor
+
+
+EXERCISES_CREATE = """\
+WITH
+    names := <array<str>>$name,
+    notes := <array<json>>$notes,
+    exercises := (
+        FOR i IN range_unpack(range(0, len(names))) UNION (
+            INSERT Exercise {
+                name := names[i],
+                notes := <optional str>notes[i],
+                user := (
+                    SELECT User
+                    FILTER .id = <uuid>$user_id
+                )
+            }
+        )
+    )
+SELECT exercises {id, name, notes}
+"""
+
+
+async def exercises_create(
+    executor: AsyncIOExecutor,
+    *,
+    name: list[str],
+    notes: list[str],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        EXERCISES_CREATE,
+        name=name,
+        notes=notes,
+        user_id=user_id,
+    )
+
+
+EXERCISES_DELETE = """\
+WITH exercises := (
+    FOR exercise_id IN array_unpack(<array<uuid>>$exercise_id) UNION assert_exists((
+        SELECT Exercise
+        FILTER .id = exercise_id AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+    ))
+)
+# Only tombstoned here, the sets are removed later in chunks by the purge
+UPDATE exercises
+SET {deleted_at := datetime_current()}
+"""
+
+
+async def exercises_delete(
+    executor: AsyncIOExecutor,
+    *,
+    exercise_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        EXERCISES_DELETE,
+        exercise_id=exercise_id,
+        user_id=user_id,
+    )
+
+
+EXERCISES_DETAIL = """\
+WITH exercises := (
+    FOR exercise_id IN array_unpack(<array<uuid>>$exercise_id) UNION assert_exists((
+        SELECT Exercise
+        FILTER .id = exercise_id AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+    ))
+)
+SELECT exercises {id, name, notes}  # projected
+"""
+
+
+async def exercises_detail(
+    executor: AsyncIOExecutor,
+    *,
+    exercise_id: list[UUID],
+    user_id: UUID,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    return await executor.query_json(
+        project(EXERCISES_DETAIL, fields),
+        exercise_id=exercise_id,
+        user_id=user_id,
+    )
+
+
+EXERCISES_GET_ALL = """\
+SELECT Exercise {id, name, notes}  # projected
+FILTER .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+"""
+
+
+async def exercises_get_all(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    return await executor.query_json(
+        project(EXERCISES_GET_ALL, fields),
+        user_id=user_id,
+    )
+
+
+EXERCISES_PROGRESS = """\
+WITH grouped_exercise_sets := (
+    GROUP (
+        FOR exercise_id IN array_unpack(<array<uuid>>$exercise_id) UNION (
+            SELECT ExerciseSet
+            FILTER
+                .exercise.id = exercise_id
+                AND .exercise.user.id = <uuid>$user_id
+                AND NOT EXISTS .exercise.deleted_at
+                AND NOT EXISTS .workout.deleted_at
+        )
+    ) BY (.workout, .exercise)
+)
+SELECT grouped_exercise_sets {
+    name := .key.exercise.name,
+    date := .key.workout.date,
+    avg_rep_count := math::mean(.elements.rep_count),
+    avg_weight := math::mean(.elements.weight),
+    max_weight := max(.elements.weight)
+}
+"""
+
+
+async def exercises_progress(
+    executor: AsyncIOExecutor,
+    *,
+    exercise_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        EXERCISES_PROGRESS,
+        exercise_id=exercise_id,
+        user_id=user_id,
+    )
+
+
+EXERCISES_UPDATE = """\
+WITH
+    exercise_ids := <array<uuid>>$exercise_id,
+    names := <array<json>>$name,
+    notes := <array<json>>$notes,
+    exercises := (
+        FOR i IN range_unpack(range(0, len(exercise_ids))) UNION assert_exists((
+            UPDATE Exercise
+            FILTER .id = exercise_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+            SET {
+                name := <optional str>names[i] ?? .name,
+                notes := <optional str>notes[i] ?? .notes
+            }
+        ))
+    )
+SELECT exercises {id, name, notes}
+"""
+
+
+async def exercises_update(
+    executor: AsyncIOExecutor,
+    *,
+    exercise_id: list[UUID],
+    name: list[str],
+    notes: list[str],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        EXERCISES_UPDATE,
+        exercise_id=exercise_id,
+        name=name,
+        notes=notes,
+        user_id=user_id,
+    )
+
+
+HEALTH_PING = """\
+SELECT true
+"""
+
+
+async def health_ping(
+    executor: AsyncIOExecutor,
+) -> str:
+    return await executor.query_json(
+        HEALTH_PING,
+    )
+
+
+HISTORY_EXPORT_EXERCISES = """\
+SELECT Exercise {id, name, notes}
+FILTER .user.id = <uuid>$user_id AND .id > <uuid>$after AND NOT EXISTS .deleted_at
+ORDER BY .id
+LIMIT <int64>$limit
+"""
+
+
+async def history_export_exercises(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    after: UUID,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        HISTORY_EXPORT_EXERCISES,
+        user_id=user_id,
+        after=after,
+        limit=limit,
+    )
+
+
+HISTORY_EXPORT_SETS = """\
+SELECT ExerciseSet {id, weight, rep_count, workout_id := .workout.id, exercise_id := .exercise.id}
+FILTER
+    .workout.user.id = <uuid>$user_id
+    AND .id > <uuid>$after
+    AND NOT EXISTS .workout.deleted_at
+    AND NOT EXISTS .exercise.deleted_at
+ORDER BY .id
+LIMIT <int64>$limit
+"""
+
+
+async def history_export_sets(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    after: UUID,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        HISTORY_EXPORT_SETS,
+        user_id=user_id,
+        after=after,
+        limit=limit,
+    )
+
+
+HISTORY_EXPORT_WORKOUTS = """\
+SELECT Workout {
+    id,
+    name,
+    date,
+    exercises := array_agg((SELECT .exercises FILTER NOT EXISTS .deleted_at).id)
+}
+FILTER .user.id = <uuid>$user_id AND .id > <uuid>$after AND NOT EXISTS .deleted_at
+ORDER BY .id
+LIMIT <int64>$limit
+"""
+
+
+async def history_export_workouts(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    after: UUID,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        HISTORY_EXPORT_WORKOUTS,
+        user_id=user_id,
+        after=after,
+        limit=limit,
+    )
+
+
+HISTORY_IMPORT_BATCH = """\
+WITH
+    user := (SELECT User FILTER .id = <uuid>$user_id),
+    exercises := (
+        FOR name IN array_unpack(<array<str>>$exercise_names) UNION (
+            INSERT Exercise {name := name, user := user}
+            UNLESS CONFLICT ON (.live_name, .user)
+            ELSE (SELECT Exercise)
+        )
+    ),
+    workouts := (
+        FOR workout IN array_unpack(<array<json>>$workouts) UNION (
+            WITH workout_exercises := (
+                SELECT exercises
+                FILTER .cleaned_name IN array_unpack(<array<str>>workout['exercises'])
+            )
+            INSERT Workout {
+                name := <str>workout['name'],
+                date := <cal::local_date>workout['date'],
+                user := user,
+                exercises := workout_exercises
+            }
+            UNLESS CONFLICT ON (.live_name, .date, .user)
+            ELSE (UPDATE Workout SET {exercises += workout_exercises})
+        )
+    ),
+    set_workouts := <array<str>>$set_workouts,
+    set_dates := <array<cal::local_date>>$set_dates,
+    set_exercises := <array<str>>$set_exercises,
+    weights := <array<int64>>$weights,
+    rep_counts := <array<int64>>$rep_counts,
+    exercise_sets := (
+        FOR i IN range_unpack(range(0, len(weights))) UNION (
+            INSERT ExerciseSet {
+                weight := weights[i],
+                rep_count := rep_counts[i],
+                exercise := assert_exists(assert_single((
+                    SELECT exercises
+                    FILTER .cleaned_name = set_exercises[i]
+                ))),
+                workout := assert_exists(assert_single((
+                    SELECT workouts
+                    FILTER .cleaned_name = set_workouts[i] AND .date = set_dates[i]
+                )))
+            }
+        )
+    )
+SELECT {
+    sets := count(exercise_sets),
+    volume := exercise_sets {weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+}
+"""
+
+
+async def history_import_batch(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    exercise_names: list[str],
+    workouts: list[str],
+    set_workouts: list[str],
+    set_dates: list[date],
+    set_exercises: list[str],
+    weights: list[int],
+    rep_counts: list[int],
+) -> str:
+    return await executor.query_json(
+        HISTORY_IMPORT_BATCH,
+        user_id=user_id,
+        exercise_names=exercise_names,
+        workouts=workouts,
+        set_workouts=set_workouts,
+        set_dates=set_dates,
+        set_exercises=set_exercises,
+        weights=weights,
+        rep_counts=rep_counts,
+    )
+
+
+JOBS_CREATE = """\
+WITH job := (
+    INSERT Job {
+        kind := <str>$kind,
+        user := (
+            SELECT User
+            FILTER .id = <uuid>$user_id
+        )
+    }
+)
+SELECT job {id, kind, status, attempts, result, error, created_at, finished_at}
+"""
+
+
+async def jobs_create(
+    executor: AsyncIOExecutor,
+    *,
+    kind: str,
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        JOBS_CREATE,
+        kind=kind,
+        user_id=user_id,
+    )
+
+
+JOBS_DETAIL = """\
+WITH jobs := (
+    FOR job_id IN array_unpack(<array<uuid>>$job_id) UNION assert_exists((
+        SELECT Job
+        FILTER .id = job_id AND .user.id = <uuid>$user_id
+    ))
+)
+SELECT jobs {id, kind, status, attempts, result, error, created_at, finished_at}
+"""
+
+
+async def jobs_detail(
+    executor: AsyncIOExecutor,
+    *,
+    job_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        JOBS_DETAIL,
+        job_id=job_id,
+        user_id=user_id,
+    )
+
+
+JOBS_ENQUEUE = """\
+# Nothing is inserted while the user has a job of this kind waiting or running, unless it's old enough to be abandoned
+WITH pending := (
+    SELECT Job
+    FILTER
+        .user.id = <uuid>$user_id
+        AND .kind = <str>$kind
+        AND .status IN {JobStatus.Queued, JobStatus.Running}
+        AND .created_at > datetime_current() - to_duration(seconds := <int64>$timeout)
+)
+SELECT (
+    FOR job IN (SELECT true FILTER NOT EXISTS pending) UNION (
+        INSERT Job {
+            kind := <str>$kind,
+            user := (
+                SELECT User
+                FILTER .id = <uuid>$user_id
+            )
+        }
+    )
+) {id, kind, status, attempts, result, error, created_at, finished_at}
+"""
+
+
+async def jobs_enqueue(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    kind: str,
+    timeout: int,
+) -> str:
+    return await executor.query_json(
+        JOBS_ENQUEUE,
+        user_id=user_id,
+        kind=kind,
+        timeout=timeout,
+    )
+
+
+JOBS_FINISH = """\
+WITH status := <JobStatus><str>$status
+UPDATE Job
+FILTER .id = <uuid>$job_id
+SET {
+    status := status,
+    result := <optional json>$result,
+    error := <optional str>$error,
+    # Jobs put back in the queue for a retry keep an empty finish time
+    finished_at := datetime_current() IF status IN {JobStatus.Succeeded, JobStatus.Failed} ELSE <datetime>{}
+}
+"""
+
+
+async def jobs_finish(
+    executor: AsyncIOExecutor,
+    *,
+    status: str,
+    job_id: UUID,
+    result: str | None,
+    error: str | None,
+) -> str:
+    return await executor.query_json(
+        JOBS_FINISH,
+        status=status,
+        job_id=job_id,
+        result=result,
+        error=error,
+    )
+
+
+JOBS_START = """\
+UPDATE Job
+FILTER .id = <uuid>$job_id
+SET {
+    status := JobStatus.Running,
+    attempts := .attempts + 1
+}
+"""
+
+
+async def jobs_start(
+    executor: AsyncIOExecutor,
+    *,
+    job_id: UUID,
+) -> str:
+    return await executor.query_json(
+        JOBS_START,
+        job_id=job_id,
+    )
+
+
+PURGE_JOBS = """\
+# Purge jobs are only kept long enough for clients to poll them, abandoned ones included
+SELECT count((
+    DELETE Job
+    FILTER
+        .user.id = <uuid>$user_id
+        AND .kind = 'purge'
+        AND .created_at < datetime_current() - to_duration(seconds := <int64>$retention)
+))
+"""
+
+
+async def purge_jobs(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    retention: int,
+) -> str:
+    return await executor.query_json(
+        PURGE_JOBS,
+        user_id=user_id,
+        retention=retention,
+    )
+
+
+PURGE_ROWS = """\
+# Only rows whose sets are all purged are deleted, so the cascades left are small
+WITH
+    workouts := (
+        DELETE Workout
+        FILTER .user.id = <uuid>$user_id AND EXISTS .deleted_at AND NOT EXISTS .<workout[is ExerciseSet]
+    ),
+    exercises := (
+        DELETE Exercise
+        FILTER .user.id = <uuid>$user_id AND EXISTS .deleted_at AND NOT EXISTS .sets
+    )
+SELECT {workouts := count(workouts), exercises := count(exercises)}
+"""
+
+
+async def purge_rows(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        PURGE_ROWS,
+        user_id=user_id,
+    )
+
+
+PURGE_SETS = """\
+WITH exercise_sets := (
+    SELECT ExerciseSet
+    FILTER
+        .workout.user.id = <uuid>$user_id
+        AND (EXISTS .workout.deleted_at OR EXISTS .exercise.deleted_at)
+    LIMIT <int64>$limit
+)
+SELECT count((DELETE exercise_sets))
+"""
+
+
+async def purge_sets(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        PURGE_SETS,
+        user_id=user_id,
+        limit=limit,
+    )
+
+
+PURGE_USERS = """\
+SELECT User {id}
+FILTER
+    EXISTS (SELECT .workouts FILTER EXISTS .deleted_at)
+    OR EXISTS (SELECT .exercises FILTER EXISTS .deleted_at)
+ORDER BY .id
+"""
+
+
+async def purge_users(
+    executor: AsyncIOExecutor,
+) -> str:
+    return await executor.query_json(
+        PURGE_USERS,
+    )
+
+
+SEARCH_ALL = """\
+# Workouts and exercises share one ranked list, so every hit is a tuple of the same shape.
+# Matches in names count double those in notes, and hits without any match are left out.
+WITH
+    patterns := <array<str>>$patterns,
+    hits := (
+        (
+            FOR workout IN (SELECT Workout FILTER .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at) UNION (
+                WITH rank := 2 * sum(<int64>re_test(array_unpack(patterns), workout.name))
+                SELECT (
+                    kind := 'workout',
+                    id := workout.id,
+                    name := workout.name,
+                    notes := '',
+                    date := <str>workout.date,
+                    rank := rank
+                )
+                FILTER rank > 0
+            )
+        )
+        UNION
+        (
+            FOR exercise IN (SELECT Exercise FILTER .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at) UNION (
+                WITH rank := (
+                    2 * sum(<int64>re_test(array_unpack(patterns), exercise.name))
+                    + sum(<int64>re_test(array_unpack(patterns), exercise.notes))
+                )
+                SELECT (
+                    kind := 'exercise',
+                    id := exercise.id,
+                    name := exercise.name,
+                    notes := exercise.notes ?? '',
+                    date := '',
+                    rank := rank
+                )
+                FILTER rank > 0
+            )
+        )
+    )
+SELECT hits
+ORDER BY .rank DESC THEN .name THEN .id
+OFFSET <int64>$offset
+LIMIT <int64>$limit
+"""
+
+
+async def search_all(
+    executor: AsyncIOExecutor,
+    *,
+    patterns: list[str],
+    user_id: UUID,
+    offset: int,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        SEARCH_ALL,
+        patterns=patterns,
+        user_id=user_id,
+        offset=offset,
+        limit=limit,
+    )
+
+
+SETS_ADD = """\
+WITH
+    weights := <array<int64>>$weight,
+    rep_counts := <array<int64>>$rep_count,
+    workout_ids := <array<uuid>>$workout_id,
+    exercise_ids := <array<uuid>>$exercise_id,
+    exercise_sets := (
+        FOR i IN range_unpack(range(0, len(weights))) UNION (
+            INSERT ExerciseSet {
+                weight := weights[i],
+                rep_count := rep_counts[i],
+                workout := (
+                    SELECT assert_exists((
+                        SELECT Workout
+                        FILTER .id = workout_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+                    ), message := 'No workout found')
+                ),
+                exercise := (
+                    SELECT assert_exists((
+                        SELECT Exercise
+                        FILTER .id = exercise_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+                    ), message := 'No exercise found')
+                )
+            }
+        )
+    )
+SELECT exercise_sets {id, weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+"""
+
+
+async def sets_add(
+    executor: AsyncIOExecutor,
+    *,
+    weight: list[int],
+    rep_count: list[int],
+    workout_id: list[UUID],
+    exercise_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        SETS_ADD,
+        weight=weight,
+        rep_count=rep_count,
+        workout_id=workout_id,
+        exercise_id=exercise_id,
+        user_id=user_id,
+    )
+
+
+SETS_DELETE = """\
+WITH exercise_set := (
+    DELETE ExerciseSet
+    FILTER (
+        .id = <uuid>$set_id
+        and .exercise.user.id = <uuid>$user_id
+        and .workout.user.id = <uuid>$user_id
+        and not exists .exercise.deleted_at
+        and not exists .workout.deleted_at
+    )
+)
+SELECT exercise_set {id, weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+"""
+
+
+async def sets_delete(
+    executor: AsyncIOExecutor,
+    *,
+    set_id: UUID,
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        SETS_DELETE,
+        set_id=set_id,
+        user_id=user_id,
+    )
+
+
+SETS_GET_ALL = """\
+SELECT ExerciseSet {id, weight, rep_count}  # projected
+FILTER (
+    .exercise.id = <uuid>$exercise_id
+    and .workout.id = <uuid>$workout_id
+    and .exercise.user.id = <uuid>$user_id
+    and .workout.user.id = <uuid>$user_id
+    and not exists .exercise.deleted_at
+    and not exists .workout.deleted_at
+)
+"""
+
+
+async def sets_get_all(
+    executor: AsyncIOExecutor,
+    *,
+    exercise_id: UUID,
+    workout_id: UUID,
+    user_id: UUID,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    return await executor.query_json(
+        project(SETS_GET_ALL, fields),
+        exercise_id=exercise_id,
+        workout_id=workout_id,
+        user_id=user_id,
+    )
+
+
+SETS_UPDATE = """\
+WITH
+    exercise_set := (
+        SELECT ExerciseSet
+        FILTER (
+            .id = <uuid>$set_id
+            and .exercise.user.id = <uuid>$user_id
+            and .workout.user.id = <uuid>$user_id
+            and not exists .exercise.deleted_at
+            and not exists .workout.deleted_at
+        )
+    ),
+    updated := (
+        UPDATE exercise_set
+        SET {
+            weight := <optional int64>$weight ?? .weight,
+            rep_count := <optional int64>$rep_count ?? .rep_count
+        }
+    )
+# The rest of the statement doesn't see the update, so exercise_set still holds the previous values
+SELECT updated {
+    id,
+    weight,
+    rep_count,
+    exercise_id := .exercise.id,
+    date := .workout.date,
+    previous := exercise_set {weight, rep_count}
+}
+"""
+
+
+async def sets_update(
+    executor: AsyncIOExecutor,
+    *,
+    set_id: UUID,
+    user_id: UUID,
+    weight: int | None,
+    rep_count: int | None,
+) -> str:
+    return await executor.query_json(
+        SETS_UPDATE,
+        set_id=set_id,
+        user_id=user_id,
+        weight=weight,
+        rep_count=rep_count,
+    )
+
+
+USERS_CREATE = """\
+WITH
+    usernames := <array<str>>$username,
+    passwords := <array<str>>$password,
+    emails := <array<json>>$email,
+    users := (
+        FOR i IN range_unpack(range(0, len(usernames))) UNION (
+            INSERT User {
+                username := usernames[i],
+                hashed_password := passwords[i],
+                email := <optional str>emails[i],
+                disabled := <bool>False
+            }
+        )
+    )
+SELECT users {id, username, disabled, email}
+"""
+
+
+async def users_create(
+    executor: AsyncIOExecutor,
+    *,
+    username: list[str],
+    password: list[str],
+    email: list[str],
+) -> str:
+    return await executor.query_json(
+        USERS_CREATE,
+        username=username,
+        password=password,
+        email=email,
+    )
+
+
+USERS_GET_BY_USERNAME = """\
+SELECT User {id, username, hashed_password, email, disabled}
+FILTER .username = <str>$username
+"""
+
+
+async def users_get_by_username(
+    executor: AsyncIOExecutor,
+    *,
+    username: str,
+) -> str:
+    return await executor.query_json(
+        USERS_GET_BY_USERNAME,
+        username=username,
+    )
+
+
+VOLUME_APPLY = """\
+WITH
+    user := (SELECT User FILTER .id = <uuid>$user_id),
+    exercise_ids := <array<uuid>>$exercise_id,
+    periods := <array<str>>$period,
+    period_starts := <array<cal::local_date>>$period_start,
+    volumes := <array<int64>>$volume,
+    set_counts := <array<int64>>$set_count,
+    rep_counts := <array<int64>>$rep_count
+FOR i IN range_unpack(range(0, len(exercise_ids))) UNION (
+    INSERT VolumeRollup {
+        user := user,
+        exercise := (
+            SELECT Exercise
+            FILTER .id = exercise_ids[i] AND .user = user
+        ),
+        period := <RollupPeriod>periods[i],
+        period_start := period_starts[i],
+        volume := volumes[i],
+        set_count := set_counts[i],
+        rep_count := rep_counts[i]
+    }
+    UNLESS CONFLICT ON ((.exercise, .period, .period_start))
+    ELSE (
+        UPDATE VolumeRollup
+        SET {
+            volume := .volume + volumes[i],
+            set_count := .set_count + set_counts[i],
+            rep_count := .rep_count + rep_counts[i]
+        }
+    )
+)
+"""
+
+
+async def volume_apply(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    exercise_id: list[UUID],
+    period: list[str],
+    period_start: list[date],
+    volume: list[int],
+    set_count: list[int],
+    rep_count: list[int],
+) -> str:
+    return await executor.query_json(
+        VOLUME_APPLY,
+        user_id=user_id,
+        exercise_id=exercise_id,
+        period=period,
+        period_start=period_start,
+        volume=volume,
+        set_count=set_count,
+        rep_count=rep_count,
+    )
+
+
+VOLUME_CLEAR = """\
+DELETE VolumeRollup
+FILTER .user.id = <uuid>$user_id
+"""
+
+
+async def volume_clear(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        VOLUME_CLEAR,
+        user_id=user_id,
+    )
+
+
+VOLUME_PRUNE = """\
+DELETE VolumeRollup
+FILTER .user.id = <uuid>$user_id AND .set_count <= 0
+"""
+
+
+async def volume_prune(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        VOLUME_PRUNE,
+        user_id=user_id,
+    )
+
+
+VOLUME_SUMMARY = """\
+SELECT VolumeRollup {
+    exercise_id := .exercise.id,
+    exercise_name := .exercise.name,
+    period_start,
+    volume,
+    set_count,
+    rep_count
+}
+FILTER
+    .user.id = <uuid>$user_id
+    AND .period = <RollupPeriod><str>$period
+    AND .period_start >= <cal::local_date>$start_date
+    AND .period_start <= <cal::local_date>$end_date
+    AND .set_count > 0
+    AND NOT EXISTS .exercise.deleted_at
+ORDER BY .period_start THEN .exercise.name
+"""
+
+
+async def volume_summary(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    period: str,
+    start_date: date,
+    end_date: date,
+) -> str:
+    return await executor.query_json(
+        VOLUME_SUMMARY,
+        user_id=user_id,
+        period=period,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+VOLUME_USER_SETS = """\
+SELECT ExerciseSet {id, weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+FILTER
+    .workout.user.id = <uuid>$user_id
+    AND .id > <uuid>$after
+    AND NOT EXISTS .workout.deleted_at
+    AND NOT EXISTS .exercise.deleted_at
+ORDER BY .id
+LIMIT <int64>$limit
+"""
+
+
+async def volume_user_sets(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    after: UUID,
+    limit: int,
+) -> str:
+    return await executor.query_json(
+        VOLUME_USER_SETS,
+        user_id=user_id,
+        after=after,
+        limit=limit,
+    )
+
+
+VOLUME_USERS = """\
+SELECT User {id}
+ORDER BY .id
+"""
+
+
+async def volume_users(
+    executor: AsyncIOExecutor,
+) -> str:
+    return await executor.query_json(
+        VOLUME_USERS,
+    )
+
+
+VOLUME_WORKOUT_SETS = """\
+SELECT ExerciseSet {weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+FILTER
+    .workout.id IN array_unpack(<array<uuid>>$workout_id)
+    AND .workout.user.id = <uuid>$user_id
+    AND NOT EXISTS .exercise.deleted_at
+"""
+
+
+async def volume_workout_sets(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        VOLUME_WORKOUT_SETS,
+        workout_id=workout_id,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_ADD_EXERCISES = """\
+WITH
+    workout_ids := <array<uuid>>$workout_id,
+    exercise_ids := <array<uuid>>$exercise_id,
+    workouts := (
+        FOR i IN range_unpack(range(0, len(workout_ids))) UNION (
+            UPDATE Workout
+            FILTER (.id = workout_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at)
+            SET {
+                exercises += assert_exists((
+                    SELECT Exercise
+                    FILTER .id = exercise_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+                ))
+            }
+        )
+    )
+SELECT workouts {id, name, date}
+"""
+
+
+async def workouts_add_exercises(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    exercise_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_ADD_EXERCISES,
+        workout_id=workout_id,
+        exercise_id=exercise_id,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_CALENDAR = """\
+WITH days := (
+    GROUP (
+        SELECT Workout
+        FILTER
+            .user.id = <uuid>$user_id
+            AND .date >= <cal::local_date>$start_date
+            AND .date <= <cal::local_date>$end_date
+            AND NOT EXISTS .deleted_at
+    )
+    BY .date
+)
+SELECT (FOR day IN days UNION (<str>day.key.date, count(day.elements)))
+ORDER BY .0
+"""
+
+
+async def workouts_calendar(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    start_date: date,
+    end_date: date,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_CALENDAR,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+WORKOUTS_CALENDAR_WITH_VOLUME = """\
+WITH days := (
+    GROUP (
+        SELECT Workout
+        FILTER
+            .user.id = <uuid>$user_id
+            AND .date >= <cal::local_date>$start_date
+            AND .date <= <cal::local_date>$end_date
+            AND NOT EXISTS .deleted_at
+    )
+    BY .date
+)
+SELECT (
+    FOR day IN days UNION (
+        <str>day.key.date,
+        count(day.elements),
+        sum((
+            FOR exercise_set IN (
+                SELECT day.elements.<workout[is ExerciseSet]
+                FILTER NOT EXISTS .exercise.deleted_at
+            ) UNION (
+                exercise_set.weight * exercise_set.rep_count
+            )
+        ))
+    )
+)
+ORDER BY .0
+"""
+
+
+async def workouts_calendar_with_volume(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    start_date: date,
+    end_date: date,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_CALENDAR_WITH_VOLUME,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+WORKOUTS_COPY = """\
+WITH
+    workout_ids := <array<uuid>>$workout_id,
+    dates := <array<cal::local_date>>$date,
+    include_sets := <array<bool>>$include_sets,
+    copies := (
+        FOR i IN range_unpack(range(0, len(workout_ids))) UNION (
+            WITH
+                workout := assert_exists((
+                    SELECT Workout
+                    FILTER .id = workout_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+                )),
+                copy := (
+                    INSERT Workout {
+                        name := workout.name,
+                        date := dates[i],
+                        user := workout.user,
+                        exercises := (SELECT workout.exercises FILTER NOT EXISTS .deleted_at)
+                    }
+                ),
+                exercise_sets := (
+                    FOR exercise_set IN (
+                        SELECT ExerciseSet
+                        FILTER .workout = workout AND include_sets[i] AND NOT EXISTS .exercise.deleted_at
+                    ) UNION (
+                        INSERT ExerciseSet {
+                            weight := exercise_set.weight,
+                            rep_count := exercise_set.rep_count,
+                            exercise := exercise_set.exercise,
+                            workout := copy
+                        }
+                    )
+                )
+            SELECT copy
+        )
+    )
+SELECT copies {id, name, date}
+ORDER BY .date
+"""
+
+
+async def workouts_copy(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    date: list[date],
+    include_sets: list[bool],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_COPY,
+        workout_id=workout_id,
+        date=date,
+        include_sets=include_sets,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_CREATE = """\
+WITH
+    names := <array<str>>$name,
+    dates := <array<cal::local_date>>$date,
+    workouts := (
+        FOR i IN range_unpack(range(0, len(names))) UNION (
+            INSERT Workout {
+                name := names[i],
+                date := dates[i],
+                user := (
+                    SELECT User
+                    FILTER .id = <uuid>$user_id
+                )
+            }
+        )
+    )
+SELECT workouts {id, name, date}
+"""
+
+
+async def workouts_create(
+    executor: AsyncIOExecutor,
+    *,
+    name: list[str],
+    date: list[date],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_CREATE,
+        name=name,
+        date=date,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_DELETE = """\
+WITH
+    workouts := (
+        FOR workout_id IN array_unpack(<array<uuid>>$workout_id) UNION assert_exists((
+            SELECT Workout
+            FILTER .id = workout_id AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+        ))
+    ),
+    deleted := (UPDATE workouts SET {deleted_at := datetime_current()})
+# The sets are hidden along with their workouts and removed later by the purge,
+# they're returned so their volume can be taken off now
+SELECT {
+    workouts := count(deleted),
+    sets := (
+        SELECT ExerciseSet {weight, rep_count, exercise_id := .exercise.id, date := .workout.date}
+        FILTER .workout IN workouts AND NOT EXISTS .exercise.deleted_at
+    )
+}
+"""
+
+
+async def workouts_delete(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_DELETE,
+        workout_id=workout_id,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_DETAIL = """\
+WITH workouts := (
+    FOR workout_id IN array_unpack(<array<uuid>>$workout_id) UNION assert_exists((
+        SELECT Workout
+        FILTER .id = workout_id AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+    ))
+)
+SELECT workouts {id, name, date}  # projected
+ORDER BY .date DESC
+"""
+
+
+async def workouts_detail(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    user_id: UUID,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    return await executor.query_json(
+        project(WORKOUTS_DETAIL, fields),
+        workout_id=workout_id,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_DETAIL_WITH_EXERCISES = """\
+WITH workouts := (
+    FOR workout_id IN array_unpack(<array<uuid>>$workout_id) UNION assert_exists((
+        SELECT Workout
+        FILTER .id = workout_id AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+    ))
+)
+SELECT workouts {id, name, date, exercises: {id, name, notes} FILTER NOT EXISTS .deleted_at}
+ORDER BY .date DESC
+"""
+
+
+async def workouts_detail_with_exercises(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_DETAIL_WITH_EXERCISES,
+        workout_id=workout_id,
+        user_id=user_id,
+    )
+
+
+WORKOUTS_GET_ALL = """\
+SELECT Workout {id, name, date}  # projected
+FILTER .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+ORDER BY .date DESC
+"""
+
+
+async def workouts_get_all(
+    executor: AsyncIOExecutor,
+    *,
+    user_id: UUID,
+    fields: tuple[str, ...] | None = None,
+) -> str:
+    return await executor.query_json(
+        project(WORKOUTS_GET_ALL, fields),
+        user_id=user_id,
+    )
+
+
+WORKOUTS_UPDATE = """\
+WITH
+    workout_ids := <array<uuid>>$workout_id,
+    names := <array<json>>$name,
+    dates := <array<json>>$date,
+    workouts := (
+        FOR i IN range_unpack(range(0, len(workout_ids))) UNION assert_exists((
+            UPDATE Workout
+            FILTER .id = workout_ids[i] AND .user.id = <uuid>$user_id AND NOT EXISTS .deleted_at
+            SET {
+                name := <optional str>names[i] ?? .name,
+                date := <optional cal::local_date>dates[i] ?? .date
+            }
+        ))
+    )
+# Sets follow their workout into another week or month when its date changes
+SELECT workouts {
+    id,
+    name,
+    date,
+    previous_date := (SELECT DETACHED Workout FILTER .id = workouts.id).date,
+    sets := .<workout[is ExerciseSet] {weight, rep_count, exercise_id := .exercise.id}
+}
+"""
+
+
+async def workouts_update(
+    executor: AsyncIOExecutor,
+    *,
+    workout_id: list[UUID],
+    name: list[str],
+    date: list[str],
+    user_id: UUID,
+) -> str:
+    return await executor.query_json(
+        WORKOUTS_UPDATE,
+        workout_id=workout_id,
+        name=name,
+        date=date,
+        user_id=user_id,
+    )
+
+
+QUERIES: dict[str, str] = {
+    "exercises_create": EXERCISES_CREATE,
+    "exercises_delete": EXERCISES_DELETE,
+    "exercises_detail": EXERCISES_DETAIL,
+    "exercises_get_all": EXERCISES_GET_ALL,
+    "exercises_progress": EXERCISES_PROGRESS,
+    "exercises_update": EXERCISES_UPDATE,
+    "health_ping": HEALTH_PING,
+    "history_export_exercises": HISTORY_EXPORT_EXERCISES,
+    "history_export_sets": HISTORY_EXPORT_SETS,
+    "history_export_workouts": HISTORY_EXPORT_WORKOUTS,
+    "history_import_batch": HISTORY_IMPORT_BATCH,
+    "jobs_create": JOBS_CREATE,
+    "jobs_detail": JOBS_DETAIL,
+    "jobs_enqueue": JOBS_ENQUEUE,
+    "jobs_finish": JOBS_FINISH,
+    "jobs_start": JOBS_START,
+    "purge_jobs": PURGE_JOBS,
+    "purge_rows": PURGE_ROWS,
+    "purge_sets": PURGE_SETS,
+    "purge_users": PURGE_USERS,
+    "search_all": SEARCH_ALL,
+    "sets_add": SETS_ADD,
+    "sets_delete": SETS_DELETE,
+    "sets_get_all": SETS_GET_ALL,
+    "sets_update": SETS_UPDATE,
+    "users_create": USERS_CREATE,
+    "users_get_by_username": USERS_GET_BY_USERNAME,
+    "volume_apply": VOLUME_APPLY,
+    "volume_clear": VOLUME_CLEAR,
+    "volume_prune": VOLUME_PRUNE,
+    "volume_summary": VOLUME_SUMMARY,
+    "volume_user_sets": VOLUME_USER_SETS,
+    "volume_users": VOLUME_USERS,
+    "volume_workout_sets": VOLUME_WORKOUT_SETS,
+    "workouts_add_exercises": WORKOUTS_ADD_EXERCISES,
+    "workouts_calendar": WORKOUTS_CALENDAR,
+    "workouts_calendar_with_volume": WORKOUTS_CALENDAR_WITH_VOLUME,
+    "workouts_copy": WORKOUTS_COPY,
+    "workouts_create": WORKOUTS_CREATE,
+    "workouts_delete": WORKOUTS_DELETE,
+    "workouts_detail": WORKOUTS_DETAIL,
+    "workouts_detail_with_exercises": WORKOUTS_DETAIL_WITH_EXERCISES,
+    "workouts_get_all": WORKOUTS_GET_ALL,
+    "workouts_update": WORKOUTS_UPDATE,
+}
+
+
+PARAMETERS: dict[str, dict[str, str]] = {
+    "exercises_create": {
+        "name": "array<str>",
+        "notes": "array<json>",
+        "user_id": "uuid",
+    },
+    "exercises_delete": {
+        "exercise_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "exercises_detail": {
+        "exercise_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "exercises_get_all": {
+        "user_id": "uuid",
+    },
+    "exercises_progress": {
+        "exercise_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "exercises_update": {
+        "exercise_id": "array<uuid>",
+        "name": "array<json>",
+        "notes": "array<json>",
+        "user_id": "uuid",
+    },
+    "health_ping": {},
+    "history_export_exercises": {
+        "user_id": "uuid",
+        "after": "uuid",
+        "limit": "int64",
+    },
+    "history_export_sets": {
+        "user_id": "uuid",
+        "after": "uuid",
+        "limit": "int64",
+    },
+    "history_export_workouts": {
+        "user_id": "uuid",
+        "after": "uuid",
+        "limit": "int64",
+    },
+    "history_import_batch": {
+        "user_id": "uuid",
+        "exercise_names": "array<str>",
+        "workouts": "array<json>",
+        "set_workouts": "array<str>",
+        "set_dates": "array<cal::local_date>",
+        "set_exercises": "array<str>",
+        "weights": "array<int64>",
+        "rep_counts": "array<int64>",
+    },
+    "jobs_create": {
+        "kind": "str",
+        "user_id": "uuid",
+    },
+    "jobs_detail": {
+        "job_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "jobs_enqueue": {
+        "user_id": "uuid",
+        "kind": "str",
+        "timeout": "int64",
+    },
+    "jobs_finish": {
+        "status": "str",
+        "job_id": "uuid",
+        "result": "optional json",
+        "error": "optional str",
+    },
+    "jobs_start": {
+        "job_id": "uuid",
+    },
+    "purge_jobs": {
+        "user_id": "uuid",
+        "retention": "int64",
+    },
+    "purge_rows": {
+        "user_id": "uuid",
+    },
+    "purge_sets": {
+        "user_id": "uuid",
+        "limit": "int64",
+    },
+    "purge_users": {},
+    "search_all": {
+        "patterns": "array<str>",
+        "user_id": "uuid",
+        "offset": "int64",
+        "limit": "int64",
+    },
+    "sets_add": {
+        "weight": "array<int64>",
+        "rep_count": "array<int64>",
+        "workout_id": "array<uuid>",
+        "exercise_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "sets_delete": {
+        "set_id": "uuid",
+        "user_id": "uuid",
+    },
+    "sets_get_all": {
+        "exercise_id": "uuid",
+        "workout_id": "uuid",
+        "user_id": "uuid",
+    },
+    "sets_update": {
+        "set_id": "uuid",
+        "user_id": "uuid",
+        "weight": "optional int64",
+        "rep_count": "optional int64",
+    },
+    "users_create": {
+        "username": "array<str>",
+        "password": "array<str>",
+        "email": "array<json>",
+    },
+    "users_get_by_username": {
+        "username": "str",
+    },
+    "volume_apply": {
+        "user_id": "uuid",
+        "exercise_id": "array<uuid>",
+        "period": "array<str>",
+        "period_start": "array<cal::local_date>",
+        "volume": "array<int64>",
+        "set_count": "array<int64>",
+        "rep_count": "array<int64>",
+    },
+    "volume_clear": {
+        "user_id": "uuid",
+    },
+    "volume_prune": {
+        "user_id": "uuid",
+    },
+    "volume_summary": {
+        "user_id": "uuid",
+        "period": "str",
+        "start_date": "cal::local_date",
+        "end_date": "cal::local_date",
+    },
+    "volume_user_sets": {
+        "user_id": "uuid",
+        "after": "uuid",
+        "limit": "int64",
+    },
+    "volume_users": {},
+    "volume_workout_sets": {
+        "workout_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "workouts_add_exercises": {
+        "workout_id": "array<uuid>",
+        "exercise_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "workouts_calendar": {
+        "user_id": "uuid",
+        "start_date": "cal::local_date",
+        "end_date": "cal::local_date",
+    },
+    "workouts_calendar_with_volume": {
+        "user_id": "uuid",
+        "start_date": "cal::local_date",
+        "end_date": "cal::local_date",
+    },
+    "workouts_copy": {
+        "workout_id": "array<uuid>",
+        "date": "array<cal::local_date>",
+        "include_sets": "array<bool>",
+        "user_id": "uuid",
+    },
+    "workouts_create": {
+        "name": "array<str>",
+        "date": "array<cal::local_date>",
+        "user_id": "uuid",
+    },
+    "workouts_delete": {
+        "workout_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "workouts_detail": {
+        "workout_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "workouts_detail_with_exercises": {
+        "workout_id": "array<uuid>",
+        "user_id": "uuid",
+    },
+    "workouts_get_all": {
+        "user_id": "uuid",
+    },
+    "workouts_update": {
+        "workout_id": "array<uuid>",
+        "name": "array<json>",
+        "date": "array<json>",
+        "user_id": "uuid",
+    },
+}
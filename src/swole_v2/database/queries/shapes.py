@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# The selection shape a statement lets callers narrow down, marked with a trailing "# projected" comment
+PROJECTED = re.compile(r"\{([^{}]*)\}(?=[ \t]*# projected)")
+
+
+@lru_cache(maxsize=None)
+def project(text: str, fields: tuple[str, ...] | None) -> str:
+    """Returns the statement with its projected shape narrowed down to the given fields.
+
+    Fields are expected in a fixed order, so each selection always maps to the same statement text
+    and EdgeDB compiles it only once.
+    """
+    if fields is None:
+        return text
+    match = PROJECTED.search(text)
+    if match is None:
+        raise ValueError("The statement has no projected shape")
+    # Computed elements like exercise_id := .exercise.id are selected by the name they're given
+    elements = {element.split(":=")[0].strip(): element.strip() for element in match.group(1).split(",")}
+    if unknown := [name for name in fields if name not in elements]:
+        raise ValueError(f"The projected shape has no {', '.join(unknown)}")
+    return f"{text[: match.start(1)]}{', '.join(elements[name] for name in fields)}{text[match.end(1) :]}"
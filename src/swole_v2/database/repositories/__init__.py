@@ -1,6 +1,21 @@
 from .exercises import ExerciseRepository
+from .history import HistoryRepository
+from .jobs import JobRepository
+from .purge import PurgeRepository
+from .search import SearchRepository
 from .sets import SetRepository
 from .users import UserRepository
+from .volume import VolumeRepository
 from .workouts import WorkoutRepository
 
-__all__ = ["WorkoutRepository", "ExerciseRepository", "UserRepository", "SetRepository"]
+__all__ = [
+    "WorkoutRepository",
+    "ExerciseRepository",
+    "UserRepository",
+    "SetRepository",
+    "HistoryRepository",
+    "JobRepository",
+    "VolumeRepository",
+    "SearchRepository",
+    "PurgeRepository",
+]
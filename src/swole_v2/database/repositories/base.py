@@ -1,45 +1,157 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar, get_args
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from pydantic import BaseModel
 
+from ...dependencies.settings import get_settings
+from ...tracing.spans import span
 from ..database import get_async_client
+from ..limiter import Priority, get_limiter
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
     from uuid import UUID
 
-    from edgedb import AsyncIOClient
+    from edgedb import AsyncIOClient, AsyncIOExecutor
+    from pydantic.fields import FieldInfo
+
+    from ...settings import Settings
+
+    # A generated query function from the query catalog, it takes an executor and keyword parameters
+    Query = Callable[..., Awaitable[str]]
+    # Runs more statements in the transaction of a query, given the query's results
+    After = Callable[[AsyncIOExecutor, list[dict[str, Any]]], Awaitable[None]]
 
 T = TypeVar("T", bound=BaseModel)
+V = TypeVar("V")
+R = TypeVar("R")
+
+
+def clean(value: str) -> str:
+    """Mirrors the clean() function in the schema, which backs the exclusive name constraints.
+
+    Like str_trim(), only spaces are trimmed, so names differing in other whitespace stay distinct.
+    """
+    return value.lower().strip(" ")
+
+
+def chunked(items: list[V], size: int | None) -> list[list[V]]:
+    if not size:
+        return [items]
+    return [items[index : index + size] for index in range(0, len(items), size)]
+
+
+def to_rows(data: list[T], unique: bool) -> list[tuple[Any, ...]]:
+    # Rows are tuples of the typed field values, so duplicates are found without serializing anything
+    rows = [tuple(getattr(item, name) for name in type(item).model_fields) for item in data]
+    return list(dict.fromkeys(rows)) if unique else rows
+
+
+def to_columns(model: type[BaseModel], rows: list[tuple[Any, ...]]) -> dict[str, list[Any]]:
+    """Turns rows into one typed array per field, which EdgeDB receives through its binary protocol.
+
+    EdgeDB arrays can't hold empty values, so fields that accept None are sent as arrays of JSON instead.
+    """
+    columns = {}
+    for index, (name, field) in enumerate(model.model_fields.items()):
+        values = [row[index] for row in rows]
+        columns[name] = [json.dumps(value, default=str) for value in values] if is_nullable(field) else values
+    return columns
+
+
+def is_nullable(field: FieldInfo) -> bool:
+    return type(None) in get_args(field.annotation)
+
+
+def to_series(results: list[dict[str, Any]], names: Iterable[str]) -> dict[str, list[Any]]:
+    # The columnar layout of query results, one array per field in place of one object per result
+    return {name: [result[name] for result in results] for name in names}
+
+
+def to_models(
+    model: type[T], results: list[dict[str, Any]], fields: tuple[str, ...] | None
+) -> list[T] | list[dict[str, Any]]:
+    # Projected results are passed on as they are, the model would send the fields left out as nulls
+    return results if fields else [model(**result) for result in results]
+
+
+async def run_query(executor: AsyncIOExecutor, query: Query, **kwargs: Any) -> list[Any]:
+    # Every statement goes through here, in a transaction or not, so each one shows up in traces
+    with span("query", query=query.__name__):
+        return json.loads(await query(executor, **kwargs))
 
 
 class BaseRepository:
-    def __init__(self, client: AsyncIOClient) -> None:
+    def __init__(self, client: AsyncIOClient, settings: Settings, priority: Priority = Priority.NORMAL) -> None:
         self.client = client
+        self.settings = settings
+        self.priority = priority
+        self.limiter = get_limiter()
 
     @classmethod
-    async def as_dependency(cls, client: AsyncIOClient = Depends(get_async_client)) -> "BaseRepository":
-        return cls(client)
+    async def as_dependency(
+        cls,
+        request: Request,
+        client: AsyncIOClient = Depends(get_async_client),
+        settings: Settings = Depends(get_settings),
+    ) -> "BaseRepository":
+        priority = settings.DATABASE_PRIORITIES.get(request.scope["route"].path, "normal")
+        return cls(client, settings, Priority[priority.upper()])
+
+    async def fetch_json(self, query: Query, **kwargs: Any) -> list[Any]:
+        # Single statements are atomic on their own so they don't need a transaction
+        async with self.limiter.slot(self.priority):
+            return await run_query(self.client, query, **kwargs)
 
     async def query_json(
-        self, query: str, data: list[T] | None, unique: bool = True, **kwargs: Any
+        self, query: Query, data: list[T] | None, unique: bool = True, after: After | None = None, **kwargs: Any
     ) -> list[dict[str, Any]]:
-        async for transaction in self.client.transaction():
-            async with transaction:
-                if data:
-                    # Convert from set to list to ensure unique values
-                    trusted_data = (
-                        list({d.model_dump_json() for d in data}) if unique else [d.model_dump_json() for d in data]
-                    )
-                    result = await transaction.query_json(query, data=trusted_data, **kwargs)
-                else:
-                    result = await transaction.query_json(query, **kwargs)
-        return json.loads(result)
+        if not data:
+            return await self._execute(query, [kwargs], after)
+
+        model = type(data[0])
+        batches = [
+            {**kwargs, **to_columns(model, chunk)}
+            for chunk in chunked(to_rows(data, unique), self.settings.BATCH_CHUNK_SIZE)
+        ]
+        if self.settings.BATCH_CHUNK_ATOMIC:
+            return await self._execute(query, batches, after)
+        return [result for batch in batches for result in await self._execute(query, [batch], after)]
 
     async def query_owned_json(
-        self, query: str, user_id: UUID | None, data: list[T] | None = None, unique: bool = True
+        self,
+        query: Query,
+        user_id: UUID | None,
+        data: list[T] | None = None,
+        unique: bool = True,
+        after: After | None = None,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        return await self.query_json(query, data, unique, after, user_id=user_id, **kwargs)
+
+    async def in_transaction(self, work: Callable[[AsyncIOExecutor], Awaitable[R]]) -> R:
+        """Runs the work in a transaction holding one limiter slot throughout.
+
+        The whole work is run again if the transaction is retried, so it must not change anything outside it.
+        """
+        async with self.limiter.slot(self.priority):
+            async for transaction in self.client.transaction():
+                async with transaction:
+                    result = await work(transaction)
+        return result
+
+    async def _execute(
+        self, query: Query, batches: list[dict[str, Any]], after: After | None = None
     ) -> list[dict[str, Any]]:
-        return await self.query_json(query, data, unique, user_id=user_id)
+        # Runs the query once per batch, then the after hook on all of their results, inside a single transaction
+        async def work(transaction: AsyncIOExecutor) -> list[dict[str, Any]]:
+            results = [await run_query(transaction, query, **arguments) for arguments in batches]
+            flattened = [result for batch_results in results for result in batch_results]
+            if after is not None:
+                await after(transaction, flattened)
+            return flattened
+
+        return await self.in_transaction(work)
@@ -1,72 +1,75 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any
 
 from edgedb import CardinalityViolationError, ConstraintViolationError
 
 from ...errors.exceptions import BusinessError
 from ...errors.messages import EXERCISE_WITH_NAME_ALREADY_EXISTS, IDS_MUST_BE_UNIQUE, NO_EXERCISE_FOUND
-from ...models import ExerciseProgressReport, ExerciseRead
-from .base import BaseRepository
+from ...models import ExerciseProgressReport, ExerciseRead, Layout
+from ...models.exercise import AVERAGE_DECIMALS
+from ..queries import generated as queries
+from ..search import get_search_cache
+from .base import BaseRepository, to_models, to_series
 
 if TYPE_CHECKING:
     from uuid import UUID
 
-    from ...schemas import ExerciseCreate, ExerciseDelete, ExerciseDetail, ExerciseProgress, ExerciseUpdate
+    from ...schemas import (
+        ExerciseCreate,
+        ExerciseDelete,
+        ExerciseDetail,
+        ExerciseProgress,
+        ExerciseSearch,
+        ExerciseUpdate,
+    )
+
+
+PROGRESS_SERIES = ("date", "avg_rep_count", "avg_weight", "max_weight")
+
+
+def progress_series(exercise_name: str, results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Lays out an exercise's progress as parallel arrays in date order, skipping the per-row models."""
+    series = to_series(sorted(results, key=itemgetter("date")), PROGRESS_SERIES)
+    for name in ("avg_rep_count", "avg_weight"):
+        series[name] = [round(value, AVERAGE_DECIMALS) for value in series[name]]
+    return {"exercise_name": exercise_name, **series}
 
 
 class ExerciseRepository(BaseRepository):
-    async def get_all(self, user_id: UUID | None) -> list[ExerciseRead]:
-        exercises = await self.query_owned_json(
-            """
-            SELECT Exercise {id, name, notes}
-            FILTER .user.id = <uuid>$user_id
-            """,
-            user_id=user_id,
-        )
-        return [ExerciseRead(**exercise) for exercise in exercises]
-
-    async def detail(self, user_id: UUID | None, data: list[ExerciseDetail]) -> list[ExerciseRead]:
+    async def get_all(
+        self, user_id: UUID | None, fields: tuple[str, ...] | None = None
+    ) -> list[ExerciseRead] | list[dict[str, Any]]:
+        exercises = await self.fetch_json(queries.exercises_get_all, user_id=user_id, fields=fields)
+        return to_models(ExerciseRead, exercises, fields)
+
+    async def search(self, user_id: UUID | None, data: ExerciseSearch) -> list[ExerciseRead]:
+        """Matches exercise names from an index of the user's exercises kept in memory.
+
+        Only the first search after a change, or after the index expires, reads from the database.
+        """
+        cache = get_search_cache()
+        if (index := cache.get(user_id)) is None:
+            token = cache.begin(user_id)
+            exercises = await self.fetch_json(queries.exercises_get_all, user_id=user_id)
+            index = cache.put(user_id, token, [ExerciseRead(**exercise) for exercise in exercises])
+        return index.search(data.query, data.limit, self.settings.EXERCISE_SEARCH_CUTOFF)
+
+    async def detail(
+        self, user_id: UUID | None, data: list[ExerciseDetail], fields: tuple[str, ...] | None = None
+    ) -> list[ExerciseRead] | list[dict[str, Any]]:
         try:
-            exercises = await self.query_owned_json(
-                """
-                WITH exercises := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        SELECT Exercise
-                        FILTER .id = <uuid>data['exercise_id'] AND .user.id = <uuid>$user_id
-                    ))
-                )
-                SELECT exercises {id, name, notes}
-                """,
-                data=data,
-                user_id=user_id,
-            )
-            return [ExerciseRead(**exercise) for exercise in exercises]
+            exercises = await self.query_owned_json(queries.exercises_detail, data=data, user_id=user_id, fields=fields)
+            return to_models(ExerciseRead, exercises, fields)
         except CardinalityViolationError as error:
             raise BusinessError(NO_EXERCISE_FOUND) from error
 
     async def create(self, user_id: UUID | None, data: list[ExerciseCreate]) -> list[ExerciseRead]:
         try:
-            exercises = await self.query_owned_json(
-                """
-                WITH exercises := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION (
-                        INSERT Exercise {
-                            name := <str>data['name'],
-                            notes := <optional str>data['notes'],
-                            user := (
-                                SELECT User
-                                FILTER .id = <uuid>$user_id
-                            )
-                        }
-                    )
-                )
-                SELECT exercises {id, name, notes}
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            exercises = await self.query_owned_json(queries.exercises_create, data=data, user_id=user_id)
+            get_search_cache().invalidate(user_id)
             return [ExerciseRead(**exercise) for exercise in exercises]
         except ConstraintViolationError as error:
             raise BusinessError(EXERCISE_WITH_NAME_ALREADY_EXISTS) from error
@@ -76,23 +79,8 @@ class ExerciseRepository(BaseRepository):
             if len({d.exercise_id for d in data}) != len(data):
                 raise BusinessError(IDS_MUST_BE_UNIQUE)
 
-            exercises = await self.query_owned_json(
-                """
-                WITH exercises := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        UPDATE Exercise
-                        FILTER .id = <uuid>data['exercise_id'] AND .user.id = <uuid>$user_id
-                        SET {
-                            name := <optional str>data['name'] ?? .name,
-                            notes := <optional str>data['notes'] ?? .notes
-                        }
-                    ))
-                )
-                SELECT exercises {id, name, notes}
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            exercises = await self.query_owned_json(queries.exercises_update, data=data, user_id=user_id)
+            get_search_cache().invalidate(user_id)
             return [ExerciseRead(**exercise) for exercise in exercises]
         except CardinalityViolationError as error:
             raise BusinessError(NO_EXERCISE_FOUND) from error
@@ -101,61 +89,22 @@ class ExerciseRepository(BaseRepository):
 
     async def delete(self, user_id: UUID | None, data: list[ExerciseDelete]) -> None:
         try:
-            await self.query_owned_json(
-                """
-                WITH exercises := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        SELECT Exercise
-                        FILTER .id = <uuid>data['exercise_id'] AND .user.id = <uuid>$user_id
-                    ))
-                )
-                DELETE exercises
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            await self.query_owned_json(queries.exercises_delete, data=data, user_id=user_id)
+            get_search_cache().invalidate(user_id)
         except CardinalityViolationError as error:
             raise BusinessError(NO_EXERCISE_FOUND) from error
 
-    async def progress(self, user_id: UUID | None, data: list[ExerciseProgress]) -> list[ExerciseProgressReport]:
+    async def progress(
+        self, user_id: UUID | None, data: list[ExerciseProgress], layout: Layout = Layout.ROWS
+    ) -> list[ExerciseProgressReport] | list[dict[str, Any]]:
         try:
-            exercises = await self.query_owned_json(
-                """
-                WITH exercises := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        SELECT Exercise
-                        FILTER .id = <uuid>data['exercise_id'] AND .user.id = <uuid>$user_id
-                    ))
-                )
-                SELECT exercises {id, name}
-                """,
-                data=data,
-                user_id=user_id,
-            )
-            progress_results = await self.query_owned_json(
-                """
-                WITH grouped_exercise_sets := (
-                    GROUP (
-                        FOR data IN array_unpack(<array<json>>$data) UNION (
-                            SELECT ExerciseSet
-                            FILTER .exercise.id = <uuid>data['exercise_id'] AND .exercise.user.id = <uuid>$user_id
-                        )
-                    ) BY (.workout, .exercise)
-                )
-                SELECT grouped_exercise_sets {
-                    name := .key.exercise.name,
-                    date := .key.workout.date,
-                    avg_rep_count := math::mean(.elements.rep_count),
-                    avg_weight := math::mean(.elements.weight),
-                    max_weight := max(.elements.weight)
-                }
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            exercises = await self.query_owned_json(queries.exercises_detail, data=data, user_id=user_id)
+            progress_results = await self.query_owned_json(queries.exercises_progress, data=data, user_id=user_id)
             progress_by_exercise = await self._join_progress_data_and_exercises_by_exercise_name(
                 exercises, progress_results
             )
+            if layout is Layout.COLUMNS:
+                return [progress_series(name, results) for name, results in progress_by_exercise.items()]
             progress_reports = [
                 {"exercise_name": exercise_name, "data": data_list}
                 for exercise_name, data_list in progress_by_exercise.items()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from ..queries import generated as queries
+from ..search import get_search_cache
+from ..volume import apply_volume
+from .base import BaseRepository, clean
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from datetime import date
+
+    from ...schemas import HistoryImportRow
+    from .base import Query
+
+
+# Pages are fetched with keyset pagination on id, the nil UUID sorts before every other id
+FIRST_PAGE = UUID(int=0)
+
+
+class HistoryRepository(BaseRepository):
+    async def import_batch(self, user_id: UUID | None, rows: list[HistoryImportRow]) -> int:
+        # Names are deduplicated here because two inserts with the same cleaned name
+        # in one statement would conflict with each other rather than with an existing row.
+        exercise_names = {clean(row.exercise): row.exercise for row in reversed(rows)}
+        workouts: dict[tuple[str, date], dict[str, Any]] = {}
+        for row in rows:
+            workout = workouts.setdefault(
+                (clean(row.workout), row.date), {"name": row.workout, "date": str(row.date), "exercises": []}
+            )
+            workout["exercises"].append(clean(row.exercise))
+
+        results = await self.query_json(
+            queries.history_import_batch,
+            None,
+            after=lambda transaction, results: apply_volume(transaction, user_id, added=results[0]["volume"]),
+            user_id=user_id,
+            exercise_names=list(exercise_names.values()),
+            workouts=[json.dumps(workout) for workout in workouts.values()],
+            # Workouts carry a nested list of exercises so they stay JSON, the far more numerous sets are typed arrays
+            set_workouts=[clean(row.workout) for row in rows],
+            set_dates=[row.date for row in rows],
+            set_exercises=[clean(row.exercise) for row in rows],
+            weights=[row.weight for row in rows],
+            rep_counts=[row.rep_count for row in rows],
+        )
+        # Imports create any exercise the user didn't have yet
+        get_search_cache().invalidate(user_id)
+        return results[0]["sets"]
+
+    def iter_exercises(self, user_id: UUID | None, chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        return self._paginate(queries.history_export_exercises, user_id, chunk_size)
+
+    def iter_workouts(self, user_id: UUID | None, chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        return self._paginate(queries.history_export_workouts, user_id, chunk_size)
+
+    def iter_sets(self, user_id: UUID | None, chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        return self._paginate(queries.history_export_sets, user_id, chunk_size)
+
+    async def _paginate(
+        self, query: Query, user_id: UUID | None, chunk_size: int
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        after = FIRST_PAGE
+        while page := await self.fetch_json(query, user_id=user_id, after=after, limit=chunk_size):
+            yield page
+            if len(page) < chunk_size:
+                break
+            after = UUID(page[-1]["id"])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from edgedb import CardinalityViolationError
+
+from ...errors.exceptions import BusinessError
+from ...errors.messages import NO_JOB_FOUND
+from ...models import JobRead, JobStatus
+from ..queries import generated as queries
+from .base import BaseRepository
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from ...schemas import JobDetail
+
+
+class JobRepository(BaseRepository):
+    async def create(self, user_id: UUID | None, kind: str) -> JobRead:
+        jobs = await self.fetch_json(queries.jobs_create, user_id=user_id, kind=kind)
+        return JobRead(**jobs[0])
+
+    async def enqueue(self, user_id: UUID | None, kind: str, timeout: int) -> JobRead | None:
+        # Jobs older than the timeout are taken as abandoned, like those of a worker that was killed
+        jobs = await self.fetch_json(queries.jobs_enqueue, user_id=user_id, kind=kind, timeout=timeout)
+        return JobRead(**jobs[0]) if jobs else None
+
+    async def detail(self, user_id: UUID | None, data: list[JobDetail]) -> list[JobRead]:
+        try:
+            jobs = await self.query_owned_json(queries.jobs_detail, data=data, user_id=user_id)
+            return [JobRead(**job) for job in jobs]
+        except CardinalityViolationError as error:
+            raise BusinessError(NO_JOB_FOUND) from error
+
+    async def start(self, job_id: UUID) -> None:
+        await self.fetch_json(queries.jobs_start, job_id=job_id)
+
+    async def finish(self, job_id: UUID, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        await self.fetch_json(
+            queries.jobs_finish,
+            job_id=job_id,
+            status=status.value,
+            result=None if result is None else json.dumps(result, default=str),
+            error=error,
+        )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..queries import generated as queries
+from .base import BaseRepository
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class PurgeRepository(BaseRepository):
+    """Removes deleted workouts and exercises for good, each statement bounded so no transaction runs long."""
+
+    async def purge_sets(self, user_id: UUID | None, limit: int) -> int:
+        results = await self.fetch_json(queries.purge_sets, user_id=user_id, limit=limit)
+        return int(results[0])
+
+    async def purge_rows(self, user_id: UUID | None) -> dict[str, Any]:
+        results = await self.fetch_json(queries.purge_rows, user_id=user_id)
+        return dict(results[0])
+
+    async def purge_jobs(self, user_id: UUID | None) -> int:
+        results = await self.fetch_json(
+            queries.purge_jobs, user_id=user_id, retention=self.settings.PURGE_JOB_RETENTION
+        )
+        return int(results[0])
+
+    async def users(self) -> list[UUID]:
+        # Users left with deleted rows, like those whose purge was interrupted by a restart
+        return [UUID(user["id"]) for user in await self.fetch_json(queries.purge_users)]
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from ...models import SearchHit
+from ..queries import generated as queries
+from .base import BaseRepository, clean
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from ...schemas import Search
+
+MAX_SEARCH_TERMS = 8
+WORD = re.compile(r"\w+")
+
+
+def search_patterns(query: str) -> list[str]:
+    """Turns each word of the query into a case insensitive pattern matching words starting with it.
+
+    Only word characters are kept, so nothing in the query is ever read as a regular expression.
+    """
+    terms = dict.fromkeys(WORD.findall(clean(query)))
+    return [rf"(?i)\m{term}" for term in list(terms)[:MAX_SEARCH_TERMS]]
+
+
+class SearchRepository(BaseRepository):
+    async def search(self, user_id: UUID | None, data: Search) -> list[SearchHit]:
+        if not (patterns := search_patterns(data.query)):
+            return []
+        hits = await self.fetch_json(
+            queries.search_all, user_id=user_id, patterns=patterns, offset=data.offset, limit=data.limit
+        )
+        # Tuples can't hold empty values, so the query fills fields a kind doesn't have with empty strings
+        return [SearchHit(**{key: value for key, value in hit.items() if value != ""}) for hit in hits]
@@ -1,58 +1,29 @@
 from __future__ import annotations
 
-import json
 import sys
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from edgedb import AsyncIOClient, ConstraintViolationError
-from fastapi import Depends, HTTPException
-from jose import JWTError, jwt
+from edgedb import ConstraintViolationError
+from fastapi import HTTPException
 
-from ...database.database import get_async_client
 from ...dependencies.passwords import verify_password
-from ...dependencies.settings import get_settings
+from ...dependencies.tokens import decode_token, encode_token
 from ...errors.exceptions import BusinessError
 from ...errors.messages import COULD_NOT_VALIDATE_CREDENTIALS, INCORRECT_USERNAME_OR_PASSWORD, USER_ALREADY_EXISTS
 from ...models import Token, User, UserRead
+from ...tracing.spans import span
+from ..queries import generated as queries
 from .base import BaseRepository
 
 if TYPE_CHECKING:
     from ...schemas import UserCreate
-    from ...settings import Settings
 
 
 class UserRepository(BaseRepository):
-    def __init__(self, client: AsyncIOClient, settings: Settings) -> None:
-        super().__init__(client)
-        self.settings = settings
-
-    @classmethod
-    async def as_dependency(
-        cls,
-        client: AsyncIOClient = Depends(get_async_client),
-        settings: Settings = Depends(get_settings),
-    ) -> "UserRepository":
-        return cls(client, settings)
-
     async def create(self, data: list[UserCreate]) -> list[UserRead]:
         try:
-            users = await self.query_json(
-                """
-                WITH users := (
-                    FOR user IN array_unpack(<array<json>>$data) UNION (
-                        INSERT User {
-                            username := <str>user['username'],
-                            hashed_password := <str>user['password'],
-                            email := <str>user['email'],
-                            disabled := <bool>False
-                        }
-                    )
-                )
-                SELECT users {id, username, disabled, email}
-                """,
-                data=data,
-            )
+            users = await self.query_json(queries.users_create, data=data)
             return [UserRead(**user) for user in users]
         except ConstraintViolationError as error:
             raise BusinessError(USER_ALREADY_EXISTS) from error
@@ -66,29 +37,20 @@ class UserRepository(BaseRepository):
 
     async def get_current_user(self, token: str) -> User:
         credentials_exception = HTTPException(status_code=401, detail=COULD_NOT_VALIDATE_CREDENTIALS)
-        try:
-            payload = jwt.decode(token, self.settings.SECRET_KEY, algorithms=[self.settings.HASH_ALGORITHM])
-            username = payload.get("username")
-            if username is None:
-                raise credentials_exception
-        except JWTError as error:
-            raise credentials_exception from error
+        with span("decode_token"):
+            payload = decode_token(token, self.settings)
+        if payload is None or (username := payload.get("username")) is None:
+            raise credentials_exception
 
-        if (user := await self.get_user_by_username(username)) is None:
+        with span("user_lookup"):
+            user = await self.get_user_by_username(username)
+        if user is None:
             raise credentials_exception
         return user
 
     async def get_user_by_username(self, username: str) -> User | None:
-        result = json.loads(
-            await self.client.query_single_json(
-                """
-                SELECT User {id, username, hashed_password, email, disabled}
-                FILTER .username = <str>$username
-                """,
-                username=username,
-            )
-        )
-        return User(**result) if result else None
+        results = await self.fetch_json(queries.users_get_by_username, username=username)
+        return User(**results[0]) if results else None
 
     async def authenticate_user(self, username: str, password: str) -> User | None:
         user = await self.get_user_by_username(username)
@@ -104,4 +66,4 @@ class UserRepository(BaseRepository):
             to_encode.update({"exp": datetime.now(UTC) + timedelta(minutes=self.settings.TOKEN_EXPIRE)})
         else:  # pragma: no cover
             to_encode.update({"exp": datetime.utcnow() + timedelta(minutes=self.settings.TOKEN_EXPIRE)})
-        return jwt.encode(to_encode, self.settings.SECRET_KEY, algorithm=self.settings.HASH_ALGORITHM)
+        return encode_token(to_encode, self.settings)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ...models import VolumeRollupRead
+from ..queries import generated as queries
+from ..volume import apply_volume
+from .base import BaseRepository, run_query
+from .history import FIRST_PAGE
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from typing import Any
+
+    from edgedb import AsyncIOExecutor
+
+    from ...schemas import VolumeSummary
+
+
+class VolumeRepository(BaseRepository):
+    async def summary(self, user_id: UUID | None, data: VolumeSummary) -> list[VolumeRollupRead]:
+        # Reads one row per exercise and period, however many sets were logged in them
+        rollups = await self.fetch_json(
+            queries.volume_summary,
+            user_id=user_id,
+            period=data.period.value,
+            start_date=data.start_date or date.min,
+            end_date=data.end_date or date.max,
+        )
+        return [VolumeRollupRead(**rollup) for rollup in rollups]
+
+    async def rebuild(self, user_id: UUID | None) -> None:
+        """Recomputes a user's rollups from their sets, for data written before the rollups existed."""
+
+        async def work(transaction: AsyncIOExecutor) -> None:
+            await run_query(transaction, queries.volume_clear, user_id=user_id)
+            # Rollups are summed up, so each page is added as it's read and only one page is ever held in memory
+            async for page in self._pages(transaction, user_id):
+                await apply_volume(transaction, user_id, added=page)
+
+        await self.in_transaction(work)
+
+    async def _pages(self, transaction: AsyncIOExecutor, user_id: UUID | None) -> AsyncIterator[list[dict[str, Any]]]:
+        after, chunk_size = FIRST_PAGE, self.settings.EXPORT_CHUNK_SIZE
+        while page := await run_query(
+            transaction, queries.volume_user_sets, user_id=user_id, after=after, limit=chunk_size
+        ):
+            yield page
+            after = UUID(page[-1]["id"])
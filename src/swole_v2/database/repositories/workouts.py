@@ -1,102 +1,87 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
 from edgedb import CardinalityViolationError, ConstraintViolationError
 from fastapi import HTTPException
 
 from ...errors.exceptions import BusinessError
-from ...errors.messages import IDS_MUST_BE_UNIQUE, NAME_AND_DATE_MUST_BE_UNIQUE, NO_EXERCISE_FOUND, NO_WORKOUT_FOUND
+from ...errors.messages import (
+    BATCH_TOO_LARGE,
+    FIELDS_WITH_EXERCISES,
+    IDS_MUST_BE_UNIQUE,
+    NAME_AND_DATE_MUST_BE_UNIQUE,
+    NO_EXERCISE_FOUND,
+    NO_WORKOUT_FOUND,
+)
 from ...models import Workout, WorkoutRead
-from .base import BaseRepository
+from ..queries import generated as queries
+from ..volume import apply_volume
+from .base import BaseRepository, run_query, to_models
 
 if TYPE_CHECKING:
-    from uuid import UUID
+    from edgedb import AsyncIOExecutor
 
-    from ...schemas import WorkoutAddExercise, WorkoutCopy, WorkoutCreate, WorkoutDelete, WorkoutDetail, WorkoutUpdate
+    from ...schemas import (
+        WorkoutAddExercise,
+        WorkoutCalendar,
+        WorkoutCopy,
+        WorkoutCreate,
+        WorkoutDelete,
+        WorkoutDetail,
+        WorkoutProgram,
+        WorkoutUpdate,
+    )
 
 
 class WorkoutRepository(BaseRepository):
-    async def get_all(self, user_id: UUID | None) -> list[WorkoutRead]:
-        results = await self.query_owned_json(
-            """
-            SELECT Workout {id, name, date}
-            FILTER .user.id = <uuid>$user_id
-            ORDER BY .date DESC
-            """,
-            user_id=user_id,
-        )
-        return [WorkoutRead(**result) for result in results]
+    async def get_all(
+        self, user_id: UUID | None, fields: tuple[str, ...] | None = None
+    ) -> list[WorkoutRead] | list[dict[str, Any]]:
+        results = await self.fetch_json(queries.workouts_get_all, user_id=user_id, fields=fields)
+        return to_models(WorkoutRead, results, fields)
+
+    async def calendar(self, user_id: UUID | None, data: WorkoutCalendar) -> list[list[Any]]:
+        """Counts the workouts of each day in the window that has any.
+
+        Days come back as [date, workouts] arrays, or [date, workouts, volume] with the volume,
+        so a year of training stays a few kilobytes however many workouts it holds.
+        """
+        query = queries.workouts_calendar_with_volume if data.with_volume else queries.workouts_calendar
+        return await self.fetch_json(query, user_id=user_id, start_date=data.start_date, end_date=data.end_date)
 
     async def add_exercises(self, user_id: UUID | None, data: list[WorkoutAddExercise]) -> list[WorkoutRead]:
         try:
-            workouts = await self.query_owned_json(
-                """
-                WITH workouts := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION (
-                        UPDATE Workout
-                        FILTER (.id = <uuid>data['workout_id'] AND .user.id = <uuid>$user_id)
-                        SET {
-                            exercises += assert_exists((
-                                SELECT Exercise
-                                FILTER .id = <uuid>data['exercise_id'] AND .user.id = <uuid>$user_id
-                            ))
-                        }
-                    )
-                )
-                SELECT workouts {id, name, date}
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            workouts = await self.query_owned_json(queries.workouts_add_exercises, data=data, user_id=user_id)
             return [WorkoutRead(**workout) for workout in workouts]
         except CardinalityViolationError as error:
             raise BusinessError(NO_EXERCISE_FOUND) from error
 
     async def detail(
-        self, user_id: UUID | None, data: list[WorkoutDetail], with_exercises: bool
-    ) -> list[WorkoutRead | Workout]:
+        self,
+        user_id: UUID | None,
+        data: list[WorkoutDetail],
+        with_exercises: bool,
+        fields: tuple[str, ...] | None = None,
+    ) -> list[Workout] | list[WorkoutRead] | list[dict[str, Any]]:
+        if with_exercises and fields:
+            raise BusinessError(FIELDS_WITH_EXERCISES)
         try:
-            select_query = "{id, name, date, exercises: {id, name, notes}}" if with_exercises else "{id, name, date}"
-            workouts = await self.query_owned_json(
-                f"""
-                WITH workouts := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        SELECT Workout
-                        FILTER .id = <uuid>data['workout_id'] AND .user.id = <uuid>$user_id
-                    ))
+            if with_exercises:
+                workouts = await self.query_owned_json(
+                    queries.workouts_detail_with_exercises, data=data, user_id=user_id
                 )
-                SELECT workouts {select_query}
-                ORDER BY .date DESC
-                """,
-                data=data,
-                user_id=user_id,
-            )
-            return [Workout(**workout) if with_exercises else WorkoutRead(**workout) for workout in workouts]
+                return [Workout(**workout) for workout in workouts]
+            # Each selection of fields is its own statement too, see queries/shapes.py
+            workouts = await self.query_owned_json(queries.workouts_detail, data=data, user_id=user_id, fields=fields)
+            return to_models(WorkoutRead, workouts, fields)
         except CardinalityViolationError as error:
             raise BusinessError(NO_WORKOUT_FOUND) from error
 
     async def create(self, user_id: UUID | None, data: list[WorkoutCreate]) -> list[WorkoutRead]:
         try:
-            workouts = await self.query_owned_json(
-                """
-                WITH workouts := (
-                    FOR workout IN array_unpack(<array<json>>$data) UNION (
-                        INSERT Workout {
-                            name := <str>workout['name'],
-                            date := <cal::local_date>workout['date'],
-                            user := (
-                                SELECT User
-                                FILTER .id = <uuid>$user_id
-                            )
-                        }
-                    )
-                )
-                SELECT workouts {id, name, date}
-                """,
-                data=data,
-                user_id=user_id,
-            )
+            workouts = await self.query_owned_json(queries.workouts_create, data=data, user_id=user_id)
             return [WorkoutRead(**workout) for workout in workouts]
         except ConstraintViolationError as exc:
             raise BusinessError(NAME_AND_DATE_MUST_BE_UNIQUE) from exc
@@ -104,17 +89,14 @@ class WorkoutRepository(BaseRepository):
     async def delete(self, user_id: UUID | None, data: list[WorkoutDelete]) -> None:
         try:
             await self.query_owned_json(
-                """
-                WITH workouts := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        SELECT Workout
-                        FILTER .id = <uuid>data['workout_id'] AND .user.id = <uuid>$user_id
-                    ))
-                )
-                DELETE workouts
-                """,
+                queries.workouts_delete,
                 data=data,
                 user_id=user_id,
+                after=lambda transaction, results: apply_volume(
+                    transaction,
+                    user_id,
+                    removed=[exercise_set for result in results for exercise_set in result["sets"]],
+                ),
             )
         except CardinalityViolationError as error:
             raise BusinessError(NO_WORKOUT_FOUND) from error
@@ -127,21 +109,10 @@ class WorkoutRepository(BaseRepository):
                 raise BusinessError(IDS_MUST_BE_UNIQUE)
 
             workouts = await self.query_owned_json(
-                """
-                WITH workouts := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION assert_exists((
-                        UPDATE Workout
-                        FILTER .id = <uuid>data['workout_id'] AND .user.id = <uuid>$user_id
-                        SET {
-                            name := <optional str>data['name'] ?? .name,
-                            date := <optional cal::local_date>data['date'] ?? .date
-                        }
-                    ))
-                )
-                SELECT workouts {id, name, date}
-                """,
+                queries.workouts_update,
                 data=data,
                 user_id=user_id,
+                after=lambda transaction, results: self._move_volume(transaction, user_id, results),
             )
             return [WorkoutRead(**workout) for workout in workouts]
         except CardinalityViolationError as error:
@@ -152,28 +123,42 @@ class WorkoutRepository(BaseRepository):
     async def copy(self, user_id: UUID | None, data: list[WorkoutCopy]) -> list[WorkoutRead]:
         try:
             workouts = await self.query_owned_json(
-                """
-                WITH copies := (
-                    FOR data IN array_unpack(<array<json>>$data) UNION (
-                        WITH workout := assert_exists((
-                            SELECT Workout
-                            FILTER .id = <uuid>data['workout_id'] AND .user.id = <uuid>$user_id
-                        ))
-                        INSERT Workout {
-                            name := workout.name,
-                            date := <cal::local_date>data['date'],
-                            user := workout.user,
-                            exercises := workout.exercises
-                        }
-                    )
-                )
-                SELECT copies {id, name, date}
-                """,
+                queries.workouts_copy,
                 data=data,
                 user_id=user_id,
+                after=lambda transaction, results: self._add_copied_volume(transaction, user_id, results),
             )
             return [WorkoutRead(**workout) for workout in workouts]
         except CardinalityViolationError as exc:
             raise HTTPException(status_code=404, detail=NO_WORKOUT_FOUND) from exc
         except ConstraintViolationError as exc:
             raise BusinessError(NAME_AND_DATE_MUST_BE_UNIQUE) from exc
+
+    async def program(self, user_id: UUID | None, data: list[WorkoutProgram]) -> list[WorkoutRead]:
+        # Every date of every program is copied by the same statement, so a program is created entirely or not at all
+        copies = [copy for program in data for copy in program.copies()]
+        # The batch size check only counts programs, each of which can expand into hundreds of copies
+        if len(copies) > self.settings.MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=BATCH_TOO_LARGE.format(self.settings.MAX_BATCH_SIZE))
+        return await self.copy(user_id, copies)
+
+    @staticmethod
+    async def _move_volume(transaction: AsyncIOExecutor, user_id: UUID | None, workouts: list[dict[str, Any]]) -> None:
+        moved = [workout for workout in workouts if workout["date"] != workout["previous_date"]]
+        await apply_volume(
+            transaction,
+            user_id,
+            added=[{**s, "date": workout["date"]} for workout in moved for s in workout["sets"]],
+            removed=[{**s, "date": workout["previous_date"]} for workout in moved for s in workout["sets"]],
+        )
+
+    @staticmethod
+    async def _add_copied_volume(
+        transaction: AsyncIOExecutor, user_id: UUID | None, workouts: list[dict[str, Any]]
+    ) -> None:
+        # The copied sets can't be read back by the statement inserting them, so they're read by a second one
+        workout_ids = [UUID(workout["id"]) for workout in workouts]
+        exercise_sets = await run_query(
+            transaction, queries.volume_workout_sets, workout_id=workout_ids, user_id=user_id
+        )
+        await apply_volume(transaction, user_id, added=exercise_sets)
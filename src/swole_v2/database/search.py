@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from ..dependencies.settings import get_settings
+from .repositories.base import clean
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from uuid import UUID
+
+    from ..models import ExerciseRead
+
+
+@dataclass
+class ExerciseIndex:
+    """A user's exercises sorted by cleaned name, so a prefix is found with a binary search."""
+
+    names: list[str]
+    exercises: list[ExerciseRead]
+    built_at: float = 0.0
+
+    @classmethod
+    def build(cls, exercises: list[ExerciseRead], built_at: float = 0.0) -> ExerciseIndex:
+        entries = sorted(((clean(exercise.name or ""), exercise) for exercise in exercises), key=lambda entry: entry[0])
+        return cls([name for name, _ in entries], [exercise for _, exercise in entries], built_at)
+
+    def search(self, query: str, limit: int, cutoff: float) -> list[ExerciseRead]:
+        """Returns the exercises starting with the query, topped up with close matches for typos."""
+        query = clean(query)
+        matches = self.prefix(query, limit)
+        if len(matches) < limit:
+            matches += (position for position in self.fuzzy(query, limit, cutoff) if position not in matches)
+        return [self.exercises[position] for position in matches[:limit]]
+
+    def prefix(self, query: str, limit: int) -> list[int]:
+        start = bisect.bisect_left(self.names, query)
+        end = min(start + limit, len(self.names))
+        return [position for position in range(start, end) if self.names[position].startswith(query)]
+
+    def fuzzy(self, query: str, limit: int, cutoff: float) -> list[int]:
+        # Only the start of each name is compared, since the query is what has been typed of it so far.
+        # Like difflib.get_close_matches, the cheap upper bounds skip most names before the full ratio.
+        matcher = SequenceMatcher(b=query)
+        scored = []
+        for position, name in enumerate(self.names):
+            matcher.set_seq1(name[: len(query)])
+            if (
+                matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff
+                and (ratio := matcher.ratio()) >= cutoff
+            ):
+                scored.append((-ratio, position))
+        return [position for _, position in heapq.nsmallest(limit, scored)]
+
+
+@dataclass
+class ExerciseSearchCache:
+    """Keeps the exercise indexes of the most recently active users in the worker's memory.
+
+    Writes made by this worker drop the user's index straight away, while those made by other
+    workers are picked up once the index is older than the time to live.
+    """
+
+    max_users: int
+    ttl: float
+    clock: Callable[[], float] = time.monotonic
+    indexes: OrderedDict[UUID | None, ExerciseIndex] = field(default_factory=OrderedDict)
+    # Users whose index is being built, an invalidation meanwhile keeps the built index out of the cache
+    building: dict[UUID | None, object] = field(default_factory=dict)
+
+    def get(self, user_id: UUID | None) -> ExerciseIndex | None:
+        index = self.indexes.get(user_id)
+        if index is None or self.clock() - index.built_at > self.ttl:
+            return None
+        self.indexes.move_to_end(user_id)
+        return index
+
+    def begin(self, user_id: UUID | None) -> object:
+        token = self.building[user_id] = object()
+        return token
+
+    def put(self, user_id: UUID | None, token: object, exercises: list[ExerciseRead]) -> ExerciseIndex:
+        index = ExerciseIndex.build(exercises, self.clock())
+        if self.building.get(user_id) is token:
+            del self.building[user_id]
+            self.indexes[user_id] = index
+            self.indexes.move_to_end(user_id)
+            if len(self.indexes) > self.max_users:
+                self.indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, user_id: UUID | None) -> None:
+        self.indexes.pop(user_id, None)
+        self.building.pop(user_id, None)
+
+
+@lru_cache
+def get_search_cache() -> ExerciseSearchCache:
+    # One cache per worker process, shared by every request it serves
+    settings = get_settings()
+    return ExerciseSearchCache(max_users=settings.EXERCISE_SEARCH_MAX_USERS, ttl=settings.EXERCISE_SEARCH_TTL)
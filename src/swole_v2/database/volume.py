@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import datetime
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from .queries import generated as queries
+from .repositories.base import run_query
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from edgedb import AsyncIOExecutor
+
+PERIODS = ("Week", "Month")
+
+
+def period_start(period: str, date: datetime.date) -> datetime.date:
+    # Weeks are ISO weeks, so they start on a Monday
+    if period == "Week":
+        return date - datetime.timedelta(days=date.weekday())
+    return date.replace(day=1)
+
+
+def volume_changes(
+    added: Iterable[dict[str, Any]] = (), removed: Iterable[dict[str, Any]] = ()
+) -> dict[tuple[UUID, str, datetime.date], list[int]]:
+    """Sums how much each week and month of each exercise gains or loses from the given sets.
+
+    Sets are dicts with the weight, rep_count, exercise_id and date the queries return for them.
+    Changes that cancel out, like a set moved within the same week, are left out.
+    """
+    # Each key's totals are its volume, set count and rep count
+    changes: dict[tuple[UUID, str, datetime.date], list[int]] = defaultdict(lambda: [0, 0, 0])
+    for sign, exercise_sets in ((1, added), (-1, removed)):
+        for exercise_set in exercise_sets:
+            date = datetime.date.fromisoformat(str(exercise_set["date"]))
+            reps = exercise_set["rep_count"]
+            for period in PERIODS:
+                totals = changes[UUID(str(exercise_set["exercise_id"])), period, period_start(period, date)]
+                totals[0] += sign * reps * exercise_set["weight"]
+                totals[1] += sign
+                totals[2] += sign * reps
+    return {key: totals for key, totals in changes.items() if any(totals)}
+
+
+async def apply_volume(
+    executor: AsyncIOExecutor,
+    user_id: UUID | None,
+    added: Iterable[dict[str, Any]] = (),
+    removed: Iterable[dict[str, Any]] = (),
+) -> None:
+    """Adds the volume of the added sets to the rollups and takes off that of the removed ones.
+
+    Meant to run in the transaction that writes the sets, so the rollups never drift from them.
+    """
+    if not (changes := volume_changes(added, removed)):
+        return
+    keys, totals = list(changes), list(changes.values())
+    await run_query(
+        executor,
+        queries.volume_apply,
+        user_id=user_id,
+        exercise_id=[exercise_id for exercise_id, _, _ in keys],
+        period=[period for _, period, _ in keys],
+        period_start=[start for _, _, start in keys],
+        volume=[volume for volume, _, _ in totals],
+        set_count=[set_count for _, set_count, _ in totals],
+        rep_count=[rep_count for _, _, rep_count in totals],
+    )
+    # Weeks and months left without any sets are dropped rather than kept at zero
+    if any(set_count < 0 for _, set_count, _ in totals):
+        await run_query(executor, queries.volume_prune, user_id=user_id)
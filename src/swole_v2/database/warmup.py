@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from edgedb import EdgeDBError
+
+from .queries.generated import PARAMETERS, QUERIES
+
+if TYPE_CHECKING:
+    from edgedb import AsyncIOClient
+
+logger = logging.getLogger(__name__)
+
+# The statements behind the most called routes, compiled once on startup instead of on the first request
+HOT_QUERIES = (
+    "users_get_by_username",
+    "workouts_get_all",
+    "workouts_detail",
+    "exercises_get_all",
+    "exercises_detail",
+    "sets_get_all",
+    "sets_add",
+)
+EMPTY_VALUES: dict[str, Any] = {
+    "bool": False,
+    "cal::local_date": date.min,
+    "int64": 0,
+    "json": "null",
+    "str": "",
+    "uuid": UUID(int=0),
+}
+
+
+class Rollback(Exception):
+    """Raised to roll back the warm-up transaction."""
+
+
+def empty_arguments(parameters: dict[str, str]) -> dict[str, Any]:
+    # Empty arrays and the nil UUID match no rows, so every statement is compiled without touching any data
+    return {
+        name: [] if kind.startswith("array<") else None if kind.startswith("optional ") else EMPTY_VALUES[kind]
+        for name, kind in parameters.items()
+    }
+
+
+async def warm_up(client: AsyncIOClient, names: tuple[str, ...] = HOT_QUERIES) -> None:
+    try:
+        async for transaction in client.transaction():
+            async with transaction:
+                for name in names:
+                    await transaction.query_json(QUERIES[name], **empty_arguments(PARAMETERS[name]))
+                raise Rollback
+    except Rollback:
+        pass
+    except EdgeDBError:
+        # Only the first requests are slower without it, which is no reason to keep the worker from starting
+        logger.warning("Could not warm up the query cache", exc_info=True)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import Depends, HTTPException, Request
+
+from ..errors.messages import BATCH_TOO_LARGE
+from .settings import get_settings
+
+if TYPE_CHECKING:
+    from ..settings import Settings
+
+
+async def check_batch_size(request: Request, settings: Settings = Depends(get_settings)) -> None:
+    # Runs before the body is validated, so oversized batches are rejected without validating every item
+    try:
+        body = await request.json()
+    except ValueError:
+        return  # Malformed bodies are reported by request validation
+    limit = settings.BATCH_SIZE_LIMITS.get(request.scope["route"].path, settings.MAX_BATCH_SIZE)
+    if isinstance(body, list) and len(body) > limit:
+        raise HTTPException(status_code=413, detail=BATCH_TOO_LARGE.format(limit))
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import Query
+
+from ..errors.exceptions import BusinessError
+from ..errors.messages import FIELD_CANNOT_BE_EMPTY, UNKNOWN_FIELDS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydantic import BaseModel
+
+
+def sparse_fields(model: type[BaseModel]) -> Callable[..., tuple[str, ...] | None]:
+    """Builds a dependency reading the fields query parameter, a comma separated subset of the model's fields.
+
+    Fields come back in the model's own order however they were asked for, so each subset maps
+    to a single statement whose shape selects only those fields.
+    """
+
+    # A closure rather than a callable instance, FastAPI resolves the annotations through the function's globals
+    def parse(fields: Annotated[str | None, Query()] = None) -> tuple[str, ...] | None:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",")} - {""}
+        if not requested:
+            raise BusinessError(FIELD_CANNOT_BE_EMPTY.format("fields"))
+        if unknown := requested - model.model_fields.keys():
+            raise BusinessError(UNKNOWN_FIELDS.format(", ".join(sorted(unknown)), ", ".join(model.model_fields)))
+        return tuple(name for name in model.model_fields if name in requested)
+
+    return parse
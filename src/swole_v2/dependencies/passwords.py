@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache
+def get_password_context() -> CryptContext:
+    # Passlib and its bcrypt backend are only loaded once a password is first hashed or checked
+    from passlib.context import CryptContext  # noqa: PLC0415
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 async def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
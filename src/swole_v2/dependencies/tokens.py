@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..settings import Settings
+
+
+def encode_token(claims: dict[str, Any], settings: Settings) -> str:
+    # Jose pulls in the cryptography package, so it's only loaded once a token is first handled
+    from jose import jwt  # noqa: PLC0415
+
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.HASH_ALGORITHM)
+
+
+def decode_token(token: str, settings: Settings) -> dict[str, Any] | None:
+    """Returns the token's claims, or None if it isn't signed with our key or has expired."""
+    from jose import JWTError, jwt  # noqa: PLC0415
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM])
+    except JWTError:
+        return None
@@ -1,18 +1,36 @@
 from __future__ import annotations
 
+BATCH_TOO_LARGE = "Batch cannot contain more than {} items"
+CALENDAR_TOO_LONG = "Calendar cannot span more than {} days"
 CANNOT_BE_GREATER_THAN = "Field cannot be greater than {}"
 COULD_NOT_VALIDATE_CREDENTIALS = "Could not validate credentials"
+DATABASE_BUSY = "The server is busy, try again in a moment"
+END_DATE_BEFORE_START_DATE = "End date cannot be before the start date"
 EXERCISE_WITH_NAME_ALREADY_EXISTS = "Exercise with the given name already exists"
+FIELDS_WITH_EXERCISES = "Fields cannot be selected along with the workout exercises"
 FIELD_CANNOT_BE_EMPTY = "Field {} cannot be empty"
+HISTORY_FILE_TOO_LARGE = "History file cannot be larger than {} bytes"
 IDS_MUST_BE_UNIQUE = "All IDs in the given data must be unique."
 INACTIVE_USER = "Inactive user"
 INCORRECT_DATE_FORMAT = "Incorrect date format, should be YYYY-MM-DD"
 INCORRECT_USERNAME_OR_PASSWORD = "Incorrect username or password"
+INVALID_HISTORY_FILE = "History file could not be parsed"
+INVALID_HISTORY_ROW = "Row {}: {}"
 INVALID_ID = "Invalid ID"
+INVALID_RATE_LIMIT = "Invalid rate limit {}, expected a budget like 10/minute"
+INVALID_REQUEST_BODY = "Request body could not be decoded"
+JOB_INTERRUPTED = "The server stopped before the job finished, submit it again"
 MUST_BE_A_VALID_POSITIVE_INT = "Field must be a valid positive integer"
 MUST_BE_POSITIVE = "Field {} must be a positive integer"
 NAME_AND_DATE_MUST_BE_UNIQUE = "Another workout already exists with the same name and date"
+NO_DATES_GIVEN = "At least one date or a recurrence must be given"
 NO_EXERCISE_FOUND = "No exercise found"
+NO_JOB_FOUND = "No job found"
 NO_SET_FOUND = "No set was found with the given ids"
 NO_WORKOUT_FOUND = "No workout found"
+RECURRENCE_TOO_LATE = "Recurrence cannot go past {}"
+REQUEST_BODY_TOO_LARGE = "Request body cannot be larger than {} bytes"
+TOO_MANY_REQUESTS = "Too many requests, try again later"
+UNKNOWN_FIELDS = "Unknown fields {}, expected some of {}"
+UNSUPPORTED_HISTORY_FORMAT = "History file must be a .csv, .json, .ndjson or .jsonl file"
 USER_ALREADY_EXISTS = "A user with that username already exists"
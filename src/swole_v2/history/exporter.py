@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from uuid import UUID
+
+    from ..database.repositories import HistoryRepository
+
+CSV_COLUMNS = ["type", "id", "name", "date", "notes", "exercises", "workout_id", "exercise_id", "weight", "rep_count"]
+CSV_HEADER = (",".join(CSV_COLUMNS) + "\r\n").encode()
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self == ExportFormat.NDJSON else "text/csv"
+
+
+class HistoryExporter:
+    """Streams every exercise, workout and set a user owns, one database page at a time.
+
+    Each page is encoded and handed to the response before the next one is read,
+    so memory use depends on the chunk size rather than on the size of the history.
+    """
+
+    def __init__(self, repository: HistoryRepository, chunk_size: int) -> None:
+        self.repository = repository
+        self.chunk_size = chunk_size
+
+    async def stream(self, user_id: UUID | None, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        encode = encode_ndjson if export_format == ExportFormat.NDJSON else encode_csv
+        if export_format == ExportFormat.CSV:
+            yield CSV_HEADER
+        for record_type, pages in [
+            ("exercise", self.repository.iter_exercises(user_id, self.chunk_size)),
+            ("workout", self.repository.iter_workouts(user_id, self.chunk_size)),
+            ("set", self.repository.iter_sets(user_id, self.chunk_size)),
+        ]:
+            async for page in pages:
+                yield encode([{"type": record_type, **record} for record in page])
+
+
+def encode_ndjson(records: list[dict[str, Any]]) -> bytes:
+    return "".join(f"{json.dumps(record)}\n" for record in records).encode()
+
+
+def encode_csv(records: list[dict[str, Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writerows({**record, "exercises": " ".join(record.get("exercises", []))} for record in records)
+    return buffer.getvalue().encode()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from ..errors.exceptions import BusinessError
+from ..errors.messages import INVALID_HISTORY_ROW
+from ..models import ImportSummary
+from ..schemas import HistoryImportRow
+from .parsers import read_rows
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from uuid import UUID
+
+    from ..database.repositories import HistoryRepository
+    from .parsers import HistoryFormat
+
+
+class HistoryImporter:
+    """Imports history rows in fixed-size batches, each committed in its own transaction.
+
+    Only one batch is held in memory at a time. The summary's row count is the number of rows
+    committed so far, so an import that fails part way can be resumed by skipping that many rows.
+    Reading the file and validating its rows both block, so every batch is prepared in a worker thread.
+    """
+
+    def __init__(
+        self,
+        repository: HistoryRepository,
+        batch_size: int,
+        on_progress: Callable[[ImportSummary], None] | None = None,
+    ) -> None:
+        self.repository = repository
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+
+    async def run(self, user_id: UUID | None, rows: Iterable[dict[str, Any]], resume_from: int = 0) -> ImportSummary:
+        summary = ImportSummary(rows=resume_from)
+        numbered = islice(enumerate(rows, start=1), resume_from, None)
+        while batch := await run_in_threadpool(self._read_batch, numbered):
+            await self._commit(user_id, batch, summary)
+        return summary
+
+    def _read_batch(self, numbered: Iterator[tuple[int, dict[str, Any]]]) -> list[HistoryImportRow]:
+        return [self._validate(number, row) for number, row in islice(numbered, self.batch_size)]
+
+    async def _commit(self, user_id: UUID | None, batch: list[HistoryImportRow], summary: ImportSummary) -> None:
+        summary.sets += await self.repository.import_batch(user_id, batch)
+        summary.rows += len(batch)
+        summary.batches += 1
+        if self.on_progress:
+            self.on_progress(summary)
+
+    @staticmethod
+    def _validate(number: int, row: dict[str, Any]) -> HistoryImportRow:
+        try:
+            return HistoryImportRow.model_validate(row)
+        except ValidationError as error:
+            raise BusinessError(INVALID_HISTORY_ROW.format(number, error.errors()[0]["msg"])) from error
+        except BusinessError as error:
+            raise BusinessError(INVALID_HISTORY_ROW.format(number, error)) from error
+
+
+class ResumableImport:
+    """Imports a whole uploaded file as a background job.
+
+    The upload is kept in memory because the request's temporary file is gone by the time the job runs.
+    A retried attempt skips the rows earlier attempts committed, so no set is imported twice.
+    """
+
+    def __init__(
+        self,
+        importer: HistoryImporter,
+        user_id: UUID | None,
+        content: bytes,
+        history_format: HistoryFormat,
+        resume_from: int = 0,
+    ) -> None:
+        self.importer = importer
+        self.importer.on_progress = self.track
+        self.user_id = user_id
+        self.content = content
+        self.history_format = history_format
+        self.committed = ImportSummary(rows=resume_from)
+        self.progress: ImportSummary | None = None
+
+    async def __call__(self) -> ImportSummary:
+        self.collect()
+        rows = read_rows(io.BytesIO(self.content), self.history_format)
+        summary = await self.importer.run(self.user_id, rows, self.committed.rows)
+        return ImportSummary(
+            rows=summary.rows, batches=self.committed.batches + summary.batches, sets=self.committed.sets + summary.sets
+        )
+
+    def track(self, summary: ImportSummary) -> None:
+        self.progress = summary
+
+    def collect(self) -> None:
+        # Adds up what the last failed attempt committed before the next one resumes after it
+        if self.progress is not None:
+            self.committed = ImportSummary(
+                rows=self.progress.rows,
+                batches=self.committed.batches + self.progress.batches,
+                sets=self.committed.sets + self.progress.sets,
+            )
+            self.progress = None
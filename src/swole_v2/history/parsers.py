@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from enum import Enum
+from pathlib import PurePath
+from typing import IO, TYPE_CHECKING, Any
+
+from ..errors.exceptions import BusinessError
+from ..errors.messages import INVALID_HISTORY_FILE, UNSUPPORTED_HISTORY_FORMAT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+SEPARATORS = frozenset("[],\r\n\t ")
+
+
+class HistoryFormat(str, Enum):
+    CSV = "csv"
+    JSON = "json"
+
+    @classmethod
+    def from_filename(cls, filename: str | None) -> HistoryFormat:
+        suffix = PurePath(filename or "").suffix.lower()
+        if suffix == ".csv":
+            return cls.CSV
+        if suffix in {".json", ".ndjson", ".jsonl"}:
+            return cls.JSON
+        raise BusinessError(UNSUPPORTED_HISTORY_FORMAT)
+
+
+def read_rows(stream: IO[bytes], history_format: HistoryFormat) -> Iterator[dict[str, Any]]:
+    if history_format == HistoryFormat.CSV:
+        # Iterating a binary file yields one line at a time, so the file is never read into memory
+        return decode_rows(csv.DictReader(codecs.iterdecode(stream, "utf-8-sig")))
+    return decode_rows(JsonRecordReader(stream))
+
+
+def decode_rows(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    # Both readers decode lazily, so a file that isn't UTF-8 only fails once its rows are read
+    try:
+        yield from rows
+    except UnicodeDecodeError as error:
+        raise BusinessError(INVALID_HISTORY_FILE) from error
+
+
+class JsonRecordReader:
+    """Reads objects one at a time from either a JSON array or newline-delimited JSON."""
+
+    def __init__(self, stream: IO[bytes], chunk_size: int = CHUNK_SIZE) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.position = 0
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while self._skip_separators():
+            yield self._decode()
+
+    def _skip_separators(self) -> bool:
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in SEPARATORS:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return True
+            if not self._fill():
+                return False
+
+    def _decode(self) -> dict[str, Any]:
+        while True:
+            try:
+                record, self.position = self.decoder.raw_decode(self.buffer, self.position)
+                return record
+            except json.JSONDecodeError as error:
+                # The record may just be cut off at the end of the buffer, so read more before giving up
+                if len(self.buffer) - self.position > MAX_RECORD_SIZE or not self._fill():
+                    raise BusinessError(INVALID_HISTORY_FILE) from error
+
+    def _fill(self) -> bool:
+        chunk = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.position :] + self.text_decoder.decode(chunk, final=not chunk)
+        self.position = 0
+        return bool(chunk)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..database.limiter import Priority
+from ..database.repositories import PurgeRepository
+from ..models import PurgeSummary
+from .runner import get_job_runner
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from ..database.repositories.base import BaseRepository
+    from ..models import JobRead
+
+
+class Purge:
+    """Removes a user's deleted workouts and exercises along with their sets, a chunk of sets at a time.
+
+    Deletes only tombstone rows, so a purge can always be run again and picks up where an
+    interrupted one stopped. Totals add up over every attempt of the job. Old purge jobs of
+    the user are removed along the way, so deletes don't leave a job behind each.
+    """
+
+    def __init__(self, repository: PurgeRepository, user_id: UUID | None, chunk_size: int) -> None:
+        self.repository = repository
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.summary = PurgeSummary()
+
+    async def __call__(self) -> PurgeSummary:
+        while (purged := await self.repository.purge_sets(self.user_id, self.chunk_size)) > 0:
+            self.summary.sets += purged
+            if purged < self.chunk_size:
+                break
+        rows = await self.repository.purge_rows(self.user_id)
+        self.summary.workouts += rows["workouts"]
+        self.summary.exercises += rows["exercises"]
+        await self.repository.purge_jobs(self.user_id)
+        return self.summary.model_copy()
+
+
+async def schedule_purge(repository: BaseRepository, user_id: UUID | None) -> JobRead | None:
+    # Purges yield the database to requests, like every other background job
+    purges = PurgeRepository(repository.client, repository.settings, Priority.LOW)
+    work = Purge(purges, user_id, repository.settings.PURGE_CHUNK_SIZE)
+    # A pending purge covers this delete too, anything a running one misses is left to the next
+    return await get_job_runner().submit_unless_pending(user_id, "purge", work, repository.settings.PURGE_JOB_RETENTION)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from edgedb import EdgeDBError
+from fastapi import HTTPException, status
+
+from ..database.database import get_async_client
+from ..database.limiter import Priority
+from ..database.repositories import JobRepository
+from ..dependencies.settings import get_settings
+from ..errors.exceptions import BusinessError
+from ..errors.messages import JOB_INTERRUPTED
+from ..models import JobStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from uuid import UUID
+
+    from pydantic import BaseModel
+
+    from ..models import JobRead
+
+    # The work behind a job, it's called again from scratch on every attempt
+    Work = Callable[[], Awaitable[BaseModel]]
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """Runs slow work in the background of the worker that accepted it.
+
+    The job's record in the database is what clients poll, so any worker can report on a job
+    no matter which one is running it. Database and overload errors are retried with an exponential
+    backoff, any other error fails the job at once.
+    """
+
+    def __init__(self, repository: JobRepository, max_concurrency: int, max_attempts: int, retry_delay: float) -> None:
+        self.repository = repository
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, user_id: UUID | None, kind: str, work: Work) -> JobRead:
+        job = await self.repository.create(user_id, kind)
+        self.schedule(job.id, work)
+        return job
+
+    async def submit_unless_pending(self, user_id: UUID | None, kind: str, work: Work, timeout: int) -> JobRead | None:
+        """Submits the work unless the user already has a job of this kind waiting or running.
+
+        Meant for work that catches up on everything left to do, where the pending job covers the new request too.
+        """
+        job = await self.repository.enqueue(user_id, kind, timeout)
+        if job is not None:
+            self.schedule(job.id, work)
+        return job
+
+    def schedule(self, job_id: UUID, work: Work) -> None:
+        task = asyncio.create_task(self.run(job_id, work))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(self, job_id: UUID, work: Work) -> None:
+        try:
+            async with self.semaphore:
+                for attempt in range(1, self.max_attempts + 1):
+                    if await self.attempt(job_id, work, attempt):
+                        return
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+        except asyncio.CancelledError:
+            # Covers jobs still waiting for their turn as well as running ones
+            await self.record(job_id, JobStatus.FAILED, JOB_INTERRUPTED)
+            raise
+        except Exception as error:
+            # Only the final status can't be written here, so one last try is made to at least fail the job
+            logger.exception("Could not record the outcome of job %s", job_id)
+            await self.record(job_id, JobStatus.FAILED, describe(error))
+
+    async def attempt(self, job_id: UUID, work: Work, attempt: int) -> bool:
+        """Runs the work once, returning whether the job is finished either way."""
+        try:
+            await self.repository.start(job_id)
+            result = await work()
+        except Exception as error:
+            if attempt == self.max_attempts or not is_retryable(error):
+                await self.repository.finish(job_id, JobStatus.FAILED, error=describe(error))
+                return True
+            # The next attempt starts the job over, so it doesn't matter much if this isn't recorded
+            await self.record(job_id, JobStatus.QUEUED, describe(error))
+            return False
+        await self.repository.finish(job_id, JobStatus.SUCCEEDED, result=result.model_dump(mode="json"))
+        return True
+
+    async def record(self, job_id: UUID, job_status: JobStatus, error: str) -> None:
+        try:
+            await self.repository.finish(job_id, job_status, error=error)
+        except Exception:
+            logger.exception("Could not record job %s as %s", job_id, job_status.value)
+
+    async def stop(self, timeout: float) -> None:
+        # Running jobs get a grace period, anything still going afterwards is cancelled and marked as failed
+        if self.tasks:
+            _, pending = await asyncio.wait(self.tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def is_retryable(error: Exception) -> bool:
+    # Failures that may pass by themselves, like a dropped connection or a 503 from an overloaded limiter
+    if isinstance(error, HTTPException):
+        return error.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    return isinstance(error, (EdgeDBError, OSError))
+
+
+def describe(error: Exception) -> str:
+    if isinstance(error, BusinessError):
+        return str(error)
+    return str(error.detail) if isinstance(error, HTTPException) else f"{type(error).__name__}: {error}"
+
+
+@lru_cache
+def get_job_runner() -> JobRunner:
+    # One runner per worker process, its jobs use the database at a low priority so requests go first
+    settings = get_settings()
+    return JobRunner(
+        JobRepository(get_async_client(), settings, Priority.LOW),
+        max_concurrency=settings.JOB_MAX_CONCURRENCY,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        retry_delay=settings.JOB_RETRY_DELAY,
+    )
@@ -0,0 +1,14 @@
+from .compression import CompressionMiddleware
+from .negotiation import NegotiatedResponse, NegotiationMiddleware
+from .profiler import ProfilerMiddleware
+from .rate_limit import RateLimitMiddleware
+from .tracing import TracingMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "NegotiatedResponse",
+    "NegotiationMiddleware",
+    "ProfilerMiddleware",
+    "RateLimitMiddleware",
+    "TracingMiddleware",
+]
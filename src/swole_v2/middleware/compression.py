@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Images and archives are already compressed, so only text-like bodies are worth the CPU.
+# MessagePack and CBOR bodies repeat the same keys on every item, so they still shrink well.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/msgpack", "application/cbor", "text/")
+MAX_CACHED_BODY_SIZE = 1024 * 1024
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        # A window size of 31 makes zlib write the gzip header and trailer
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, level: int) -> None:
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+# Brotli and zstd are only offered when their packages are installed
+ENCODERS: dict[str, Callable[[int], Encoder]] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def negotiate(accept_encoding: str, available: Iterable[str]) -> str | None:
+    """Picks the encoding the client weighs highest, preferring the earliest available one on ties."""
+    weights = parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(name, wildcard), -index, name) for index, name in enumerate(available)]
+    weight, _, name = max(candidates, default=(0.0, 0, None))
+    return name if weight > 0 else None
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, parameters = item.partition(";")
+        if name := name.strip().lower():
+            weights[name] = parse_quality(parameters)
+    return weights
+
+
+def parse_quality(parameters: str) -> float:
+    key, _, value = parameters.partition("=")
+    if key.strip() != "q":
+        return 1.0
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def is_compressible(headers: Headers) -> bool:
+    return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionCache:
+    """Keeps recently compressed bodies, keyed by a digest of the uncompressed body, so hot payloads
+    like an unchanged workout list are compressed once rather than on every request."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.bodies: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def compress(self, encoding: str, level: int, body: bytes) -> bytes:
+        if not self.max_size or len(body) > MAX_CACHED_BODY_SIZE:
+            return compress(encoding, level, body)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        if (compressed := self.bodies.get(key)) is not None:
+            self.bodies.move_to_end(key)
+            return compressed
+        compressed = self.bodies[key] = compress(encoding, level, body)
+        if len(self.bodies) > self.max_size:
+            self.bodies.popitem(last=False)
+        return compressed
+
+
+def compress(encoding: str, level: int, body: bytes) -> bytes:
+    encoder = ENCODERS[encoding](level)
+    return encoder.compress(body) + encoder.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int, levels: dict[str, int], cache_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        # Encodings are offered in the order they're configured, skipping any whose package isn't installed
+        self.levels = {encoding: level for encoding, level in levels.items() if encoding in ENCODERS}
+        self.cache = CompressionCache(cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.levels)
+            if encoding is not None:
+                await self.app(scope, receive, CompressedResponse(self, encoding, send))
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressedResponse:
+    """Wraps the send channel of one response.
+
+    The start message is held back until the first body message arrives, because only then is it known
+    whether the body is complete (compressed whole and cached) or streamed (compressed chunk by chunk).
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = middleware.levels[encoding]
+        self.send = send
+        self.start: Message | None = None
+        self.encoder: Encoder | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+        elif self.start is not None:
+            start, self.start = self.start, None
+            await self.send_first(start, message)
+        elif self.encoder is not None:
+            await self.send_chunk(self.encoder, message)
+        else:
+            await self.send(message)
+
+    async def send_first(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        body: bytes = message.get("body", b"")
+        if not message.get("more_body", False):
+            if len(body) >= self.middleware.minimum_size and is_compressible(headers):
+                body = self.middleware.cache.compress(self.encoding, self.level, body)
+                self.set_headers(headers, content_length=len(body))
+            await self.send(start)
+            await self.send({**message, "body": body})
+        elif is_compressible(headers):
+            self.encoder = ENCODERS[self.encoding](self.level)
+            self.set_headers(headers, content_length=None)
+            await self.send(start)
+            await self.send_chunk(self.encoder, message)
+        else:
+            await self.send(start)
+            await self.send(message)
+
+    async def send_chunk(self, encoder: Encoder, message: Message) -> None:
+        # Every chunk is flushed so streamed responses keep arriving as they're produced
+        more_body = message.get("more_body", False)
+        chunk = encoder.compress(message.get("body", b""))
+        chunk += encoder.flush() if more_body else encoder.finish()
+        await self.send({**message, "body": chunk})
+
+    def set_headers(self, headers: MutableHeaders, content_length: int | None) -> None:
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("accept-encoding")
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(content_length)
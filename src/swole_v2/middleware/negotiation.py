@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..errors.messages import INVALID_REQUEST_BODY, REQUEST_BODY_TOO_LARGE
+from ..schemas import ErrorResponse
+from .compression import negotiate
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from starlette.background import BackgroundTask
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+JSON = "application/json"
+
+
+class Codec(NamedTuple):
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+# Binary encodings are only offered when their packages are installed
+CODECS: dict[str, Codec] = {}
+if msgpack is not None:
+    CODECS["application/msgpack"] = Codec(msgpack.packb, msgpack.unpackb)
+if cbor2 is not None:
+    CODECS["application/cbor"] = Codec(cbor2.dumps, cbor2.loads)
+
+# The encoding negotiated for the response to the request being handled
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON)
+
+
+class NegotiatedResponse(JSONResponse):
+    """Renders content in the encoding negotiated from the request's Accept header, JSON by default.
+
+    Used as the app's default response class and by the error handlers, so every response the
+    routes and handlers build is encoded the same way.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(content, status_code, headers, media_type, background)
+        self.headers.add_vary_header("accept")
+
+    def render(self, content: Any) -> bytes:
+        media_type = response_media_type.get()
+        if (codec := CODECS.get(media_type)) is None:
+            return super().render(content)
+        self.media_type = media_type
+        return codec.encode(content)
+
+
+class NegotiationMiddleware:
+    """Picks the response encoding from the Accept header and decodes binary request bodies.
+
+    Binary bodies are turned into JSON before they reach the routes, so request validation and
+    the batch size checks work the same whichever encoding the client sent. They have to be read
+    in full to be decoded, so bodies over max_body_size bytes are rejected instead.
+    """
+
+    def __init__(self, app: ASGIApp, media_types: Iterable[str], max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+        # Media types are offered in the order they're configured, skipping any whose package isn't installed
+        self.media_types = [media_type for media_type in media_types if media_type == JSON or media_type in CODECS]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        token = response_media_type.set(negotiate(headers.get("accept", ""), self.media_types) or JSON)
+        try:
+            codec = CODECS.get(headers.get("content-type", "").partition(";")[0].strip().lower())
+            if codec is None:
+                await self.app(scope, receive, send)
+            else:
+                await self.decode_request(codec, scope, receive, send)
+        finally:
+            response_media_type.reset(token)
+
+    async def decode_request(self, codec: Codec, scope: Scope, receive: Receive, send: Send) -> None:
+        if (encoded := await read_body(receive, self.max_body_size)) is None:
+            message = REQUEST_BODY_TOO_LARGE.format(self.max_body_size)
+            await NegotiatedResponse(ErrorResponse(message=message).model_dump(), status_code=413)(scope, receive, send)
+            return
+        try:
+            body = json.dumps(codec.decode(encoded), default=str).encode()
+        except (ValueError, TypeError):  # Both packages raise ValueError subclasses for malformed input
+            response = NegotiatedResponse(ErrorResponse(message=INVALID_REQUEST_BODY).model_dump(), status_code=400)
+            await response(scope, receive, send)
+            return
+        headers = MutableHeaders(scope={**scope, "headers": list(scope["headers"])})
+        headers["content-type"] = JSON
+        headers["content-length"] = str(len(body))
+        await self.app({**scope, "headers": headers.raw}, replay(body, receive), send)
+
+
+async def read_body(receive: Receive, limit: int) -> bytes | None:
+    # Stops reading as soon as the body grows past the limit, returning None instead of buffering the rest
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        size += len(chunks[-1])
+        if size > limit:
+            return None
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def replay(body: bytes, receive: Receive) -> Receive:
+    # Hands out the decoded body once, then waits on the client like the original channel would
+    sent = False
+
+    async def receive_body() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return receive_body
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover
+    pyinstrument = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Carries the secret on requests and the name of the saved profile on responses
+HEADER = "x-profile"
+
+
+class Profile(Protocol):
+    suffix: str
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+    def save(self, path: Path) -> None: ...
+
+
+class SamplingProfile:
+    """Samples only the request's own task, and saves the call tree as an interactive flame graph."""
+
+    suffix = ".html"
+
+    def __init__(self, interval: float) -> None:
+        self.profiler = pyinstrument.Profiler(interval=interval, async_mode="enabled")
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self) -> None:
+        self.profiler.stop()
+
+    def save(self, path: Path) -> None:
+        path.write_text(self.profiler.output_html())
+
+
+class DeterministicProfile:
+    """Records every call of the worker while the request runs, as stats for pstats or snakeviz.
+
+    Slower than sampling and it picks up other requests served meanwhile, so it's only the fallback.
+    """
+
+    suffix = ".prof"
+
+    def __init__(self, _: float) -> None:
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+
+    def save(self, path: Path) -> None:
+        self.profiler.dump_stats(path)
+
+
+# The sampling profiler is only used when its package is installed
+PROFILE: Callable[[float], Profile] = SamplingProfile if pyinstrument is not None else DeterministicProfile
+
+
+class ProfilerMiddleware:
+    """Profiles single requests on demand, those sending the profiler secret in their x-profile header.
+
+    Only added to the app when a secret is configured, so it costs nothing otherwise. It runs before
+    every other middleware, so the profile covers them as well as validation, queries and serialization.
+    A worker profiles one request at a time, others asking meanwhile are served without a profile.
+    """
+
+    def __init__(self, app: ASGIApp, secret: str, directory: str, interval: float) -> None:
+        self.app = app
+        self.secret = secret.encode()
+        self.directory = Path(directory)
+        self.interval = interval
+        self.lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.lock.locked() or not self.is_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        async with self.lock:
+            await self.profile(scope, receive, send)
+
+    def is_requested(self, scope: Scope) -> bool:
+        given = Headers(scope=scope).get(HEADER)
+        return given is not None and hmac.compare_digest(given.encode(), self.secret)
+
+    async def profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile = PROFILE(self.interval)
+        # Named up front so the response can point the operator to it
+        route = re.sub(r"\W+", "-", scope["path"]).strip("-")
+        path = self.directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{route}-{secrets.token_hex(4)}{profile.suffix}"
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(raw=message["headers"])[HEADER] = path.name
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profile.stop()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profile.save(path)
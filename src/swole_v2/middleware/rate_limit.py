@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+from starlette.datastructures import Headers
+
+from ..dependencies.tokens import decode_token
+from ..errors.messages import INVALID_RATE_LIMIT, TOO_MANY_REQUESTS
+from ..schemas import ErrorResponse
+from .negotiation import NegotiatedResponse
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # pragma: no cover
+    redis = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+    from ..settings import Settings
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+MAX_MEMORY_BUCKETS = 100_000
+# Refills and takes a token atomically, so every worker sharing the server sees the same bucket
+TAKE_SCRIPT = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    rate: float  # Tokens added back per second
+
+    @classmethod
+    def parse(cls, value: str) -> RateLimit:
+        """Parses budgets like "10/minute", which allow bursts of 10 requests refilled evenly over a minute."""
+        count, _, period = value.partition("/")
+        if not count.strip().isdigit() or int(count) < 1 or period.strip() not in PERIODS:
+            raise ValueError(INVALID_RATE_LIMIT.format(value))
+        return cls(capacity=int(count), rate=int(count) / PERIODS[period.strip()])
+
+    def refill(self, tokens: float, elapsed: float) -> float:
+        return min(self.capacity, tokens + max(elapsed, 0.0) * self.rate)
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Takes a token from the bucket, returning 0 if one was available, otherwise seconds until one is."""
+        ...
+
+
+class MemoryBackend:
+    """Keeps buckets in the worker's memory, so each gunicorn worker enforces its own budget."""
+
+    def __init__(self, max_size: int = MAX_MEMORY_BUCKETS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_size = max_size
+        self.clock = clock
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = self.clock()
+        tokens, updated = self.buckets.pop(key, (limit.capacity, now))
+        tokens = limit.refill(tokens, now - updated)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.rate
+        self.buckets[key] = (tokens, now)
+        # The least recently used bucket is dropped first, and a dropped bucket simply starts full again
+        if len(self.buckets) > self.max_size:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBackend:
+    """Keeps buckets in Redis, so every worker and instance shares the same budget.
+
+    While Redis can't be reached each worker falls back to its own buckets, rather than failing every request.
+    """
+
+    def __init__(self, url: str, fallback: RateLimitBackend | None = None) -> None:
+        if redis is None:
+            raise RuntimeError("The redis package must be installed to use RATE_LIMIT_REDIS_URL")
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(TAKE_SCRIPT)
+        self.fallback = fallback or MemoryBackend()
+        self.failing = False
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        try:
+            result = await self.script(keys=[f"rate-limit:{key}"], args=[limit.capacity, limit.rate, time.time()])
+        except (redis.RedisError, OSError):
+            # Logged once per outage, not once per request
+            if not self.failing:
+                logger.warning("Rate limiting falls back to memory, Redis could not be reached", exc_info=True)
+            self.failing = True
+            return await self.fallback.take(key, limit)
+        self.failing = False
+        return float(result)
+
+
+class RateLimitMiddleware:
+    """Rejects requests over their route's budget before routing, so no database or hashing work is done for them.
+
+    Authenticated requests are counted per user and everything else per client address.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings) -> None:
+        self.app = app
+        self.settings = settings
+        self.limits = {path: RateLimit.parse(limit) for path, limit in settings.RATE_LIMITS.items()}
+        self.default = RateLimit.parse(settings.RATE_LIMIT_DEFAULT) if settings.RATE_LIMIT_DEFAULT else None
+        self.exempt = frozenset(settings.RATE_LIMIT_EXEMPT)
+        self.backend: RateLimitBackend = (
+            RedisBackend(settings.RATE_LIMIT_REDIS_URL) if settings.RATE_LIMIT_REDIS_URL else MemoryBackend()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limited = scope["type"] == "http" and scope["path"] not in self.exempt
+        limit = self.limits.get(scope["path"], self.default) if limited else None
+        if limit is not None and (retry_after := await self.backend.take(self.key(scope), limit)):
+            # Encoded like any other error, since NegotiationMiddleware runs before this one
+            response = NegotiatedResponse(
+                status_code=429,
+                content=ErrorResponse(message=TOO_MANY_REQUESTS).model_dump(),
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def key(self, scope: Scope) -> str:
+        if username := self.username(Headers(scope=scope).get("authorization", "")):
+            return f"{scope['path']}:user:{username}"
+        client = scope.get("client")
+        return f"{scope['path']}:ip:{client[0] if client else 'unknown'}"
+
+    def username(self, authorization: str) -> str | None:
+        # Only the token's signature is checked here, whether the user exists is left to the route
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        payload = decode_token(token, self.settings)
+        return payload.get("username") if payload else None
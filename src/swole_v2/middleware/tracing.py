@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from ..tracing.spans import Span, current_span, format_traceparent, parse_traceparent
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from ..tracing import Exporter
+
+
+class TracingMiddleware:
+    """Records a trace of every sampled request and hands it to the exporter once the response is sent.
+
+    Traces continue the one in an incoming traceparent header, which also decides whether they're
+    sampled, so a trace started by a client or a proxy is either kept whole or dropped whole.
+    Responses carry the trace id as their request id, traced or not.
+    """
+
+    def __init__(self, app: ASGIApp, exporter: Exporter, sample_rate: float) -> None:
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        root, sampled = self.start(scope)
+        token = current_span.set(root if sampled else None)
+        try:
+            await self.app(scope, receive, with_trace_headers(root, sampled, send))
+        except BaseException as error:
+            root.error = type(error).__name__
+            raise
+        finally:
+            root.finish()
+            current_span.reset(token)
+            if sampled:
+                self.exporter.export(root.spans)
+
+    def start(self, scope: Scope) -> tuple[Span, bool]:
+        trace_id, parent_id, sampled = parse_traceparent(Headers(scope=scope).get("traceparent", ""))
+        if sampled is None:
+            sampled = random.random() < self.sample_rate
+        return Span("request", trace_id, parent_id, {"method": scope["method"], "path": scope["path"]}), sampled
+
+
+def with_trace_headers(root: Span, sampled: bool, send: Send) -> Send:
+    async def send_with_trace(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            root.attributes["status_code"] = message["status"]
+            headers = MutableHeaders(raw=message["headers"])
+            headers["x-request-id"] = root.trace_id
+            headers["traceparent"] = format_traceparent(root.trace_id, root.span_id, sampled)
+        await send(message)
+
+    return send_with_trace
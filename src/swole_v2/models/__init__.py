@@ -1,7 +1,14 @@
 from .exercise import Exercise, ExerciseProgressReport, ExerciseProgressReportData, ExerciseRead
+from .health import DatabaseHealth, HealthReport, PoolHealth
+from .history import ImportSummary
+from .job import JobRead, JobStatus
+from .layout import Layout
+from .purge import PurgeSummary
+from .search import SearchHit, SearchKind
 from .set import Set, SetRead
 from .token import Token
 from .user import User, UserRead
+from .volume import RollupPeriod, VolumeRollupRead
 from .workout import Workout, WorkoutRead
 
 Set.model_rebuild()
@@ -19,4 +26,16 @@ __all__ = [
     "ExerciseProgressReportData",
     "Set",
     "SetRead",
+    "ImportSummary",
+    "DatabaseHealth",
+    "PoolHealth",
+    "HealthReport",
+    "JobRead",
+    "JobStatus",
+    "RollupPeriod",
+    "VolumeRollupRead",
+    "SearchHit",
+    "SearchKind",
+    "PurgeSummary",
+    "Layout",
 ]
@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
 
+AVERAGE_DECIMALS = 2
+
 
 class Exercise(BaseModel):
     name: str
@@ -26,7 +28,7 @@ class ExerciseProgressReportData(BaseModel):
 
     @field_validator("avg_rep_count", "avg_weight")
     def round_averages(cls, value: float) -> float:
-        return round(value, 2)
+        return round(value, AVERAGE_DECIMALS)
 
 
 class ExerciseProgressReport(BaseModel):
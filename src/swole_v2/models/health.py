@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class DatabaseHealth(BaseModel):
+    ok: bool
+    latency_ms: float | None = None
+    error: str | None = None
+
+
+class PoolHealth(BaseModel):
+    max_concurrency: int  # Connections the client may open, as suggested by the server on first connect
+    free: int
+    in_flight: int  # Operations holding a limiter slot
+    queued: int  # Operations waiting for a limiter slot
+    saturation: float  # Share of limiter slots in use, 1.0 once every slot is taken
+
+
+class HealthReport(BaseModel):
+    ready: bool
+    database: DatabaseHealth
+    pool: PoolHealth
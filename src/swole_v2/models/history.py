@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ImportSummary(BaseModel):
+    rows: int = 0
+    batches: int = 0
+    sets: int = 0
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class JobStatus(str, Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+
+class JobRead(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatus
+    attempts: int
+    result: Any | None = None
+    error: str | None = None
+    created_at: datetime.datetime
+    finished_at: datetime.datetime | None = None
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class Layout(str, Enum):
+    ROWS = "rows"  # One object per result
+    COLUMNS = "columns"  # One array per field, for long numeric series
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class PurgeSummary(BaseModel):
+    sets: int = 0
+    workouts: int = 0
+    exercises: int = 0
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchKind(str, Enum):
+    WORKOUT = "workout"
+    EXERCISE = "exercise"
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: UUID
+    name: str
+    notes: str | None = None  # Only exercises have notes
+    date: datetime.date | None = None  # Only workouts have a date
+    rank: int  # Higher ranks match more of the search terms, in names rather than notes
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class RollupPeriod(str, Enum):
+    WEEK = "Week"
+    MONTH = "Month"
+
+
+class VolumeRollupRead(BaseModel):
+    exercise_id: UUID
+    exercise_name: str
+    period_start: datetime.date
+    volume: int  # Weight times reps, summed over every set
+    set_count: int
+    rep_count: int
@@ -5,8 +5,9 @@ from fastapi import APIRouter, Depends
 from ..database.repositories import UserRepository
 from ..models import Token
 from ..schemas import UserLogin  # noqa
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TracedRoute)
 
 
 @router.post("/token", response_model=Token)
@@ -1,37 +1,62 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from ..database.repositories import ExerciseRepository
+from ..database.repositories import ExerciseRepository, VolumeRepository
 from ..dependencies.auth import get_current_active_user
-from ..schemas import ExerciseCreate, ExerciseDelete, ExerciseDetail, ExerciseProgress, ExerciseUpdate, SuccessResponse
+from ..dependencies.batches import check_batch_size
+from ..dependencies.fields import sparse_fields
+from ..jobs.purge import schedule_purge
+from ..models import ExerciseRead, Layout
+from ..schemas import (
+    ExerciseCreate,
+    ExerciseDelete,
+    ExerciseDetail,
+    ExerciseProgress,
+    ExerciseSearch,
+    ExerciseUpdate,
+    SuccessResponse,
+    VolumeSummary,
+)
+from ..tracing import TracedRoute
 
 if TYPE_CHECKING:
     from ..models import User
 
-router = APIRouter(prefix="/exercises", tags=["exercises"])
+router = APIRouter(prefix="/exercises", tags=["exercises"], route_class=TracedRoute)
 
 
 @router.post("/all", response_model=SuccessResponse)
 async def get_all_by_user(
     current_user: User = Depends(get_current_active_user),
     respository: ExerciseRepository = Depends(ExerciseRepository.as_dependency),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(ExerciseRead)),
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.get_all(current_user.id))
+    return SuccessResponse(results=await respository.get_all(current_user.id, fields))
 
 
-@router.post("/detail", response_model=SuccessResponse)
+@router.post("/search", response_model=SuccessResponse)
+async def search(
+    data: ExerciseSearch,
+    current_user: User = Depends(get_current_active_user),
+    respository: ExerciseRepository = Depends(ExerciseRepository.as_dependency),
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.search(current_user.id, data))
+
+
+@router.post("/detail", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def detail(
     data: list[ExerciseDetail],
     current_user: User = Depends(get_current_active_user),
     respository: ExerciseRepository = Depends(ExerciseRepository.as_dependency),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(ExerciseRead)),
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.detail(current_user.id, data))
+    return SuccessResponse(results=await respository.detail(current_user.id, data, fields))
 
 
-@router.post("/create", response_model=SuccessResponse)
+@router.post("/create", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def create(
     data: list[ExerciseCreate],
     current_user: User = Depends(get_current_active_user),
@@ -40,7 +65,7 @@ async def create(
     return SuccessResponse(results=await respository.create(current_user.id, data))
 
 
-@router.post("/update", response_model=SuccessResponse)
+@router.post("/update", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def update(
     data: list[ExerciseUpdate],
     current_user: User = Depends(get_current_active_user),
@@ -49,20 +74,32 @@ async def update(
     return SuccessResponse(results=await respository.update(current_user.id, data))
 
 
-@router.post("/delete", response_model=SuccessResponse)
+@router.post("/delete", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def delete(
     data: list[ExerciseDelete],
     current_user: User = Depends(get_current_active_user),
     respository: ExerciseRepository = Depends(ExerciseRepository.as_dependency),
 ) -> SuccessResponse:
     await respository.delete(current_user.id, data)
+    # The rows are only tombstoned, their sets are removed in the background
+    await schedule_purge(respository, current_user.id)
     return SuccessResponse()
 
 
-@router.post("/progress", response_model=SuccessResponse)
+@router.post("/progress", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def progress(
     data: list[ExerciseProgress],
     current_user: User = Depends(get_current_active_user),
     respository: ExerciseRepository = Depends(ExerciseRepository.as_dependency),
+    layout: Annotated[Layout, Query()] = Layout.ROWS,
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.progress(current_user.id, data, layout))
+
+
+@router.post("/volume", response_model=SuccessResponse)
+async def volume(
+    data: VolumeSummary,
+    current_user: User = Depends(get_current_active_user),
+    respository: VolumeRepository = Depends(VolumeRepository.as_dependency),
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.progress(current_user.id, data))
+    return SuccessResponse(results=await respository.summary(current_user.id, data))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Response, status
+
+from ..database.database import get_async_client
+from ..database.health import DatabaseProbe, get_probe
+from ..database.limiter import ConcurrencyLimiter, get_limiter
+from ..dependencies.settings import get_settings
+from ..models import DatabaseHealth, HealthReport, PoolHealth
+from ..schemas import SuccessResponse
+from ..tracing import TracedRoute
+
+if TYPE_CHECKING:
+    from edgedb import AsyncIOClient
+
+    from ..settings import Settings
+
+# Kept outside /api/v2 and free of authentication, so probes never touch the user tables
+router = APIRouter(prefix="/health", tags=["health"], route_class=TracedRoute)
+
+
+@router.get("/live", response_model=SuccessResponse)
+async def live(response: Response) -> SuccessResponse:
+    # Answering at all shows the worker's event loop is running, the database is left to the readiness probe
+    response.headers["Cache-Control"] = "no-store"
+    return SuccessResponse()
+
+
+@router.get(
+    "/ready", response_model=HealthReport, responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthReport}}
+)
+async def ready(
+    response: Response,
+    client: AsyncIOClient = Depends(get_async_client),
+    probe: DatabaseProbe = Depends(get_probe),
+    limiter: ConcurrencyLimiter = Depends(get_limiter),
+    settings: Settings = Depends(get_settings),
+) -> HealthReport:
+    # The ping skips the limiter, so a saturated worker is reported as such instead of timing the probe out
+    ping = await probe.check(client)
+    stats = limiter.snapshot()
+    report = HealthReport(
+        ready=ping.ok and stats["queued"] < settings.HEALTH_MAX_QUEUED,
+        database=DatabaseHealth(
+            ok=ping.ok, latency_ms=None if ping.latency is None else ping.latency * 1000, error=ping.error
+        ),
+        pool=PoolHealth(
+            max_concurrency=client.max_concurrency,
+            free=client.free_size,
+            in_flight=stats["in_flight"],
+            queued=stats["queued"],
+            saturation=stats["in_flight"] / limiter.max_in_flight,
+        ),
+    )
+    response.headers["Cache-Control"] = "no-store"
+    if not report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
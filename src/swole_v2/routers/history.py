@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+
+from ..database.repositories import HistoryRepository
+from ..dependencies.auth import get_current_active_user
+from ..errors.messages import HISTORY_FILE_TOO_LARGE
+from ..history.exporter import ExportFormat, HistoryExporter
+from ..history.importer import HistoryImporter, ResumableImport
+from ..history.parsers import HistoryFormat, read_rows
+from ..jobs.runner import get_job_runner
+from ..schemas import SuccessResponse
+from ..tracing import TracedRoute
+
+if TYPE_CHECKING:
+    from ..models import User
+
+router = APIRouter(prefix="/history", tags=["history"], route_class=TracedRoute)
+
+
+@router.post("/import", response_model=SuccessResponse)
+async def import_history(
+    file: UploadFile,
+    current_user: User = Depends(get_current_active_user),
+    respository: HistoryRepository = Depends(HistoryRepository.as_dependency),
+    resume_from: Annotated[int, Query(ge=0)] = 0,
+    background: bool = False,
+) -> SuccessResponse:
+    history_format = HistoryFormat.from_filename(file.filename)
+    importer = HistoryImporter(respository, respository.settings.IMPORT_BATCH_SIZE)
+    if background:
+        # Returns the job straight away, its status and final summary are polled from /jobs/detail
+        content = await read_upload(file, respository.settings.IMPORT_MAX_UPLOAD_SIZE)
+        work = ResumableImport(importer, current_user.id, content, history_format, resume_from)
+        return SuccessResponse(results=[await get_job_runner().submit(current_user.id, "history_import", work)])
+    # The spooled upload is read lazily, a batch at a time in a worker thread, while the import runs
+    rows = read_rows(file.file, history_format)
+    return SuccessResponse(results=[await importer.run(current_user.id, rows, resume_from)])
+
+
+async def read_upload(file: UploadFile, limit: int) -> bytes:
+    # Background jobs keep the upload in memory, so reading one byte past the limit catches oversized files
+    content = await file.read(limit + 1)
+    if len(content) > limit:
+        raise HTTPException(status_code=413, detail=HISTORY_FILE_TOO_LARGE.format(limit))
+    return content
+
+
+@router.post("/export", response_class=StreamingResponse)
+async def export_history(
+    current_user: User = Depends(get_current_active_user),
+    respository: HistoryRepository = Depends(HistoryRepository.as_dependency),
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    exporter = HistoryExporter(respository, respository.settings.EXPORT_CHUNK_SIZE)
+    return StreamingResponse(
+        exporter.stream(current_user.id, export_format),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="history.{export_format.value}"'},
+    )
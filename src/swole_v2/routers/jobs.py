@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends
+
+from ..database.repositories import JobRepository
+from ..dependencies.auth import get_current_active_user
+from ..dependencies.batches import check_batch_size
+from ..schemas import JobDetail, SuccessResponse
+from ..tracing import TracedRoute
+
+if TYPE_CHECKING:
+    from ..models import User
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TracedRoute)
+
+
+@router.post("/detail", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
+async def detail(
+    data: list[JobDetail],
+    current_user: User = Depends(get_current_active_user),
+    respository: JobRepository = Depends(JobRepository.as_dependency),
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.detail(current_user.id, data))
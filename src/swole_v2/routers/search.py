@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends
+
+from ..database.repositories import SearchRepository
+from ..dependencies.auth import get_current_active_user
+from ..schemas import Search, SuccessResponse
+from ..tracing import TracedRoute
+
+if TYPE_CHECKING:
+    from ..models import User
+
+router = APIRouter(prefix="/search", tags=["search"], route_class=TracedRoute)
+
+
+@router.post("/all", response_model=SuccessResponse)
+async def search_all(
+    data: Search,
+    current_user: User = Depends(get_current_active_user),
+    respository: SearchRepository = Depends(SearchRepository.as_dependency),
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.search(current_user.id, data))
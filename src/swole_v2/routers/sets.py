@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from ..database.repositories import SetRepository
 from ..dependencies.auth import get_current_active_user
+from ..dependencies.batches import check_batch_size
+from ..dependencies.fields import sparse_fields
+from ..models import Layout, SetRead
 from ..schemas import SetAdd, SetDelete, SetGetAll, SetUpdate, SuccessResponse
+from ..tracing import TracedRoute
 
 if TYPE_CHECKING:
     from ..models import User
 
-router = APIRouter(prefix="/sets", tags=["sets"])
+router = APIRouter(prefix="/sets", tags=["sets"], route_class=TracedRoute)
 
 
 @router.post("/all", response_model=SuccessResponse)
@@ -19,11 +23,13 @@ async def get_all_by_workout_and_exercise(
     data: SetGetAll,
     current_user: User = Depends(get_current_active_user),
     respository: SetRepository = Depends(SetRepository.as_dependency),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(SetRead)),
+    layout: Annotated[Layout, Query()] = Layout.ROWS,
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.get_all(current_user.id, data))
+    return SuccessResponse(results=await respository.get_all(current_user.id, data, fields, layout))
 
 
-@router.post("/add", response_model=SuccessResponse)
+@router.post("/add", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def add_to_workout_and_exercise(
     data: list[SetAdd],
     current_user: User = Depends(get_current_active_user),
@@ -4,13 +4,15 @@ from fastapi import APIRouter, Depends
 
 from ..database.repositories import UserRepository
 from ..dependencies.auth import get_current_active_user
+from ..dependencies.batches import check_batch_size
 from ..models import User, UserRead
 from ..schemas import SuccessResponse, UserCreate
+from ..tracing import TracedRoute
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=TracedRoute)
 
 
-@router.post("/create", response_model=SuccessResponse)
+@router.post("/create", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def create(
     data: list[UserCreate], repository: UserRepository = Depends(UserRepository.as_dependency)
 ) -> SuccessResponse:
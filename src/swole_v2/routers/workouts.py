@@ -6,41 +6,59 @@ from fastapi import APIRouter, Depends, Query
 
 from ..database.repositories import WorkoutRepository
 from ..dependencies.auth import get_current_active_user
+from ..dependencies.batches import check_batch_size
+from ..dependencies.fields import sparse_fields
+from ..jobs.purge import schedule_purge
+from ..models import WorkoutRead
 from ..schemas import (
     SuccessResponse,
     WorkoutAddExercise,
+    WorkoutCalendar,
     WorkoutCopy,
     WorkoutCreate,
     WorkoutDelete,
     WorkoutDetail,
+    WorkoutProgram,
     WorkoutUpdate,
 )
+from ..tracing import TracedRoute
 
 if TYPE_CHECKING:
     from ..models import User
 
-router = APIRouter(prefix="/workouts", tags=["workouts"])
+router = APIRouter(prefix="/workouts", tags=["workouts"], route_class=TracedRoute)
 
 
 @router.post("/all", response_model=SuccessResponse)
 async def get_all(
     current_user: User = Depends(get_current_active_user),
     respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
+    fields: tuple[str, ...] | None = Depends(sparse_fields(WorkoutRead)),
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.get_all(current_user.id))
+    return SuccessResponse(results=await respository.get_all(current_user.id, fields))
 
 
-@router.post("/detail", response_model=SuccessResponse)
+@router.post("/calendar", response_model=SuccessResponse)
+async def calendar(
+    data: WorkoutCalendar,
+    current_user: User = Depends(get_current_active_user),
+    respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.calendar(current_user.id, data))
+
+
+@router.post("/detail", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def detail(
     data: list[WorkoutDetail],
     current_user: User = Depends(get_current_active_user),
     respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
     with_exercises: Annotated[bool, Query()] = False,
+    fields: tuple[str, ...] | None = Depends(sparse_fields(WorkoutRead)),
 ) -> SuccessResponse:
-    return SuccessResponse(results=await respository.detail(current_user.id, data, with_exercises))
+    return SuccessResponse(results=await respository.detail(current_user.id, data, with_exercises, fields))
 
 
-@router.post("/create", response_model=SuccessResponse)
+@router.post("/create", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def create(
     data: list[WorkoutCreate],
     current_user: User = Depends(get_current_active_user),
@@ -49,17 +67,19 @@ async def create(
     return SuccessResponse(results=await respository.create(current_user.id, data))
 
 
-@router.post("/delete", response_model=SuccessResponse)
+@router.post("/delete", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def delete(
     data: list[WorkoutDelete],
     current_user: User = Depends(get_current_active_user),
     respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
 ) -> SuccessResponse:
     await respository.delete(current_user.id, data)
+    # The rows are only tombstoned, their sets are removed in the background
+    await schedule_purge(respository, current_user.id)
     return SuccessResponse()
 
 
-@router.post("/update", response_model=SuccessResponse)
+@router.post("/update", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def update(
     data: list[WorkoutUpdate],
     current_user: User = Depends(get_current_active_user),
@@ -68,7 +88,7 @@ async def update(
     return SuccessResponse(results=await respository.update(current_user.id, data))
 
 
-@router.post("/add-exercises", response_model=SuccessResponse)
+@router.post("/add-exercises", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def add_exercises(
     data: list[WorkoutAddExercise],
     current_user: User = Depends(get_current_active_user),
@@ -77,10 +97,19 @@ async def add_exercises(
     return SuccessResponse(results=await respository.add_exercises(current_user.id, data))
 
 
-@router.post("/copy", response_model=SuccessResponse)
+@router.post("/copy", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
 async def copy(
     data: list[WorkoutCopy],
     current_user: User = Depends(get_current_active_user),
     respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
 ) -> SuccessResponse:
     return SuccessResponse(results=await respository.copy(current_user.id, data))
+
+
+@router.post("/program", response_model=SuccessResponse, dependencies=[Depends(check_batch_size)])
+async def program(
+    data: list[WorkoutProgram],
+    current_user: User = Depends(get_current_active_user),
+    respository: WorkoutRepository = Depends(WorkoutRepository.as_dependency),
+) -> SuccessResponse:
+    return SuccessResponse(results=await respository.program(current_user.id, data))
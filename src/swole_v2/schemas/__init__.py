@@ -1,13 +1,27 @@
-from .exercises import ExerciseCreate, ExerciseDelete, ExerciseDetail, ExerciseProgress, ExerciseUpdate
+from .exercises import (
+    ExerciseCreate,
+    ExerciseDelete,
+    ExerciseDetail,
+    ExerciseProgress,
+    ExerciseSearch,
+    ExerciseUpdate,
+)
+from .history import HistoryImportRow
+from .jobs import JobDetail
 from .responses import ErrorResponse, SuccessResponse
+from .search import Search
 from .sets import SetAdd, SetDelete, SetGetAll, SetUpdate
 from .users import UserLogin, UserCreate
+from .volume import VolumeSummary
 from .workouts import (
     WorkoutAddExercise,
+    WorkoutCalendar,
     WorkoutCopy,
     WorkoutCreate,
     WorkoutDelete,
     WorkoutDetail,
+    WorkoutProgram,
+    WorkoutRecurrence,
     WorkoutUpdate,
 )
 
@@ -17,12 +31,16 @@ __all__ = [
     "ExerciseUpdate",
     "ExerciseDelete",
     "ExerciseProgress",
+    "ExerciseSearch",
     "WorkoutCreate",
     "WorkoutUpdate",
     "WorkoutCopy",
     "WorkoutDetail",
     "WorkoutDelete",
     "WorkoutAddExercise",
+    "WorkoutProgram",
+    "WorkoutRecurrence",
+    "WorkoutCalendar",
     "SuccessResponse",
     "ErrorResponse",
     "SetGetAll",
@@ -31,4 +49,8 @@ __all__ = [
     "SetUpdate",
     "UserLogin",
     "UserCreate",
+    "HistoryImportRow",
+    "JobDetail",
+    "VolumeSummary",
+    "Search",
 ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel
 
-from .validators import ID, NonEmptyString
+from .validators import ID, NonEmptyString, SearchLimit
 
 
 class ExerciseDetail(BaseModel):
@@ -26,3 +26,8 @@ class ExerciseDelete(BaseModel):
 
 class ExerciseProgress(BaseModel):
     exercise_id: ID
+
+
+class ExerciseSearch(BaseModel):
+    query: NonEmptyString
+    limit: SearchLimit = 10
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from .validators import Date, NonEmptyString, RepCount, Weight
+
+
+class HistoryImportRow(BaseModel):
+    workout: NonEmptyString
+    date: Date
+    exercise: NonEmptyString
+    weight: Weight
+    rep_count: RepCount
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from .validators import ID
+
+
+class JobDetail(BaseModel):
+    job_id: ID
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from .validators import MAX_SEARCH_OFFSET, NonEmptyString, SearchLimit
+
+
+class Search(BaseModel):
+    query: NonEmptyString
+    limit: SearchLimit = 10
+    offset: int = Field(default=0, ge=0, le=MAX_SEARCH_OFFSET)
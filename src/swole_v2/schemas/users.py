@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, EmailStr, field_validator
 
-from ..dependencies.passwords import pwd_context
+from ..dependencies.passwords import get_password_context
 from .validators import NonEmptyString
 
 
@@ -18,4 +18,4 @@ class UserCreate(BaseModel):
 
     @field_validator("password")
     def hash_password(cls, value: str | None) -> str | None:
-        return value if value is None else pwd_context.hash(value)
+        return value if value is None else get_password_context().hash(value)
@@ -25,11 +25,20 @@ from ..errors.messages import (
 
 MAX_WEIGHT = 10000
 MAX_REP_COUNT = 500
+MAX_PROGRAM_LENGTH = 366
+MAX_INTERVAL_DAYS = 366
+MAX_SEARCH_RESULTS = 50
+MAX_SEARCH_OFFSET = 1000
+MAX_CALENDAR_DAYS = 371  # The 53 full weeks a year-long heatmap shows
+ISO_DATE_LENGTH = 10
 
+# Finding a single non-whitespace character is enough to know a string isn't blank,
+# and unlike a full match it stops at the first hit and never backtracks.
+NON_WHITESPACE = re.compile(r"\S")
 
-def check_non_empty(value: str, _: ValidatorFunctionWrapHandler, info: ValidationInfo) -> str:
-    pattern = re.compile(r"(.|\s)*\S(.|\s)*")
-    if not pattern.match(value):
+
+def check_non_empty(value: Any, _: ValidatorFunctionWrapHandler, info: ValidationInfo) -> str:
+    if not isinstance(value, str) or not NON_WHITESPACE.search(value):
         raise BusinessError(FIELD_CANNOT_BE_EMPTY.format(info.field_name))
     return value
 
@@ -61,6 +70,13 @@ def check_max(max_value: int) -> Callable[[Any], int]:
 
 
 def check_date_format(value: Any) -> date:
+    # Fast path for zero-padded ISO dates, which is what nearly every client sends.
+    # Anything else falls back to strptime so non-padded dates like 2022-1-5 are still accepted.
+    if isinstance(value, str) and len(value) == ISO_DATE_LENGTH and value[4] == value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
     try:
         return datetime.strptime(value, "%Y-%m-%d").date()
     except (ValueError, TypeError) as exc:
@@ -72,4 +88,7 @@ NonEmptyString = Annotated[str, WrapValidator(check_non_empty)]
 PositiveInt = Annotated[int, WrapValidator(check_positive)]
 Weight = Annotated[PositiveInt, AfterValidator(check_max(MAX_WEIGHT))]
 RepCount = Annotated[PositiveInt, AfterValidator(check_max(MAX_REP_COUNT))]
+ProgramLength = Annotated[PositiveInt, AfterValidator(check_max(MAX_PROGRAM_LENGTH))]
+IntervalDays = Annotated[PositiveInt, AfterValidator(check_max(MAX_INTERVAL_DAYS))]
+SearchLimit = Annotated[PositiveInt, AfterValidator(check_max(MAX_SEARCH_RESULTS))]
 Date = Annotated[date, BeforeValidator(check_date_format)]
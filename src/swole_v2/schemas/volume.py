@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from ..models.volume import RollupPeriod
+from .validators import Date
+
+
+class VolumeSummary(BaseModel):
+    period: RollupPeriod = RollupPeriod.WEEK
+    start_date: Date | None = None
+    end_date: Date | None = None
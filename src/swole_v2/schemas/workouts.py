@@ -1,8 +1,20 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from datetime import date, timedelta
 
-from .validators import ID, Date, NonEmptyString
+from pydantic import BaseModel, Field, model_validator
+
+from ..errors.exceptions import BusinessError
+from ..errors.messages import CALENDAR_TOO_LONG, END_DATE_BEFORE_START_DATE, NO_DATES_GIVEN, RECURRENCE_TOO_LATE
+from .validators import (
+    ID,
+    MAX_CALENDAR_DAYS,
+    MAX_PROGRAM_LENGTH,
+    Date,
+    IntervalDays,
+    NonEmptyString,
+    ProgramLength,
+)
 
 
 class WorkoutDetail(BaseModel):
@@ -32,3 +44,56 @@ class WorkoutAddExercise(BaseModel):
 class WorkoutCopy(BaseModel):
     workout_id: ID
     date: Date
+    include_sets: bool = False
+
+
+class WorkoutRecurrence(BaseModel):
+    start: Date
+    interval_days: IntervalDays
+    count: ProgramLength
+
+    @model_validator(mode="after")
+    def check_last_date(self) -> WorkoutRecurrence:
+        try:
+            self.start + timedelta(days=self.interval_days * (self.count - 1))
+        except OverflowError as exc:
+            raise BusinessError(RECURRENCE_TOO_LATE.format(date.max)) from exc
+        return self
+
+    def dates(self) -> list[date]:
+        return [self.start + timedelta(days=self.interval_days * i) for i in range(self.count)]
+
+
+class WorkoutProgram(BaseModel):
+    workout_id: ID
+    dates: list[Date] = Field(default=[], max_length=MAX_PROGRAM_LENGTH)
+    recurrence: WorkoutRecurrence | None = None
+    include_sets: bool = False
+
+    @model_validator(mode="after")
+    def check_dates_given(self) -> WorkoutProgram:
+        if not self.dates and self.recurrence is None:
+            raise BusinessError(NO_DATES_GIVEN)
+        return self
+
+    def copies(self) -> list[WorkoutCopy]:
+        dates = {*self.dates, *(self.recurrence.dates() if self.recurrence else [])}
+        # Every field has already been validated, so the copies skip validation
+        return [
+            WorkoutCopy.model_construct(workout_id=self.workout_id, date=copy_date, include_sets=self.include_sets)
+            for copy_date in sorted(dates)
+        ]
+
+
+class WorkoutCalendar(BaseModel):
+    start_date: Date
+    end_date: Date
+    with_volume: bool = False
+
+    @model_validator(mode="after")
+    def check_window(self) -> WorkoutCalendar:
+        if self.end_date < self.start_date:
+            raise BusinessError(END_DATE_BEFORE_START_DATE)
+        if (self.end_date - self.start_date).days >= MAX_CALENDAR_DAYS:
+            raise BusinessError(CALENDAR_TOO_LONG.format(MAX_CALENDAR_DAYS))
+        return self
@@ -11,3 +11,68 @@ class Settings(BaseSettings):
     DUMMY_PASSWORD: str = "password"
     HASH_ALGORITHM: str = "HS256"
     TOKEN_EXPIRE: int = 1440  # Default is one day in minutes
+    MAX_BATCH_SIZE: int = 1000  # Max items in a list request body
+    BATCH_SIZE_LIMITS: dict[str, int] = {}  # Per-route overrides, e.g. {"/api/v2/sets/add": 5000}
+    BATCH_CHUNK_SIZE: int | None = None  # Split batches into sub-batches of this size (disabled by default)
+    BATCH_CHUNK_ATOMIC: bool = True  # Run every sub-batch in one transaction, or commit each one separately
+    IMPORT_BATCH_SIZE: int = 1000  # Rows committed per transaction when importing history files
+    IMPORT_MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # Bytes a history file imported in the background may hold
+    EXPORT_CHUNK_SIZE: int = 1000  # Rows read from the database per query when exporting history
+    WARM_UP_QUERIES: bool = True  # Compile the most used statements when the app starts
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Responses smaller than this many bytes are sent uncompressed
+    COMPRESSION_LEVELS: dict[str, int] = {"zstd": 3, "br": 4, "gzip": 6}  # Encodings offered, in order of preference
+    COMPRESSION_CACHE_SIZE: int = 256  # Compressed bodies kept in memory to skip recompressing them (0 disables it)
+    MEDIA_TYPES: list[str] = [  # Response encodings offered, in order of preference, binary ones need their package
+        "application/json",
+        "application/msgpack",
+        "application/cbor",
+    ]
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, str] = {  # Per-route budgets, counted per user or per client address when logged out
+        "/api/v2/auth/token": "10/minute",
+        "/api/v2/users/create": "10/minute",
+        "/api/v2/exercises/progress": "30/minute",
+    }
+    RATE_LIMIT_EXEMPT: list[str] = ["/health/live", "/health/ready"]  # Routes never rate limited
+    RATE_LIMIT_DEFAULT: str | None = "600/minute"  # Budget for every other route (None leaves them unlimited)
+    RATE_LIMIT_REDIS_URL: str | None = None  # Share budgets across workers, needs the redis package
+    DATABASE_MAX_IN_FLIGHT: int = 32  # Database operations each worker runs at once
+    DATABASE_MAX_QUEUED: int = 256  # Operations waiting for a slot, any more are rejected with a 503
+    DATABASE_QUEUE_TIMEOUT: float = 5.0  # Seconds an operation waits for a slot before it's rejected with a 503
+    DATABASE_PRIORITIES: dict[str, str] = {  # Queue priority per route ("high", "normal" or "low")
+        "/api/v2/sets/add": "high",
+        "/api/v2/sets/update": "high",
+        "/api/v2/workouts/create": "high",
+        "/api/v2/exercises/progress": "low",
+        "/api/v2/history/export": "low",
+        "/api/v2/history/import": "low",
+        "/api/v2/jobs/detail": "high",  # Polled repeatedly, so kept cheap to answer even when busy
+    }
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 5000
+    SERVER_WORKERS: int | None = None  # Derived from the CPUs available to the process when not set
+    SERVER_WORKERS_PER_CPU: int = 1  # Async workers each keep a core busy, so one per CPU is usually enough
+    SERVER_KEEP_ALIVE: int = 5  # Seconds idle connections are kept open, keep it above the load balancer's timeout
+    SERVER_BACKLOG: int = 2048  # Pending connections queued by the kernel, capped at net.core.somaxconn
+    SERVER_TIMEOUT: int = 30  # Seconds a silent worker is given before it's restarted
+    SERVER_PRELOAD: bool = True  # Import the app once in the master so workers fork with it already loaded
+    HEALTH_CHECK_INTERVAL: float = 2.0  # Seconds a readiness ping is reused before the database is pinged again
+    HEALTH_CHECK_TIMEOUT: float = 1.0  # Seconds the ping may take before the worker is reported as not ready
+    HEALTH_MAX_QUEUED: int = 64  # Report not ready once this many database operations wait for a slot
+    JOB_MAX_CONCURRENCY: int = 2  # Background jobs each worker runs at once, the rest wait their turn
+    JOB_MAX_ATTEMPTS: int = 3  # Attempts given to a job failing with a database or overload error
+    JOB_RETRY_DELAY: float = 1.0  # Seconds before the first retry, doubled after every further failure
+    JOB_SHUTDOWN_TIMEOUT: float = 10.0  # Seconds running jobs are given to finish when the worker stops
+    TRACING_EXPORTER: str | None = None  # "console", "file" or a "package.module:factory" path (None disables tracing)
+    TRACING_FILE: str = "traces.jsonl"  # Where the file exporter appends spans, one JSON object per line
+    TRACING_SAMPLE_RATE: float = 0.05  # Share of requests traced, unless an incoming traceparent header decides it
+    PROFILER_SECRET: str | None = None  # Requests sending it in an x-profile header are profiled (None disables it)
+    PROFILER_DIRECTORY: str = "profiles"  # Where profiles are saved, each response names its file in x-profile
+    PROFILER_INTERVAL: float = 0.001  # Seconds between samples, when pyinstrument is installed
+    PURGE_CHUNK_SIZE: int = 500  # Sets of deleted workouts and exercises removed per statement by the purge
+    PURGE_JOB_RETENTION: int = (
+        86400  # Seconds a purge job is kept, older ones are removed and no longer hold off new ones
+    )
+    EXERCISE_SEARCH_MAX_USERS: int = 1000  # Users whose exercise search index each worker keeps in memory
+    EXERCISE_SEARCH_TTL: float = 30.0  # Seconds before an index is rebuilt to pick up other workers' changes
+    EXERCISE_SEARCH_CUTOFF: float = 0.6  # How closely a misspelled search must match a name, between 0 and 1
@@ -0,0 +1,16 @@
+from .exporters import EXPORTERS, BackgroundExporter, ConsoleExporter, Exporter, FileExporter, get_exporter
+from .routes import TracedRoute
+from .spans import Span, current_span, span
+
+__all__ = [
+    "EXPORTERS",
+    "BackgroundExporter",
+    "ConsoleExporter",
+    "Exporter",
+    "FileExporter",
+    "get_exporter",
+    "TracedRoute",
+    "Span",
+    "current_span",
+    "span",
+]
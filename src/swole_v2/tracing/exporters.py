@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ..settings import Settings
+    from .spans import Span
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUED_TRACES = 1000
+CLOSE_TIMEOUT = 5.0  # Seconds a stopping worker waits for queued traces to be exported
+
+
+class Exporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class ConsoleExporter:
+    """Writes each trace to stderr as an indented timeline, for a quick look while developing."""
+
+    def __init__(self, stream: Callable[[str], object] = sys.stderr.write) -> None:
+        self.write = stream
+
+    def export(self, spans: list[Span]) -> None:
+        depths: dict[str | None, int] = {}
+        lines = []
+        for span in spans:  # Parents are always recorded before their children
+            depth = depths[span.span_id] = depths.get(span.parent_id, -1) + 1
+            offset = (span.start_time - spans[0].start_time) * 1000
+            duration = (span.duration or 0.0) * 1000
+            error = f" !{span.error}" if span.error else ""
+            lines.append(f"{offset:9.2f}ms {duration:9.2f}ms {'  ' * depth}{span.name}{error} {span.attributes or ''}")
+        self.write(f"trace {spans[0].trace_id}\n" + "\n".join(line.rstrip() for line in lines) + "\n")
+
+
+class FileExporter:
+    """Appends every span as a line of JSON, so traces can be loaded into other tools for offline analysis."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+    def export(self, spans: list[Span]) -> None:
+        # Written in a single call, so the lines of concurrent workers don't interleave
+        with self.path.open("a") as file:
+            file.write("".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans))
+
+
+class BackgroundExporter:
+    """Hands traces to another exporter on a thread of its own, so exporting never holds up the event loop.
+
+    Errors raised by the exporter are logged, and traces are dropped rather than queued without bound
+    when it falls behind. The thread is started by the first export, so it runs in the worker that
+    exports and not in a gunicorn master that preloaded the app.
+    """
+
+    def __init__(self, exporter: Exporter, max_queue_size: int = MAX_QUEUED_TRACES) -> None:
+        self.exporter = exporter
+        self.queue: queue.Queue[list[Span] | None] = queue.Queue(max_queue_size)
+        self.thread: threading.Thread | None = None
+
+    def export(self, spans: list[Span]) -> None:
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name="trace-exporter", daemon=True)
+            self.thread.start()
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("Dropped trace %s, the exporter is falling behind", spans[0].trace_id)
+
+    def run(self) -> None:
+        while (spans := self.queue.get()) is not None:
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                logger.exception("Could not export trace %s", spans[0].trace_id)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        # Exports whatever is still queued before the thread stops
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+
+EXPORTERS: dict[str, Callable[[Settings], Exporter]] = {
+    "console": lambda _: ConsoleExporter(),
+    "file": lambda settings: FileExporter(settings.TRACING_FILE),
+}
+
+
+def get_exporter(settings: Settings) -> Exporter | None:
+    """Builds the configured exporter, either one of EXPORTERS or a "package.module:factory" path.
+
+    Factories are called with the settings, which is how exporters shipping to a collector are plugged in.
+    """
+    if (name := settings.TRACING_EXPORTER) is None:
+        return None
+    if name in EXPORTERS:
+        return EXPORTERS[name](settings)
+    module, _, attribute = name.partition(":")
+    factory: Callable[[Settings], Exporter] = getattr(importlib.import_module(module), attribute)
+    return factory(settings)
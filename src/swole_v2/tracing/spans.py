@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextvars import Token
+
+# W3C trace context, e.g. 00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01
+TRACEPARENT = re.compile(r"^[\da-f]{2}-([\da-f]{32})-([\da-f]{16})-([\da-f]{2})$")
+
+# The span being recorded for the current request, None when the request isn't traced
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+# The stage of a route left open between the route handler and its endpoint, see routes.py
+current_stage: ContextVar[tuple[Span, Token[Span | None]] | None] = ContextVar("current_stage", default=None)
+
+
+@dataclass
+class Span:
+    """One timed stage of a request, spans share their trace's list so the whole tree is exported at once."""
+
+    name: str
+    trace_id: str
+    parent_id: str | None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    # Wall clock start to line spans up with other logs, the duration comes from the monotonic clock
+    start_time: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter)
+    duration: float | None = None
+    error: str | None = None
+    spans: list[Span] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self.spans.append(self)
+
+    def child(self, name: str, attributes: dict[str, Any]) -> Span:
+        return Span(name, self.trace_id, self.span_id, attributes, spans=self.spans)
+
+    def finish(self) -> None:
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Times the block as a child of the current span, or does nothing when the request isn't traced."""
+    if (parent := current_span.get()) is None:
+        yield None
+        return
+    child = parent.child(name, attributes)
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as error:
+        child.error = type(error).__name__
+        raise
+    finally:
+        child.finish()
+        current_span.reset(token)
+
+
+def open_stage(name: str) -> None:
+    # Like span(), for stages that start and end in different functions of the same request
+    if (parent := current_span.get()) is not None:
+        stage = parent.child(name, {})
+        current_stage.set((stage, current_span.set(stage)))
+
+
+def close_stage() -> None:
+    if (stage := current_stage.get()) is not None:
+        span, token = stage
+        span.finish()
+        current_span.reset(token)
+        current_stage.set(None)
+
+
+def parse_traceparent(traceparent: str) -> tuple[str, str | None, bool | None]:
+    """Returns the trace id, parent span id and sampled flag of an incoming trace context.
+
+    Requests without a valid one start a new trace, whose sampling is left to the caller.
+    """
+    if (match := TRACEPARENT.match(traceparent.strip().lower())) is None or set(match.group(1)) == {"0"}:
+        return secrets.token_hex(16), None, None
+    trace_id, parent_id, flags = match.groups()
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import random
+from datetime import date
 from itertools import filterfalse
 from statistics import mean
 from typing import Any, Iterable
@@ -16,6 +18,7 @@ from swole_v2.errors.messages import (
     INVALID_ID,
     NO_EXERCISE_FOUND,
 )
+from swole_v2.jobs.runner import get_job_runner
 from swole_v2.models import Exercise, ExerciseRead
 from swole_v2.schemas import ErrorResponse, SuccessResponse
 
@@ -268,7 +271,9 @@ class TestExercises(APITestBase):
 
         response = await self._post_success("/delete", data=[{"exercise_id": str(exercise.id)}])
         deleted_exercise = json.loads(
-            await self.db.query_single_json("SELECT Exercise FILTER .id = <uuid>$exercise_id", exercise_id=exercise.id)
+            await self.db.query_single_json(
+                "SELECT Exercise FILTER .id = <uuid>$exercise_id AND NOT EXISTS .deleted_at", exercise_id=exercise.id
+            )
         )
 
         assert deleted_exercise is None
@@ -283,7 +288,9 @@ class TestExercises(APITestBase):
         ]
         response = await self._post_error("/delete", data=data)
         valid_exercise = json.loads(
-            await self.db.query_single_json("SELECT Exercise FILTER .id = <uuid>$id", id=valid_exercise.id)
+            await self.db.query_single_json(
+                "SELECT Exercise FILTER .id = <uuid>$id AND NOT EXISTS .deleted_at", id=valid_exercise.id
+            )
         )
 
         assert response.message == message
@@ -299,16 +306,44 @@ class TestExercises(APITestBase):
 
         response = await self._post_success("/delete", data=data)
         deleted_exercise_1 = json.loads(
-            await self.db.query_single_json("SELECT Exercise FILTER .id = <uuid>$id", id=exercise_1.id)
+            await self.db.query_single_json(
+                "SELECT Exercise FILTER .id = <uuid>$id AND NOT EXISTS .deleted_at", id=exercise_1.id
+            )
         )
         deleted_exercise_2 = json.loads(
-            await self.db.query_single_json("SELECT Exercise FILTER .id = <uuid>$id", id=exercise_2.id)
+            await self.db.query_single_json(
+                "SELECT Exercise FILTER .id = <uuid>$id AND NOT EXISTS .deleted_at", id=exercise_2.id
+            )
         )
 
         assert deleted_exercise_1 is None
         assert deleted_exercise_2 is None
         assert response.results == []
 
+    async def test_exercise_delete_frees_the_name_and_purges_the_sets_in_the_background(self) -> None:
+        exercise = await self.sample.exercise()
+        sets = await self.sample.sets(exercise=exercise)
+
+        await self._post_success("/delete", data=[{"exercise_id": str(exercise.id)}])
+        created = await self._post_success("/create", data=[{"name": exercise.name}])
+        hidden = await self._post_error("/detail", data=[{"exercise_id": str(exercise.id)}])
+
+        assert created.results
+        assert hidden.message == NO_EXERCISE_FOUND
+
+        await asyncio.gather(*get_job_runner().tasks)
+        purged_exercise = json.loads(
+            await self.db.query_single_json("SELECT Exercise FILTER .id = <uuid>$id", id=exercise.id)
+        )
+        purged_sets = json.loads(
+            await self.db.query_json(
+                "SELECT ExerciseSet FILTER .id IN array_unpack(<array<uuid>>$ids)", ids=[s.id for s in sets]
+            )
+        )
+
+        assert purged_exercise is None
+        assert purged_sets == []
+
     async def test_exercise_delete_fails_when_at_least_one_exercise_belongs_to_other_user(self) -> None:
         exercise = await self.sample.exercise()
         exercise_belonging_to_other_user = await self.sample.exercise(user=await self.sample.user())
@@ -392,6 +427,23 @@ class TestExercises(APITestBase):
         assert len(exercise_1_progress_report["data"]) == len(exercise_1_set_groups)
         assert len(exercise_2_progress_report["data"]) == 0  # no sets were added to exercise 2
 
+    async def test_exercise_progress_succeeds_with_columns(self) -> None:
+        exercise = await self.sample.exercise()
+        set_groups = [await self.sample.sets(exercise=exercise, size=random.choice(range(1, 10))) for _ in range(3)]
+        set_groups.sort(key=lambda group: group[0].workout.date)  # type: ignore
+
+        response = await self._post_success("/progress?layout=columns", data=[{"exercise_id": str(exercise.id)}])
+
+        assert response.results == [
+            {
+                "exercise_name": exercise.name,
+                "date": [group[0].workout.date.strftime("%Y-%m-%d") for group in set_groups],  # type: ignore
+                "avg_rep_count": [await self._rounded_mean([s.rep_count for s in group]) for group in set_groups],
+                "avg_weight": [await self._rounded_mean([s.weight for s in group]) for group in set_groups],
+                "max_weight": [max(s.weight for s in group) for group in set_groups],
+            }
+        ]
+
     async def test_exercise_progress_fails_when_using_an_exercise_id_belonging_to_another_user(self) -> None:
         exercise = await self.sample.exercise()
         exercise_belonging_to_other_user = await self.sample.exercise(user=await self.sample.user())
@@ -410,6 +462,54 @@ class TestExercises(APITestBase):
 
         assert response.results == []
 
+    async def test_exercise_search_sees_new_exercises(self) -> None:
+        exercise = await self.sample.exercise(name="Bench Press")
+        await self.sample.exercise(name="Deadlift")
+
+        response = await self._post_success("/search", data={"query": "ben"})
+        assert response.results == [{"id": str(exercise.id), "name": exercise.name, "notes": exercise.notes}]
+
+        created = await self._post_success("/create", data=[{"name": "Bent Over Row"}])
+        response = await self._post_success("/search", data={"query": "ben"})
+
+        assert response.results
+        assert [r["name"] for r in response.results] == ["Bench Press", created.results[0]["name"]]  # type: ignore[index]
+
+    async def test_exercise_volume_follows_set_changes(self) -> None:
+        workout = await self.sample.workout(date=date(2023, 3, 2))
+        exercise = await self.sample.exercise()
+        weight, rep_count = 100, 5
+        set_data = {"workout_id": str(workout.id), "exercise_id": str(exercise.id), "rep_count": rep_count}
+        data = [{**set_data, "weight": weight}] * 2
+        added = await self.client.post("/api/v2/sets/add", json=data)
+        set_id = added.json()["results"][0]["id"]
+
+        await self.client.post("/api/v2/sets/update", json=[{"set_id": set_id, "weight": 120}])
+        response = await self._post_success("/volume", data={"period": "Week"})
+
+        assert response.results == [
+            {
+                "exercise_id": str(exercise.id),
+                "exercise_name": exercise.name,
+                "period_start": "2023-02-27",
+                "volume": (weight + 120) * rep_count,
+                "set_count": len(data),
+                "rep_count": len(data) * rep_count,
+            }
+        ]
+
+        await self.client.post("/api/v2/sets/delete", json=[{"set_id": set_id}])
+        response = await self._post_success("/volume", data={"period": "Month"})
+
+        assert response.results
+        assert response.results[0]["volume"] == weight * rep_count
+
+    async def test_exercise_volume_is_empty_without_sets(self) -> None:
+        await self.sample.exercise()
+        response = await self._post_success("/volume", data={"period": "Month"})
+
+        assert response.results == []
+
     async def _post_success(
         self, endpoint: str, data: dict[str, Any] | list[dict[str, Any]] | None = None
     ) -> SuccessResponse:
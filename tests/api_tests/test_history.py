@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from typing import Any
+
+import pytest
+
+from swole_v2.dependencies.settings import get_settings
+from swole_v2.errors.messages import HISTORY_FILE_TOO_LARGE, INVALID_HISTORY_ROW, UNSUPPORTED_HISTORY_FORMAT
+from swole_v2.schemas import ErrorResponse, SuccessResponse
+
+from .base import APITestBase, fake
+
+
+class TestHistory(APITestBase):
+    async def test_history_import_csv_succeeds(self) -> None:
+        exercise = await self.sample.exercise()
+        content = (
+            "workout,date,exercise,weight,rep_count\n"
+            f"Push,2022-01-01,{exercise.name.upper()},100,5\n"
+            "Push,2022-01-01,Dips,20,10\n"
+            "push ,2022-01-01,dips,20,8\n"
+            "Pull,2022-01-02,Row,60,8\n"
+        )
+
+        response = await self._post_success("history.csv", content)
+        workouts = await self._query_workouts()
+
+        assert response.results == [{"rows": 4, "batches": 1, "sets": 4}]
+        assert {(w["name"], w["date"]) for w in workouts} == {("Push", "2022-01-01"), ("Pull", "2022-01-02")}
+        push = next(w for w in workouts if w["name"] == "Push")
+        assert sorted(e["name"] for e in push["exercises"]) == sorted([exercise.name, "Dips"])
+        assert len(push["sets"]) == 3  # noqa: PLR2004
+
+    async def test_history_import_json_adds_to_existing_workout(self) -> None:
+        workout = await self.sample.workout()
+        rows = [
+            {"workout": workout.name, "date": str(workout.date), "exercise": "Squat", "weight": 100, "rep_count": 5},
+            {"workout": fake.word(), "date": "2022-01-01", "exercise": "Squat", "weight": 100, "rep_count": 5},
+        ]
+
+        response = await self._post_success("history.json", json.dumps(rows))
+        workouts = await self._query_workouts()
+
+        assert response.results == [{"rows": 2, "batches": 1, "sets": 2}]
+        assert len(workouts) == 2  # noqa: PLR2004
+        assert all([e["name"] for e in w["exercises"]] == ["Squat"] for w in workouts)
+
+    async def test_history_import_resumes_from_row(self) -> None:
+        rows = [
+            {"workout": "Legs", "date": "2022-01-01", "exercise": "Squat", "weight": weight, "rep_count": 5}
+            for weight in range(1, 6)
+        ]
+
+        response = await self._post_success("history.ndjson", "\n".join(json.dumps(r) for r in rows), resume_from=3)
+        workouts = await self._query_workouts()
+
+        assert response.results == [{"rows": 5, "batches": 1, "sets": 2}]
+        assert sorted(s["weight"] for s in workouts[0]["sets"]) == [4, 5]
+
+    @pytest.mark.parametrize(
+        "filename, content, message",
+        [
+            pytest.param("history.xlsx", "", UNSUPPORTED_HISTORY_FORMAT, id="Test unsupported format fails"),
+            pytest.param(
+                "history.csv",
+                "workout,date,exercise,weight,rep_count\nPush,01/01/2022,Bench,100,5\n",
+                INVALID_HISTORY_ROW.format(1, "Incorrect date format, should be YYYY-MM-DD"),
+                id="Test invalid row fails",
+            ),
+        ],
+    )
+    async def test_history_import_fails(self, filename: str, content: str, message: str) -> None:
+        response = ErrorResponse(**(await self._post(filename, content)).json())
+
+        assert response.code == "error"
+        assert response.message == message
+
+    async def test_history_export_ndjson_succeeds(self) -> None:
+        workout = await self.sample.workout()
+        exercise = await self.sample.exercise()
+        sets = await self.sample.sets(workout=workout, exercise=exercise)
+
+        response = await self.client.post("/api/v2/history/export")
+        records = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [r["id"] for r in records if r["type"] == "exercise"] == [str(exercise.id)]
+        assert [r["id"] for r in records if r["type"] == "workout"] == [str(workout.id)]
+        assert sorted(r["id"] for r in records if r["type"] == "set") == sorted(str(s.id) for s in sets)
+
+    async def test_history_export_csv_reads_every_page(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(get_settings(), "EXPORT_CHUNK_SIZE", 2)
+        sets = await self.sample.sets(size=5)
+
+        response = await self.client.post("/api/v2/history/export", params={"format": "csv"})
+        records = list(csv.DictReader(io.StringIO(response.text)))
+
+        assert response.headers["content-type"].startswith("text/csv")
+        assert len([r for r in records if r["type"] == "set"]) == len(sets)
+
+    async def test_history_import_in_background_succeeds(self) -> None:
+        content = "workout,date,exercise,weight,rep_count\nPush,2022-01-01,Dips,20,10\nPull,2022-01-02,Row,60,8\n"
+
+        response = await self._post_success("history.csv", content, background=True)
+        job = await self._wait_for_job(response.results[0]["id"])  # type: ignore[index]
+
+        assert job["kind"] == "history_import"
+        assert job["status"] == "Succeeded"
+        assert job["result"] == {"rows": 2, "batches": 1, "sets": 2}
+        assert len(await self._query_workouts()) == 2  # noqa: PLR2004
+
+    async def test_history_import_in_background_reports_failure(self) -> None:
+        content = "workout,date,exercise,weight,rep_count\nPush,2022-01-01,Dips,-20,10\n"
+
+        response = await self._post_success("history.csv", content, background=True)
+        job = await self._wait_for_job(response.results[0]["id"])  # type: ignore[index]
+
+        assert job["status"] == "Failed"
+        assert job["error"] == INVALID_HISTORY_ROW.format(1, "Field weight must be a positive integer")
+
+    async def test_history_import_in_background_fails_when_file_is_too_large(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(get_settings(), "IMPORT_MAX_UPLOAD_SIZE", 10)
+
+        response = ErrorResponse(**(await self._post("history.csv", "workout,date\n" * 2, background=True)).json())
+
+        assert response.message == HISTORY_FILE_TOO_LARGE.format(10)
+
+    async def _wait_for_job(self, job_id: str) -> dict[str, Any]:
+        for _ in range(100):
+            response = await self.client.post("/api/v2/jobs/detail", json=[{"job_id": job_id}])
+            job: dict[str, Any] = response.json()["results"][0]
+            if job["status"] in {"Succeeded", "Failed"}:
+                return job
+            await asyncio.sleep(0.05)
+        pytest.fail("Job did not finish")
+
+    async def _query_workouts(self) -> list[dict[str, Any]]:
+        return json.loads(
+            await self.db.query_json(
+                """
+                SELECT Workout {name, date, exercises: {name}, sets := .<workout[is ExerciseSet] {weight}}
+                FILTER .user.id = <uuid>$user_id
+                """,
+                user_id=self.user.id,
+            )
+        )
+
+    async def _post(self, filename: str, content: str, **params: Any) -> Any:
+        return await self.client.post("/api/v2/history/import", files={"file": (filename, content)}, params=params)
+
+    async def _post_success(self, filename: str, content: str, **params: Any) -> SuccessResponse:
+        response = SuccessResponse(**(await self._post(filename, content, **params)).json())
+        assert response.code == "ok"
+        return response
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any
+
+from swole_v2.schemas import SuccessResponse
+
+from .base import APITestBase
+
+
+class TestSearch(APITestBase):
+    async def test_search_ranks_workouts_and_exercises_together(self) -> None:
+        workout = await self.sample.workout(name="Deload Week")
+        exercise = await self.sample.exercise(name="Pause Squat", notes="Deload with paused reps")
+        await self.sample.exercise(name="Deadlift", notes="Heavy")
+
+        response = await self._post_success("/all", data={"query": "deload paused"})
+
+        # The workout's name and the exercise's notes both rank 2, so the tie is broken by name
+        assert response.results == [
+            {
+                "kind": "workout",
+                "id": str(workout.id),
+                "name": workout.name,
+                "notes": None,
+                "date": workout.date.strftime("%Y-%m-%d"),  # type: ignore[union-attr]
+                "rank": 2,
+            },
+            {
+                "kind": "exercise",
+                "id": str(exercise.id),
+                "name": exercise.name,
+                "notes": exercise.notes,
+                "date": None,
+                "rank": 2,
+            },
+        ]
+
+    async def test_search_paginates(self) -> None:
+        for name in ("Deload A", "Deload B", "Deload C"):
+            await self.sample.workout(name=name)
+
+        first = await self._post_success("/all", data={"query": "deload", "limit": 2})
+        second = await self._post_success("/all", data={"query": "deload", "limit": 2, "offset": 2})
+
+        assert first.results
+        assert second.results
+        assert [hit["name"] for hit in first.results + second.results] == ["Deload A", "Deload B", "Deload C"]
+
+    async def test_search_without_words_returns_nothing(self) -> None:
+        await self.sample.workout(name="Deload")
+
+        response = await self._post_success("/all", data={"query": "%%"})
+
+        assert response.results == []
+
+    async def _post_success(self, endpoint: str, data: dict[str, Any]) -> SuccessResponse:
+        response = SuccessResponse(**(await self.client.post(f"/api/v2/search{endpoint}", json=data)).json())
+        assert response.code == "ok"
+        return response
@@ -6,7 +6,9 @@ from uuid import uuid4
 
 import pytest
 
+from swole_v2.dependencies.settings import get_settings
 from swole_v2.errors.messages import (
+    BATCH_TOO_LARGE,
     CANNOT_BE_GREATER_THAN,
     INVALID_ID,
     MUST_BE_A_VALID_POSITIVE_INT,
@@ -74,6 +76,19 @@ class TestSets(APITestBase):
         assert response.results
         assert response.results == [json.loads(SetRead(**s.model_dump()).model_dump_json()) for s in sets]
 
+    async def test_set_get_all_succeeds_with_columns(self) -> None:
+        workout = await self.sample.workout()
+        exercise = await self.sample.exercise()
+        sets = await self.sample.sets(workout=workout, exercise=exercise)
+
+        response = await self._post_success(
+            "/all?layout=columns&fields=weight", data={"workout_id": str(workout.id), "exercise_id": str(exercise.id)}
+        )
+
+        assert response.results
+        assert sorted(response.results[0]["weight"]) == sorted(s.weight for s in sets)
+        assert list(response.results[0]) == ["weight"]
+
     async def test_set_get_all_only_returns_sets_owned_by_logged_in_user(self) -> None:
         user = await self.sample.user()
         workout = await self.sample.workout(user)
@@ -417,6 +432,32 @@ class TestSets(APITestBase):
 
         assert response.message == message
 
+    async def test_set_add_fails_when_batch_is_too_large(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(get_settings(), "BATCH_SIZE_LIMITS", {"/api/v2/sets/add": 2})
+        workout = await self.sample.workout()
+        exercise = await self.sample.exercise()
+        data = {"workout_id": str(workout.id), "exercise_id": str(exercise.id), "rep_count": 1, "weight": 1}
+
+        response = await self._post_error("/add", [data, data, data])
+
+        assert response.message == BATCH_TOO_LARGE.format(2)
+
+    @pytest.mark.parametrize("atomic", [pytest.param(True, id="One transaction"), pytest.param(False, id="Many")])
+    async def test_set_add_succeeds_in_chunks(self, atomic: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(get_settings(), "BATCH_CHUNK_SIZE", 2)
+        monkeypatch.setattr(get_settings(), "BATCH_CHUNK_ATOMIC", atomic)
+        workout = await self.sample.workout()
+        exercise = await self.sample.exercise()
+        data = [
+            {"workout_id": str(workout.id), "exercise_id": str(exercise.id), "rep_count": i, "weight": i}
+            for i in range(1, 6)
+        ]
+
+        response = await self._post_success("/add", data)
+
+        assert response.results
+        assert sorted(r["weight"] for r in response.results) == [1, 2, 3, 4, 5]
+
     async def _post_success(self, endpoint: str, data: dict[str, Any] | list[dict[str, Any]]) -> SuccessResponse:
         response = SuccessResponse(**(await self.client.post(f"/api/v2/sets{endpoint}", json=data)).json())
         assert response.code == "ok"
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 from uuid import uuid4
 
 import pytest
 
+from swole_v2.dependencies.settings import get_settings
 from swole_v2.errors.messages import (
+    BATCH_TOO_LARGE,
+    END_DATE_BEFORE_START_DATE,
     FIELD_CANNOT_BE_EMPTY,
+    FIELDS_WITH_EXERCISES,
     IDS_MUST_BE_UNIQUE,
     INCORRECT_DATE_FORMAT,
     INVALID_ID,
     NAME_AND_DATE_MUST_BE_UNIQUE,
+    NO_DATES_GIVEN,
     NO_EXERCISE_FOUND,
     NO_WORKOUT_FOUND,
+    UNKNOWN_FIELDS,
 )
-from swole_v2.models import Workout
+from swole_v2.models import Workout, WorkoutRead
 from swole_v2.schemas import ErrorResponse, SuccessResponse
 
 from .base import APITestBase, fake
@@ -38,6 +44,46 @@ class TestWorkouts(APITestBase):
         assert response.results
         assert len(response.results) == len(workouts)
 
+    async def test_workout_get_all_succeeds_with_fields(self) -> None:
+        workouts = await self.sample.workouts()
+
+        response = await self._post_success("/all?fields=id")
+
+        assert response.results
+        assert sorted(result["id"] for result in response.results) == sorted(str(w.id) for w in workouts)
+        assert all(list(result) == ["id"] for result in response.results)
+
+    async def test_workout_get_all_fails_with_unknown_fields(self) -> None:
+        response = await self._post_error("/all?fields=id,notes", data={})
+
+        assert response.message == UNKNOWN_FIELDS.format("notes", "id, name, date")
+
+    async def test_workout_calendar_succeeds(self) -> None:
+        first = await self.sample.workout(date=date(2023, 1, 2))
+        await self.sample.workout(date=date(2023, 1, 2))
+        await self.sample.workout(date=date(2023, 1, 5))
+        # Outside of the window and belonging to another user, so neither is counted
+        await self.sample.workout(date=date(2022, 12, 31))
+        await self.sample.workout(user=await self.sample.user(), date=date(2023, 1, 3))
+        sets = await self.sample.sets(workout=first, size=2)
+        data = {"start_date": "2023-01-01", "end_date": "2023-01-31"}
+
+        response = await self._post_success("/calendar", data=data)
+        with_volume = await self._post_success("/calendar", data={**data, "with_volume": True})
+
+        assert response.results == [["2023-01-02", 2], ["2023-01-05", 1]]
+        assert with_volume.results == [
+            ["2023-01-02", 2, sum(s.weight * s.rep_count for s in sets)],
+            ["2023-01-05", 1, 0],
+        ]
+
+    async def test_workout_calendar_fails_with_end_date_before_start_date(self) -> None:
+        data = {"start_date": "2023-01-31", "end_date": "2023-01-01"}
+
+        response = await self._post_error("/calendar", data=data)
+
+        assert response.message == END_DATE_BEFORE_START_DATE
+
     async def test_workout_detail_succeeds(self) -> None:
         workout = await self.sample.workout()
 
@@ -90,6 +136,22 @@ class TestWorkouts(APITestBase):
         assert response.results
         assert all(results in response.results for results in expected_results)
 
+    async def test_workout_detail_succeeds_with_fields(self) -> None:
+        workout = await self.sample.workout()
+
+        response = await self._post_success("/detail?fields=date,id", data=[{"workout_id": str(workout.id)}])
+
+        assert response.results == [{"id": str(workout.id), "date": workout.date.strftime("%Y-%m-%d")}]
+
+    async def test_workout_detail_fails_with_fields_and_exercises(self) -> None:
+        workout = await self.sample.workout()
+
+        response = await self._post_error(
+            "/detail?with_exercises=true&fields=id", data=[{"workout_id": str(workout.id)}]
+        )
+
+        assert response.message == FIELDS_WITH_EXERCISES
+
     @pytest.mark.parametrize(*invalid_workout_id_params)
     async def test_workout_detail_fails_with_invalid_workout_id(self, workout_id: Any, message: str) -> None:
         valid_workout = await self.sample.workout()
@@ -227,7 +289,9 @@ class TestWorkouts(APITestBase):
 
         result = await self._post_success("/delete", data=[{"workout_id": str(workout.id)}])
         deleted_workout = json.loads(
-            await self.db.query_single_json("SELECT Workout FILTER .id = <uuid>$workout_id", workout_id=workout.id)
+            await self.db.query_single_json(
+                "SELECT Workout FILTER .id = <uuid>$workout_id AND NOT EXISTS .deleted_at", workout_id=workout.id
+            )
         )
 
         assert deleted_workout is None
@@ -243,10 +307,14 @@ class TestWorkouts(APITestBase):
 
         result = await self._post_success("/delete", data=data)
         deleted_workout_1 = json.loads(
-            await self.db.query_single_json("SELECT Workout FILTER .id = <uuid>$id", id=workout_1.id)
+            await self.db.query_single_json(
+                "SELECT Workout FILTER .id = <uuid>$id AND NOT EXISTS .deleted_at", id=workout_1.id
+            )
         )
         deleted_workout_2 = json.loads(
-            await self.db.query_single_json("SELECT Workout FILTER .id = <uuid>$id", id=workout_2.id)
+            await self.db.query_single_json(
+                "SELECT Workout FILTER .id = <uuid>$id AND NOT EXISTS .deleted_at", id=workout_2.id
+            )
         )
 
         assert deleted_workout_1 is None
@@ -688,6 +756,74 @@ class TestWorkouts(APITestBase):
 
         assert response.message == NO_WORKOUT_FOUND
 
+    @pytest.mark.parametrize("include_sets", [True, False])
+    async def test_workout_copy_includes_sets_when_asked(self, include_sets: bool) -> None:
+        workout = await self.sample.workout()
+        sets = await self.sample.sets(workout=workout)
+        data = [{"workout_id": str(workout.id), "date": "2000-01-01", "include_sets": include_sets}]
+
+        response = await self._post_success("/copy", data=data)
+        copied_sets = await self._query_set_weights(response.results[0]["id"])  # type: ignore[index]
+
+        assert copied_sets == (sorted(s.weight for s in sets) if include_sets else [])
+
+    async def test_workout_program_succeeds(self) -> None:
+        workout = await self.sample.workout(exercises=await self.sample.exercises())
+        sets = await self.sample.sets(workout=workout)
+        data = [
+            {
+                "workout_id": str(workout.id),
+                "dates": ["2000-01-01", "2000-01-03"],
+                "recurrence": {"start": "2000-01-03", "interval_days": 7, "count": 3},
+                "include_sets": True,
+            }
+        ]
+
+        response = await self._post_success("/program", data=data)
+
+        assert response.results
+        assert [r["date"] for r in response.results] == ["2000-01-01", "2000-01-03", "2000-01-10", "2000-01-17"]
+        assert all(r["name"] == workout.name for r in response.results)
+        for result in response.results:
+            assert await self._query_set_weights(result["id"]) == sorted(s.weight for s in sets)
+
+    async def test_workout_program_fails_without_dates(self) -> None:
+        workout = await self.sample.workout()
+
+        response = await self._post_error("/program", data=[{"workout_id": str(workout.id)}])
+
+        assert response.message == NO_DATES_GIVEN
+
+    async def test_workout_program_creates_nothing_when_a_date_is_taken(self) -> None:
+        workout = await self.sample.workout()
+        data = [{"workout_id": str(workout.id), "dates": ["2000-01-01", str(workout.date)]}]
+
+        response = await self._post_error("/program", data=data)
+        workouts = await self._post_success("/all")
+
+        assert response.message == NAME_AND_DATE_MUST_BE_UNIQUE
+        assert workouts.results == [json.loads(WorkoutRead(**workout.model_dump()).model_dump_json())]
+
+    async def test_workout_program_fails_when_copies_exceed_the_batch_size(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(get_settings(), "MAX_BATCH_SIZE", 2)
+        workout = await self.sample.workout()
+        data = [{"workout_id": str(workout.id), "recurrence": {"start": "2000-01-01", "interval_days": 1, "count": 3}}]
+
+        response = await self._post_error("/program", data=data)
+
+        assert response.message == BATCH_TOO_LARGE.format(2)
+
+    async def _query_set_weights(self, workout_id: str) -> list[int]:
+        weights = json.loads(
+            await self.db.query_json(
+                "SELECT ExerciseSet.weight FILTER ExerciseSet.workout.id = <uuid>$workout_id",
+                workout_id=workout_id,
+            )
+        )
+        return sorted(weights)
+
     async def _post_success(
         self, endpoint: str, data: dict[str, Any] | list[dict[str, Any]] | None = None
     ) -> SuccessResponse:
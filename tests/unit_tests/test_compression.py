@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from swole_v2.middleware import CompressionMiddleware
+from swole_v2.middleware.compression import CompressionCache, negotiate
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+DECOMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    # Streamed frames don't record their size, which zstandard.decompress() needs
+    "zstd": lambda body: zstandard.ZstdDecompressor().decompressobj().decompress(body),
+}
+LARGE_BODY = [{"id": index, "name": "Workout", "date": "2022-01-01"} for index in range(200)]
+
+
+async def large() -> list[dict[str, object]]:
+    return LARGE_BODY
+
+
+async def small() -> dict[str, str]:
+    return {"code": "ok"}
+
+
+async def image() -> PlainTextResponse:
+    return PlainTextResponse("x" * 1000, media_type="image/svg+xml")
+
+
+async def stream() -> StreamingResponse:
+    async def lines() -> AsyncIterator[bytes]:
+        for index in range(100):
+            yield f'{{"id": {index}}}\n'.encode()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def create_app(levels: dict[str, int] | None = None) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, levels=levels or {"gzip": 6}, cache_size=8)
+    for endpoint in (large, small, image, stream):
+        app.add_api_route(f"/{endpoint.__name__}", endpoint)
+    return app
+
+
+async def get(app: FastAPI, path: str, accept_encoding: str) -> tuple[dict[str, str], bytes]:
+    async with (
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client,
+        client.stream("GET", path, headers={"accept-encoding": accept_encoding}) as response,
+    ):
+        return dict(response.headers), b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("gzip, br", "br"),
+        ("*", "br"),
+        ("gzip;q=0, br;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding: str, expected: str | None) -> None:
+    assert negotiate(accept_encoding, ["br", "gzip"]) == expected
+
+
+@pytest.mark.parametrize("encoding", LEVELS)
+async def test_large_json_is_compressed(encoding: str) -> None:
+    headers, body = await get(create_app(LEVELS), "/large", encoding)
+
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "accept-encoding"
+    assert int(headers["content-length"]) == len(body)
+    assert DECOMPRESSORS[encoding](body).startswith(b'[{"id":0')
+
+
+async def test_small_and_binary_responses_are_not_compressed() -> None:
+    app = create_app()
+
+    for path in ("/small", "/image"):
+        headers, _ = await get(app, path, "gzip")
+        assert "content-encoding" not in headers
+
+
+async def test_responses_without_accepted_encoding_are_not_compressed() -> None:
+    headers, body = await get(create_app(), "/large", "compress")
+
+    assert "content-encoding" not in headers
+    assert body.startswith(b'[{"id":0')
+
+
+@pytest.mark.parametrize("encoding", LEVELS)
+async def test_streamed_responses_are_compressed_in_chunks(encoding: str) -> None:
+    headers, body = await get(create_app(LEVELS), "/stream", encoding)
+
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    assert DECOMPRESSORS[encoding](body).splitlines()[-1] == b'{"id": 99}'
+
+
+async def test_uninstalled_encodings_are_not_offered() -> None:
+    headers, _ = await get(create_app({"unknown": 1, "gzip": 6}), "/large", "unknown, gzip")
+
+    assert headers["content-encoding"] == "gzip"
+
+
+def test_compression_cache_reuses_compressed_bodies() -> None:
+    cache = CompressionCache(max_size=1)
+    body = b"x" * 1000
+
+    first = cache.compress("gzip", 6, body)
+    assert cache.compress("gzip", 6, body) is first
+
+    cache.compress("gzip", 6, b"y" * 1000)
+    assert len(cache.bodies) == 1
+    assert cache.compress("gzip", 6, body) is not first
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from swole_v2.app import SwoleApp
+from swole_v2.database.database import get_async_client
+from swole_v2.database.health import DatabaseProbe, get_probe
+
+
+class FakeClient:
+    """Stands in for the EdgeDB client, answering pings after a delay or failing them."""
+
+    max_concurrency = 10
+    free_size = 10
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.pings = 0
+
+    async def query_json(self, *_: Any) -> str:
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return "[true]"
+
+
+async def get(client: FakeClient, path: str) -> tuple[int, dict[str, Any]]:
+    app = SwoleApp().app
+    app.dependency_overrides[get_async_client] = lambda: client
+    app.dependency_overrides[get_probe] = lambda: DatabaseProbe(interval=10, timeout=0.1)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get(path)
+    return response.status_code, response.json()
+
+
+async def test_concurrent_probes_share_one_ping() -> None:
+    client, probe = FakeClient(delay=0.01), DatabaseProbe(interval=10, timeout=1)
+
+    pings = await asyncio.gather(*(probe.check(client) for _ in range(5)))  # type: ignore[arg-type]
+
+    assert client.pings == 1
+    assert all(ping is pings[0] and ping.ok for ping in pings)
+
+
+async def test_pings_are_reused_within_the_interval() -> None:
+    now = [0.0]
+    client, probe = FakeClient(), DatabaseProbe(interval=2, timeout=1, clock=lambda: now[0])
+
+    await probe.check(client)  # type: ignore[arg-type]
+    now[0] = 1.0
+    await probe.check(client)  # type: ignore[arg-type]
+    assert client.pings == 1
+
+    now[0] = 3.0
+    await probe.check(client)  # type: ignore[arg-type]
+    assert client.pings == 2  # noqa: PLR2004
+
+
+async def test_slow_or_failing_pings_are_not_ok() -> None:
+    for client in (FakeClient(delay=1), FakeClient(error=OSError())):
+        ping = await DatabaseProbe(interval=10, timeout=0.01).check(client)  # type: ignore[arg-type]
+
+        assert not ping.ok
+        assert ping.error in {"TimeoutError", "OSError"}
+
+
+async def test_ready_reports_database_and_pool() -> None:
+    status_code, body = await get(FakeClient(), "/health/ready")
+
+    assert status_code == status.HTTP_200_OK
+    assert body["ready"] is True
+    assert body["database"]["ok"] is True
+    assert body["pool"]["max_concurrency"] == FakeClient.max_concurrency
+
+
+async def test_ready_fails_when_the_database_is_unreachable() -> None:
+    status_code, body = await get(FakeClient(error=OSError()), "/health/ready")
+
+    assert status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert body["ready"] is False
+
+
+async def test_live_does_not_touch_the_database() -> None:
+    client = FakeClient(error=OSError())
+    status_code, body = await get(client, "/health/live")
+
+    assert status_code == status.HTTP_200_OK
+    assert body["code"] == "ok"
+    assert client.pings == 0
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from swole_v2.errors.exceptions import BusinessError
+from swole_v2.errors.messages import INVALID_HISTORY_FILE, INVALID_HISTORY_ROW, UNSUPPORTED_HISTORY_FORMAT
+from swole_v2.history.exporter import ExportFormat, HistoryExporter
+from swole_v2.history.importer import HistoryImporter, ResumableImport
+from swole_v2.history.parsers import HistoryFormat, JsonRecordReader, read_rows
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+    from uuid import UUID
+
+    from swole_v2.models import ImportSummary
+    from swole_v2.schemas import HistoryImportRow
+
+records = st.lists(
+    st.fixed_dictionaries({"workout": st.text(), "weight": st.integers(), "notes": st.none() | st.text()}),
+    max_size=20,
+)
+
+
+class FakeHistoryRepository:
+    def __init__(self) -> None:
+        self.batches: list[list[HistoryImportRow]] = []
+
+    async def import_batch(self, _: UUID | None, rows: list[HistoryImportRow]) -> int:
+        self.batches.append(rows)
+        return len(rows)
+
+    async def iter_exercises(self, _: UUID | None, chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        yield [{"id": "e1", "name": "Bench", "notes": "Paused, slow"}][:chunk_size]
+
+    async def iter_workouts(self, _: UUID | None, chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        yield [{"id": "w1", "name": "Push", "date": "2022-01-01", "exercises": ["e1", "e2"]}][:chunk_size]
+
+    async def iter_sets(self, _: UUID | None, _chunk_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        for weight in range(3):
+            yield [{"id": f"s{weight}", "weight": weight, "rep_count": 5, "workout_id": "w1", "exercise_id": "e1"}]
+
+
+class FlakyHistoryRepository(FakeHistoryRepository):
+    def __init__(self, fail_on_batch: int) -> None:
+        super().__init__()
+        self.fail_on_batch = fail_on_batch
+        self.calls = 0
+
+    async def import_batch(self, user_id: UUID | None, rows: list[HistoryImportRow]) -> int:
+        self.calls += 1
+        if self.calls == self.fail_on_batch:
+            raise OSError
+        return await super().import_batch(user_id, rows)
+
+
+def make_row(index: int) -> dict[str, Any]:
+    return {"workout": "Push", "date": "2022-01-01", "exercise": f"Bench {index}", "weight": 100, "rep_count": 5}
+
+
+@given(values=records, chunk_size=st.integers(min_value=1, max_value=64))
+def test_json_reader_reads_arrays(values: list[dict[str, Any]], chunk_size: int) -> None:
+    stream = io.BytesIO(json.dumps(values, indent=2).encode())
+
+    assert list(JsonRecordReader(stream, chunk_size)) == values
+
+
+@given(values=records, chunk_size=st.integers(min_value=1, max_value=64))
+def test_json_reader_reads_newline_delimited_json(values: list[dict[str, Any]], chunk_size: int) -> None:
+    stream = io.BytesIO("\n".join(json.dumps(value) for value in values).encode())
+
+    assert list(JsonRecordReader(stream, chunk_size)) == values
+
+
+@pytest.mark.parametrize("content", [b'[{"workout": "Push"', b'{"workout": }', b"nonsense"])
+def test_json_reader_fails_with_invalid_json(content: bytes) -> None:
+    with pytest.raises(BusinessError) as error:
+        list(JsonRecordReader(io.BytesIO(content), chunk_size=4))
+    assert str(error.value) == INVALID_HISTORY_FILE
+
+
+def test_read_rows_reads_csv() -> None:
+    stream = io.BytesIO(b'\xef\xbb\xbfworkout,date,exercise,weight,rep_count\nPush,2022-01-01,"Bench, paused",100,5\n')
+
+    assert list(read_rows(stream, HistoryFormat.CSV)) == [
+        {"workout": "Push", "date": "2022-01-01", "exercise": "Bench, paused", "weight": "100", "rep_count": "5"}
+    ]
+
+
+@pytest.mark.parametrize(
+    ("history_format", "content"),
+    [(HistoryFormat.CSV, b"workout,date\nPush,\xff\n"), (HistoryFormat.JSON, b'[{"workout": "\xff"}]')],
+)
+def test_read_rows_fails_with_invalid_utf8(history_format: HistoryFormat, content: bytes) -> None:
+    with pytest.raises(BusinessError) as error:
+        list(read_rows(io.BytesIO(content), history_format))
+    assert str(error.value) == INVALID_HISTORY_FILE
+
+
+@pytest.mark.parametrize(
+    "filename, history_format",
+    [("history.csv", HistoryFormat.CSV), ("history.JSON", HistoryFormat.JSON), ("history.ndjson", HistoryFormat.JSON)],
+)
+def test_history_format_from_filename(filename: str, history_format: HistoryFormat) -> None:
+    assert HistoryFormat.from_filename(filename) == history_format
+
+
+@pytest.mark.parametrize("filename", ["history.xlsx", "history", None])
+def test_history_format_from_filename_fails_with_unsupported_format(filename: str | None) -> None:
+    with pytest.raises(BusinessError) as error:
+        HistoryFormat.from_filename(filename)
+    assert str(error.value) == UNSUPPORTED_HISTORY_FORMAT
+
+
+async def test_importer_commits_in_batches_and_reports_progress() -> None:
+    repository = FakeHistoryRepository()
+    progress: list[int] = []
+    importer = HistoryImporter(repository, batch_size=2, on_progress=lambda s: progress.append(s.rows))  # type: ignore[arg-type]
+
+    summary = await importer.run(None, [make_row(i) for i in range(5)])
+
+    assert [len(batch) for batch in repository.batches] == [2, 2, 1]
+    assert progress == [2, 4, 5]
+    assert (summary.rows, summary.batches, summary.sets) == (5, 3, 5)
+
+
+async def test_importer_resumes_from_row() -> None:
+    repository = FakeHistoryRepository()
+    importer = HistoryImporter(repository, batch_size=10)  # type: ignore[arg-type]
+
+    summary: ImportSummary = await importer.run(None, [make_row(i) for i in range(5)], resume_from=3)
+
+    assert [row.exercise for batch in repository.batches for row in batch] == ["Bench 3", "Bench 4"]
+    assert (summary.rows, summary.sets) == (5, 2)
+
+
+async def test_importer_reads_rows_off_the_event_loop() -> None:
+    threads: set[int] = set()
+
+    def rows() -> Iterator[dict[str, Any]]:
+        for i in range(3):
+            threads.add(threading.get_ident())
+            yield make_row(i)
+
+    await HistoryImporter(FakeHistoryRepository(), batch_size=2).run(None, rows())  # type: ignore[arg-type]
+
+    assert threads
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [
+        pytest.param({**make_row(0), "weight": -1}, "Field weight must be a positive integer", id="Business error"),
+        pytest.param({**make_row(0), "exercise": None}, "Field exercise cannot be empty", id="Missing value"),
+        pytest.param({"workout": "Push"}, "Field required", id="Validation error"),
+    ],
+)
+async def test_importer_fails_with_invalid_row(row: dict[str, Any], message: str) -> None:
+    repository = FakeHistoryRepository()
+    importer = HistoryImporter(repository, batch_size=1)  # type: ignore[arg-type]
+
+    with pytest.raises(BusinessError) as error:
+        await importer.run(None, [make_row(0), row])
+
+    assert str(error.value) == INVALID_HISTORY_ROW.format(2, message)
+    assert len(repository.batches) == 1
+
+
+async def test_resumable_import_skips_rows_committed_by_failed_attempts() -> None:
+    repository = FlakyHistoryRepository(fail_on_batch=3)
+    content = "\n".join(json.dumps(make_row(i)) for i in range(5)).encode()
+    work = ResumableImport(HistoryImporter(repository, batch_size=2), None, content, HistoryFormat.JSON)  # type: ignore[arg-type]
+
+    with pytest.raises(OSError):
+        await work()
+    summary = await work()
+
+    assert [row.exercise for batch in repository.batches for row in batch] == [f"Bench {i}" for i in range(5)]
+    assert (summary.rows, summary.batches, summary.sets) == (5, 3, 5)
+
+
+async def test_exporter_streams_ndjson() -> None:
+    exporter = HistoryExporter(FakeHistoryRepository(), chunk_size=1)  # type: ignore[arg-type]
+
+    chunks = [chunk async for chunk in exporter.stream(None, ExportFormat.NDJSON)]
+    records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    assert len(chunks) == 5  # noqa: PLR2004
+    assert [record["type"] for record in records] == ["exercise", "workout", "set", "set", "set"]
+    assert records[1]["exercises"] == ["e1", "e2"]
+
+
+async def test_exporter_streams_csv() -> None:
+    exporter = HistoryExporter(FakeHistoryRepository(), chunk_size=1)  # type: ignore[arg-type]
+
+    content = b"".join([chunk async for chunk in exporter.stream(None, ExportFormat.CSV)]).decode()
+    records = list(csv.DictReader(io.StringIO(content)))
+
+    assert [record["type"] for record in records] == ["exercise", "workout", "set", "set", "set"]
+    assert records[0]["notes"] == "Paused, slow"
+    assert records[1]["exercises"] == "e1 e2"
+    assert records[4]["weight"] == "2"
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from swole_v2.database.limiter import overloaded
+from swole_v2.errors.exceptions import BusinessError
+from swole_v2.errors.messages import DATABASE_BUSY, JOB_INTERRUPTED
+from swole_v2.jobs.runner import JobRunner
+from swole_v2.models import ImportSummary, JobRead, JobStatus
+
+
+class FakeJobRepository:
+    def __init__(self, start_errors: tuple[Exception, ...] = (), finish_errors: tuple[Exception, ...] = ()) -> None:
+        self.updates: list[tuple[str, Any, str | None]] = []
+        self.attempts = 0
+        # Raised by the next writes, as if the database dropped them
+        self.start_errors = list(start_errors)
+        self.finish_errors = list(finish_errors)
+        self.pending = False
+
+    async def create(self, _: UUID | None, kind: str) -> JobRead:
+        return JobRead(
+            id=uuid4(),
+            kind=kind,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            created_at=datetime(2022, 1, 1, tzinfo=timezone.utc),
+        )
+
+    async def enqueue(self, user_id: UUID | None, kind: str, _: int) -> JobRead | None:
+        return None if self.pending else await self.create(user_id, kind)
+
+    async def start(self, _: UUID) -> None:
+        self.attempts += 1
+        if self.start_errors:
+            raise self.start_errors.pop(0)
+
+    async def finish(self, _: UUID, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        if self.finish_errors:
+            raise self.finish_errors.pop(0)
+        self.updates.append((status.value, result, error))
+
+
+def failing(*errors: Exception) -> Any:
+    remaining = list(errors)
+
+    async def work() -> ImportSummary:
+        if remaining:
+            raise remaining.pop(0)
+        return ImportSummary(rows=1, batches=1, sets=1)
+
+    return work
+
+
+async def run(work: Any, max_attempts: int = 3, repository: FakeJobRepository | None = None) -> FakeJobRepository:
+    repository = repository or FakeJobRepository()
+    runner = JobRunner(repository, max_concurrency=1, max_attempts=max_attempts, retry_delay=0)  # type: ignore[arg-type]
+    await runner.submit(None, "test", work)
+    await asyncio.gather(*runner.tasks)
+    return repository
+
+
+@pytest.mark.parametrize(("pending", "runs"), [(False, 1), (True, 0)])
+async def test_work_is_skipped_while_a_job_of_its_kind_is_pending(pending: bool, runs: int) -> None:
+    repository = FakeJobRepository()
+    repository.pending = pending
+    runner = JobRunner(repository, max_concurrency=1, max_attempts=1, retry_delay=0)  # type: ignore[arg-type]
+
+    job = await runner.submit_unless_pending(None, "purge", failing(), timeout=60)
+    await asyncio.gather(*runner.tasks)
+
+    assert (job is not None) == bool(runs)
+    assert repository.attempts == runs
+
+
+async def test_successful_jobs_store_their_result() -> None:
+    repository = await run(failing())
+
+    assert repository.updates == [("Succeeded", {"rows": 1, "batches": 1, "sets": 1}, None)]
+
+
+async def test_overload_and_database_errors_are_retried() -> None:
+    repository = await run(failing(overloaded(), OSError("Connection reset")))
+
+    assert repository.attempts == 3  # noqa: PLR2004
+    assert [(status, error) for status, _, error in repository.updates] == [
+        ("Queued", DATABASE_BUSY),
+        ("Queued", "OSError: Connection reset"),
+        ("Succeeded", None),
+    ]
+
+
+async def test_jobs_fail_after_their_last_attempt() -> None:
+    repository = await run(failing(overloaded(), overloaded()), max_attempts=2)
+
+    assert [status for status, _, _ in repository.updates] == ["Queued", "Failed"]
+
+
+async def test_business_errors_are_not_retried() -> None:
+    repository = await run(failing(BusinessError("Row 2: Field required"), HTTPException(503)))
+
+    assert repository.attempts == 1
+    assert repository.updates == [("Failed", None, "Row 2: Field required")]
+
+
+async def test_client_errors_are_not_retried() -> None:
+    repository = await run(failing(HTTPException(404, "Not found")))
+
+    assert repository.attempts == 1
+    assert repository.updates == [("Failed", None, "Not found")]
+
+
+async def test_failing_to_start_a_job_is_retried() -> None:
+    repository = await run(failing(), repository=FakeJobRepository(start_errors=(overloaded(),)))
+
+    assert repository.attempts == 2  # noqa: PLR2004
+    assert [(status, error) for status, _, error in repository.updates] == [
+        ("Queued", DATABASE_BUSY),
+        ("Succeeded", None),
+    ]
+
+
+async def test_failing_to_requeue_a_job_still_retries_it(caplog: pytest.LogCaptureFixture) -> None:
+    repository = FakeJobRepository(finish_errors=(OSError("Connection reset"),))
+
+    with caplog.at_level(logging.ERROR):
+        await run(failing(overloaded()), repository=repository)
+
+    assert repository.attempts == 2  # noqa: PLR2004
+    assert [status for status, _, _ in repository.updates] == ["Succeeded"]
+    assert len(caplog.records) == 1
+
+
+async def test_failing_to_record_the_outcome_fails_the_job(caplog: pytest.LogCaptureFixture) -> None:
+    repository = FakeJobRepository(finish_errors=(OSError("Connection reset"),))
+
+    with caplog.at_level(logging.ERROR):
+        await run(failing(), repository=repository)
+
+    assert repository.updates == [("Failed", None, "OSError: Connection reset")]
+    assert len(caplog.records) == 1
+
+
+async def test_jobs_stay_unrecorded_when_the_database_is_gone(caplog: pytest.LogCaptureFixture) -> None:
+    repository = FakeJobRepository(finish_errors=(OSError("Connection reset"),) * 2)
+
+    with caplog.at_level(logging.ERROR):
+        await run(failing(), repository=repository)
+
+    assert repository.updates == []
+    assert len(caplog.records) == 2  # noqa: PLR2004
+
+
+async def test_unexpected_errors_fail_the_job() -> None:
+    repository = await run(failing(UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")))
+
+    assert repository.attempts == 1
+    assert repository.updates == [
+        ("Failed", None, "UnicodeDecodeError: 'utf-8' codec can't decode byte 0xff in position 0: invalid start byte")
+    ]
+
+
+async def test_stop_interrupts_running_and_waiting_jobs() -> None:
+    repository = FakeJobRepository()
+    runner = JobRunner(repository, max_concurrency=1, max_attempts=1, retry_delay=0)  # type: ignore[arg-type]
+
+    async def forever() -> ImportSummary:
+        await asyncio.Event().wait()
+        return ImportSummary()
+
+    for _ in range(2):
+        await runner.submit(None, "test", forever)
+    await asyncio.sleep(0)
+    await runner.stop(timeout=0.01)
+
+    assert repository.attempts == 1
+    assert repository.updates == [("Failed", None, JOB_INTERRUPTED)] * 2
+    assert not runner.tasks
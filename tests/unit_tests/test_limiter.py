@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from swole_v2.database.limiter import ConcurrencyLimiter, Priority
+from swole_v2.errors.messages import DATABASE_BUSY
+
+
+async def hold(limiter: ConcurrencyLimiter, priority: Priority, started: list[str], name: str) -> None:
+    async with limiter.slot(priority):
+        started.append(name)
+        await asyncio.sleep(0)
+
+
+async def test_queued_operations_run_by_priority() -> None:
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=10, queue_timeout=1)
+    started: list[str] = []
+
+    async with limiter.slot():
+        tasks = [
+            asyncio.create_task(hold(limiter, priority, started, priority.name))
+            for priority in (Priority.LOW, Priority.NORMAL, Priority.HIGH, Priority.NORMAL)
+        ]
+        await asyncio.sleep(0)
+        assert limiter.snapshot()["queued"] == 4  # noqa: PLR2004
+    await asyncio.gather(*tasks)
+
+    assert started == ["HIGH", "NORMAL", "NORMAL", "LOW"]
+    assert limiter.snapshot() == {
+        "in_flight": 0,
+        "peak_queued": 4,
+        "admitted": 5,
+        "shed": 0,
+        "timed_out": 0,
+        "queued": 0,
+    }
+
+
+async def test_operations_are_shed_when_the_queue_is_full() -> None:
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=0, queue_timeout=1)
+
+    async with limiter.slot():
+        with pytest.raises(HTTPException) as error:
+            await limiter.acquire(Priority.HIGH)
+
+    assert error.value.status_code == 503  # noqa: PLR2004
+    assert error.value.detail == DATABASE_BUSY
+    assert error.value.headers == {"Retry-After": "1"}
+    assert limiter.stats.shed == 1
+
+
+async def test_operations_are_shed_after_waiting_too_long() -> None:
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=10, queue_timeout=0.01)
+
+    async with limiter.slot():
+        with pytest.raises(HTTPException):
+            await limiter.acquire(Priority.NORMAL)
+
+    assert limiter.snapshot()["queued"] == 0
+    assert limiter.stats.timed_out == 1
+    assert limiter.stats.in_flight == 0
+
+
+async def test_cancelled_waiters_leave_the_queue() -> None:
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=10, queue_timeout=1)
+
+    async with limiter.slot():
+        task = asyncio.create_task(limiter.acquire(Priority.NORMAL))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.snapshot()["queued"] == 0
+
+    assert limiter.stats.in_flight == 0
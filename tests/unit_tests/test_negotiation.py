@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient, Response
+
+from swole_v2.errors.exceptions import BusinessError
+from swole_v2.errors.handlers import business_error_handler
+from swole_v2.errors.messages import INVALID_REQUEST_BODY, NO_WORKOUT_FOUND, REQUEST_BODY_TOO_LARGE
+from swole_v2.middleware import NegotiatedResponse, NegotiationMiddleware
+from swole_v2.middleware.negotiation import CODECS, JSON, Codec
+
+BINARY = "application/msgpack"
+BODY = [{"weight": 100, "rep_count": 5}]
+MAX_BODY_SIZE = 1024
+
+
+def encode(content: Any) -> bytes:
+    # Stands in for a binary encoding so negotiation is tested without its package
+    return b"\x00" + json.dumps(content).encode()
+
+
+def decode(body: bytes) -> Any:
+    if not body.startswith(b"\x00"):
+        raise ValueError("Not encoded")
+    return json.loads(body[1:])
+
+
+@pytest.fixture(autouse=True)
+def codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(CODECS, BINARY, Codec(encode, decode))
+
+
+async def echo(data: list[dict[str, int]]) -> dict[str, Any]:
+    return {"code": "ok", "results": data}
+
+
+async def fail() -> None:
+    raise BusinessError(NO_WORKOUT_FOUND)
+
+
+def create_app(media_types: list[str] | None = None) -> FastAPI:
+    app = FastAPI(default_response_class=NegotiatedResponse)
+    app.add_middleware(NegotiationMiddleware, media_types=media_types or [JSON, BINARY], max_body_size=MAX_BODY_SIZE)
+    app.add_exception_handler(BusinessError, business_error_handler)  # type: ignore[arg-type]
+    app.add_api_route("/echo", echo, methods=["POST"])
+    app.add_api_route("/fail", fail, methods=["POST"])
+    return app
+
+
+async def post(app: FastAPI, path: str, headers: dict[str, str], content: bytes = b"[]") -> Response:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(path, content=content, headers={"content-type": JSON, **headers})
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        ("", JSON),
+        ("*/*", JSON),
+        (BINARY, BINARY),
+        (f"{JSON};q=0.5, {BINARY}", BINARY),
+        (f"{JSON}, {BINARY}", JSON),
+    ],
+)
+async def test_responses_are_encoded_as_negotiated(accept: str, expected: str) -> None:
+    response = await post(create_app(), "/echo", {"accept": accept})
+
+    assert response.headers["content-type"] == expected
+    assert response.headers["vary"] == "accept"
+    assert (decode(response.content) if expected == BINARY else response.json()) == {"code": "ok", "results": []}
+
+
+async def test_error_responses_are_encoded_as_negotiated() -> None:
+    response = await post(create_app(), "/fail", {"accept": BINARY})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert decode(response.content) == {"code": "error", "message": NO_WORKOUT_FOUND}
+
+
+async def test_uninstalled_media_types_are_not_offered() -> None:
+    response = await post(create_app([JSON, "application/unknown"]), "/echo", {"accept": "application/unknown"})
+
+    assert response.headers["content-type"] == JSON
+
+
+async def test_binary_request_bodies_are_decoded() -> None:
+    response = await post(create_app(), "/echo", {"content-type": BINARY}, encode(BODY))
+
+    assert response.json() == {"code": "ok", "results": BODY}
+
+
+async def test_malformed_binary_request_bodies_are_rejected() -> None:
+    response = await post(create_app(), "/echo", {"content-type": BINARY}, b"[]")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"code": "error", "message": INVALID_REQUEST_BODY}
+
+
+async def test_oversized_binary_request_bodies_are_rejected() -> None:
+    response = await post(create_app(), "/echo", {"content-type": BINARY}, encode(BODY * MAX_BODY_SIZE))
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {"code": "error", "message": REQUEST_BODY_TOO_LARGE.format(MAX_BODY_SIZE)}
+
+
+async def test_json_request_bodies_are_not_capped() -> None:
+    # JSON bodies are streamed to the routes, where the batch size checks limit them
+    response = await post(create_app(), "/echo", {}, json.dumps(BODY * MAX_BODY_SIZE).encode())
+
+    assert response.json() == {"code": "ok", "results": BODY * MAX_BODY_SIZE}
+
+
+@pytest.mark.parametrize(("package", "media_type"), [("msgpack", "application/msgpack"), ("cbor2", "application/cbor")])
+async def test_installed_packages_round_trip(package: str, media_type: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    module = pytest.importorskip(package)
+    codec = Codec(module.packb, module.unpackb) if package == "msgpack" else Codec(module.dumps, module.loads)
+    monkeypatch.setitem(CODECS, media_type, codec)
+
+    response = await post(
+        create_app([JSON, media_type]), "/echo", {"content-type": media_type, "accept": media_type}, codec.encode(BODY)
+    )
+
+    assert codec.decode(response.content) == {"code": "ok", "results": BODY}
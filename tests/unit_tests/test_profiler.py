@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pstats
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient, Response
+
+from swole_v2.app import SwoleApp
+from swole_v2.middleware import ProfilerMiddleware
+from swole_v2.middleware.profiler import HEADER, DeterministicProfile, SamplingProfile
+from swole_v2.settings import Settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SECRET = "operator-secret"
+
+
+async def progress() -> dict[str, str]:
+    return {"code": "ok"}
+
+
+def create_middleware(directory: Path) -> ProfilerMiddleware:
+    app = FastAPI()
+    app.add_api_route("/exercises/progress", progress, methods=["POST"])
+    return ProfilerMiddleware(app, secret=SECRET, directory=str(directory), interval=0.001)
+
+
+async def post(middleware: ProfilerMiddleware, headers: dict[str, str]) -> Response:
+    async with AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test") as client:
+        return await client.post("/exercises/progress", headers=headers)
+
+
+async def test_requests_with_the_secret_are_profiled(tmp_path: Path) -> None:
+    response = await post(create_middleware(tmp_path), {HEADER: SECRET})
+
+    name = response.headers[HEADER]
+    assert "exercises-progress" in name
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+
+@pytest.mark.parametrize("headers", [{}, {HEADER: "guess"}])
+async def test_requests_without_the_secret_are_not_profiled(tmp_path: Path, headers: dict[str, str]) -> None:
+    response = await post(create_middleware(tmp_path), headers)
+
+    assert HEADER not in response.headers
+    assert not tmp_path.exists() or not list(tmp_path.iterdir())
+
+
+async def test_one_request_is_profiled_at_a_time(tmp_path: Path) -> None:
+    middleware = create_middleware(tmp_path)
+
+    async with middleware.lock:
+        response = await post(middleware, {HEADER: SECRET})
+
+    assert response.json() == {"code": "ok"}
+    assert HEADER not in response.headers
+
+
+async def test_sampling_profiles_are_saved_as_flame_graphs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("swole_v2.middleware.profiler.PROFILE", SamplingProfile)
+
+    response = await post(create_middleware(tmp_path), {HEADER: SECRET})
+
+    assert response.headers[HEADER].endswith(".html")
+
+
+async def test_deterministic_profiles_are_saved_as_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("swole_v2.middleware.profiler.PROFILE", DeterministicProfile)
+
+    response = await post(create_middleware(tmp_path), {HEADER: SECRET})
+
+    name = response.headers[HEADER]
+    functions = {function for _, _, function in pstats.Stats(str(tmp_path / name)).stats}  # type: ignore[attr-defined]
+    assert "progress" in functions
+
+
+@pytest.mark.parametrize(("secret", "expected"), [(None, False), (SECRET, True)])
+def test_profiler_is_only_added_with_a_secret(secret: str | None, expected: bool) -> None:
+    settings = Settings(SECRET_KEY="secret", EDGEDB_INSTANCE="test", PROFILER_SECRET=secret)
+
+    middleware: list[object] = [middleware.cls for middleware in SwoleApp(settings).app.user_middleware]
+
+    assert (ProfilerMiddleware in middleware) is expected
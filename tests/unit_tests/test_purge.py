@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from edgedb import TransactionConflictError
+
+from swole_v2.jobs.purge import Purge
+from swole_v2.models import PurgeSummary
+
+
+class FakePurgeRepository:
+    def __init__(self, sets: int, fail_after: int | None = None) -> None:
+        self.sets = sets
+        self.fail_after = fail_after
+        self.chunks: list[int] = []
+        self.jobs_purged = False
+
+    async def purge_sets(self, _: UUID | None, limit: int) -> int:
+        if self.fail_after is not None and len(self.chunks) == self.fail_after:
+            self.fail_after = None
+            raise TransactionConflictError
+        purged = min(self.sets, limit)
+        self.sets -= purged
+        self.chunks.append(purged)
+        return purged
+
+    async def purge_rows(self, _: UUID | None) -> dict[str, Any]:
+        # Rows are only removed once none of their sets are left
+        return {"workouts": 2, "exercises": 1} if self.sets == 0 else {"workouts": 0, "exercises": 0}
+
+    async def purge_jobs(self, _: UUID | None) -> int:
+        self.jobs_purged = True
+        return 1
+
+
+def make_purge(repository: FakePurgeRepository, chunk_size: int = 10) -> Purge:
+    return Purge(repository, uuid4(), chunk_size)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("sets", "chunks"),
+    [
+        (25, [10, 10, 5]),
+        (20, [10, 10, 0]),
+        (0, [0]),
+    ],
+)
+async def test_purge_removes_sets_in_chunks(sets: int, chunks: list[int]) -> None:
+    repository = FakePurgeRepository(sets)
+
+    summary = await make_purge(repository)()
+
+    assert repository.chunks == chunks
+    assert summary == PurgeSummary(sets=sets, workouts=2, exercises=1)
+    assert repository.jobs_purged
+
+
+async def test_retried_purges_add_up_every_attempt() -> None:
+    repository = FakePurgeRepository(25, fail_after=2)
+    purge = make_purge(repository)
+
+    with pytest.raises(TransactionConflictError):
+        await purge()
+    summary = await purge()
+
+    assert summary == PurgeSummary(sets=25, workouts=2, exercises=1)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+import click
+import pytest
+
+from cli.queries import GENERATED_PATH, QUERIES_PATH, parse, python_type, read_queries, render
+from swole_v2.database.queries.generated import QUERIES
+from swole_v2.database.queries.shapes import project
+from swole_v2.database.warmup import HOT_QUERIES, empty_arguments
+from swole_v2.errors.messages import NO_EXERCISE_FOUND, NO_WORKOUT_FOUND
+
+
+def test_generated_queries_are_up_to_date() -> None:
+    assert render(read_queries(QUERIES_PATH)) == GENERATED_PATH.read_text()
+
+
+def test_parse_finds_parameters_in_order() -> None:
+    query = parse(
+        "sets_update",
+        "UPDATE ExerciseSet FILTER .id = <uuid>$set_id AND .user.id = <uuid>$user_id "
+        "SET {weight := <optional int64>$weight, dates := array_unpack(<array<cal::local_date>>$dates)}",
+    )
+
+    assert query.parameters == {
+        "set_id": "uuid",
+        "user_id": "uuid",
+        "weight": "optional int64",
+        "dates": "array<cal::local_date>",
+    }
+
+
+def test_parse_finds_projected_shapes() -> None:
+    assert parse("exercises_get_all", QUERIES["exercises_get_all"]).projected
+    assert not parse("exercises_create", QUERIES["exercises_create"]).projected
+
+
+@pytest.mark.parametrize(
+    ("fields", "expected"),
+    [
+        (None, "SELECT Exercise {id, name := .cleaned_name, notes}  # projected"),
+        (("id",), "SELECT Exercise {id}  # projected"),
+        (("id", "name"), "SELECT Exercise {id, name := .cleaned_name}  # projected"),
+    ],
+)
+def test_project(fields: tuple[str, ...] | None, expected: str) -> None:
+    assert project("SELECT Exercise {id, name := .cleaned_name, notes}  # projected", fields) == expected
+
+
+def test_project_fails_with_unknown_fields() -> None:
+    with pytest.raises(ValueError, match="date"):
+        project(QUERIES["exercises_get_all"], ("id", "date"))
+
+
+def test_parse_fails_with_conflicting_casts() -> None:
+    with pytest.raises(click.ClickException):
+        parse("conflict", "SELECT <uuid>$id UNION <str>$id")
+
+
+@pytest.mark.parametrize(
+    ("kind", "expected"),
+    [
+        ("uuid", "UUID"),
+        ("optional int64", "int | None"),
+        ("array<cal::local_date>", "list[date]"),
+        ("array<json>", "list[str]"),
+    ],
+)
+def test_python_type(kind: str, expected: str) -> None:
+    assert python_type(kind) == expected
+
+
+def test_set_add_messages_match_error_messages() -> None:
+    assert f"message := '{NO_WORKOUT_FOUND}'" in QUERIES["sets_add"]
+    assert f"message := '{NO_EXERCISE_FOUND}'" in QUERIES["sets_add"]
+
+
+def test_hot_queries_are_in_the_catalog() -> None:
+    assert set(HOT_QUERIES) <= set(QUERIES)
+
+
+def test_empty_arguments() -> None:
+    assert empty_arguments({"user_id": "uuid", "weight": "optional int64", "workout_id": "array<uuid>"}) == {
+        "user_id": UUID(int=0),
+        "weight": None,
+        "workout_id": [],
+    }
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import msgpack
+import pytest
+import redis
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient, Response
+from jose import jwt
+
+from swole_v2.dependencies.settings import get_settings
+from swole_v2.errors.messages import INVALID_RATE_LIMIT, TOO_MANY_REQUESTS
+from swole_v2.middleware import NegotiationMiddleware, RateLimitMiddleware
+from swole_v2.middleware.rate_limit import MemoryBackend, RateLimit, RedisBackend
+
+
+async def ok() -> dict[str, str]:
+    return {"code": "ok"}
+
+
+def create_app(media_types: list[str] | None = None) -> FastAPI:
+    settings = get_settings().model_copy(
+        update={"RATE_LIMITS": {"/limited": "2/minute"}, "RATE_LIMIT_DEFAULT": None, "RATE_LIMIT_REDIS_URL": None}
+    )
+    app = FastAPI()
+    app.add_api_route("/limited", ok, methods=["POST"])
+    app.add_api_route("/unlimited", ok, methods=["POST"])
+    app.add_middleware(RateLimitMiddleware, settings=settings)
+    app.add_middleware(
+        NegotiationMiddleware,
+        media_types=media_types or ["application/json"],
+        max_body_size=settings.IMPORT_MAX_UPLOAD_SIZE,
+    )
+    return app
+
+
+async def post(client: AsyncClient, path: str, username: str | None = None) -> Response:
+    headers = {}
+    if username is not None:
+        token = jwt.encode({"username": username}, get_settings().SECRET_KEY, algorithm=get_settings().HASH_ALGORITHM)
+        headers["authorization"] = f"Bearer {token}"
+    return await client.post(path, headers=headers)
+
+
+async def test_requests_over_budget_are_rejected() -> None:
+    async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+        responses = [await post(client, "/limited") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[-1].json()["message"] == TOO_MANY_REQUESTS
+    assert responses[-1].headers["retry-after"] == "30"
+
+
+async def test_rejections_are_encoded_as_negotiated() -> None:
+    app = create_app(["application/json", "application/msgpack"])
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for _ in range(3):
+            response = await client.post("/limited", headers={"accept": "application/msgpack"})
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content)["message"] == TOO_MANY_REQUESTS
+
+
+async def test_users_have_separate_budgets() -> None:
+    async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+        first = [(await post(client, "/limited", "first")).status_code for _ in range(3)]
+        second = [(await post(client, "/limited", "second")).status_code for _ in range(2)]
+
+    assert first == [200, 200, 429]
+    assert second == [200, 200]
+
+
+async def test_routes_without_budget_are_not_limited() -> None:
+    async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="http://test") as client:
+        responses = [await post(client, "/unlimited") for _ in range(5)]
+
+    assert {response.status_code for response in responses} == {200}
+
+
+async def test_memory_backend_refills_over_time() -> None:
+    now = 0.0
+    backend = MemoryBackend(clock=lambda: now)
+    limit = RateLimit.parse("2/minute")
+
+    assert [await backend.take("key", limit) for _ in range(3)] == [0, 0, 30]
+    now = 30.0
+    assert await backend.take("key", limit) == 0
+    assert await backend.take("key", limit) == pytest.approx(30)
+
+
+async def test_memory_backend_drops_least_recently_used_buckets() -> None:
+    backend = MemoryBackend(max_size=2)
+    limit = RateLimit.parse("1/hour")
+
+    for key in ("first", "second", "third"):
+        await backend.take(key, limit)
+
+    assert list(backend.buckets) == ["second", "third"]
+
+
+class FakeScript:
+    """Stands in for the registered Lua script, failing while the fake server is down."""
+
+    def __init__(self, retry_after: str) -> None:
+        self.retry_after = retry_after
+        self.down = False
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(self, **kwargs: Any) -> str:
+        if self.down:
+            raise redis.ConnectionError("Connection refused")
+        self.calls.append(kwargs)
+        return self.retry_after
+
+
+async def test_redis_backend_takes_tokens_with_the_script() -> None:
+    backend = RedisBackend("redis://localhost")
+    backend.script = FakeScript("1.5")  # type: ignore[assignment]
+
+    assert await backend.take("key", RateLimit.parse("2/second")) == 1.5  # noqa: PLR2004
+    [call] = backend.script.calls  # type: ignore[attr-defined]
+    assert call["keys"] == ["rate-limit:key"]
+    assert call["args"][:2] == [2, 2.0]
+
+
+async def test_redis_backend_falls_back_to_memory_while_down(caplog: pytest.LogCaptureFixture) -> None:
+    backend = RedisBackend("redis://localhost", fallback=MemoryBackend(clock=lambda: 0.0))
+    script = backend.script = FakeScript("0")  # type: ignore[assignment]
+    limit = RateLimit.parse("1/minute")
+
+    script.down = True
+    with caplog.at_level(logging.WARNING):
+        assert [await backend.take("key", limit) for _ in range(2)] == [0, 60]
+    script.down = False
+
+    assert await backend.take("key", limit) == 0
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.parametrize("value", ["10", "ten/minute", "0/minute", "10/fortnight"])
+def test_invalid_rate_limits(value: str) -> None:
+    with pytest.raises(ValueError, match=INVALID_RATE_LIMIT.format(value)):
+        RateLimit.parse(value)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from uuid import uuid4
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from swole_v2.database.repositories.base import chunked, clean, to_columns, to_rows, to_series
+from swole_v2.database.repositories.exercises import progress_series
+from swole_v2.schemas import ExerciseCreate, SetAdd, WorkoutUpdate
+
+
+def test_clean_only_trims_spaces_like_str_trim() -> None:
+    assert clean("  Bench Press ") == "bench press"
+    assert clean("\tBench\n") == "\tbench\n"
+
+
+@given(items=st.lists(st.integers()), size=st.integers(min_value=1, max_value=10))
+def test_chunked_splits_items_into_bounded_chunks(items: list[int], size: int) -> None:
+    chunks = chunked(items, size)
+
+    assert [item for chunk in chunks for item in chunk] == items
+    assert all(0 < len(chunk) <= size for chunk in chunks)
+
+
+@given(items=st.lists(st.integers()))
+def test_chunked_without_size_returns_one_chunk(items: list[int]) -> None:
+    assert chunked(items, None) == [items]
+
+
+def test_to_columns_sends_one_typed_array_per_field() -> None:
+    workout_id, exercise_id = uuid4(), uuid4()
+    data = [
+        SetAdd.model_construct(rep_count=5, weight=100, workout_id=workout_id, exercise_id=exercise_id),
+        SetAdd.model_construct(rep_count=8, weight=80, workout_id=workout_id, exercise_id=exercise_id),
+    ]
+
+    assert to_columns(SetAdd, to_rows(data, unique=False)) == {
+        "rep_count": [5, 8],
+        "weight": [100, 80],
+        "workout_id": [workout_id, workout_id],
+        "exercise_id": [exercise_id, exercise_id],
+    }
+
+
+def test_to_columns_sends_nullable_fields_as_json() -> None:
+    workout_id = uuid4()
+    data = [WorkoutUpdate.model_construct(workout_id=workout_id, name=None, date=date(2022, 1, 1))]
+    columns = to_columns(WorkoutUpdate, to_rows(data, unique=True))
+
+    assert columns["workout_id"] == [workout_id]
+    assert [json.loads(value) for value in columns["name"]] == [None]
+    assert [json.loads(value) for value in columns["date"]] == ["2022-01-01"]
+
+
+@given(names=st.lists(st.sampled_from(["Squat", "Bench", "Row"])))
+def test_to_rows_removes_duplicates_in_order(names: list[str]) -> None:
+    data = [ExerciseCreate.model_construct(name=name, notes=None) for name in names]
+
+    assert [name for name, _ in to_rows(data, unique=True)] == list(dict.fromkeys(names))
+    assert len(to_rows(data, unique=False)) == len(names)
+
+
+def test_to_series_lays_out_one_array_per_field() -> None:
+    results = [{"id": "a", "weight": 100, "rep_count": 5}, {"id": "b", "weight": 120, "rep_count": 3}]
+
+    assert to_series(results, ["weight", "id"]) == {"weight": [100, 120], "id": ["a", "b"]}
+    assert to_series([], ["weight"]) == {"weight": []}
+
+
+def test_progress_series_are_in_date_order_with_rounded_averages() -> None:
+    results = [
+        {"name": "squat", "date": "2023-01-05", "avg_rep_count": 5.0, "avg_weight": 102.456, "max_weight": 110},
+        {"name": "squat", "date": "2023-01-02", "avg_rep_count": 4.333, "avg_weight": 100.0, "max_weight": 100},
+    ]
+
+    assert progress_series("Squat", results) == {
+        "exercise_name": "Squat",
+        "date": ["2023-01-02", "2023-01-05"],
+        "avg_rep_count": [4.33, 5.0],
+        "avg_weight": [100.0, 102.46],
+        "max_weight": [100, 110],
+    }
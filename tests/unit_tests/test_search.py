@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+from swole_v2.database.repositories.search import MAX_SEARCH_TERMS, search_patterns
+from swole_v2.database.search import ExerciseIndex, ExerciseSearchCache
+from swole_v2.models import ExerciseRead
+
+NAMES = ["Bench Press", "Back Squat", "Bent Over Row", "Deadlift", "Incline Bench Press", "Barbell Curl"]
+CUTOFF = 0.6
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_exercises(names: list[str]) -> list[ExerciseRead]:
+    return [ExerciseRead(id=uuid4(), name=name) for name in names]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("b", ["Back Squat", "Barbell Curl", "Bench Press"]),
+        ("  BEN", ["Bench Press", "Bent Over Row"]),
+        ("bench press", ["Bench Press"]),
+        ("dea", ["Deadlift"]),
+        ("bnech", ["Bench Press"]),
+        ("xyz", []),
+    ],
+)
+def test_exercise_index_search(query: str, expected: list[str]) -> None:
+    index = ExerciseIndex.build(make_exercises(NAMES))
+
+    assert [exercise.name for exercise in index.search(query, limit=3, cutoff=CUTOFF)] == expected
+
+
+def test_exercise_index_prefers_prefix_matches_over_fuzzy_ones() -> None:
+    index = ExerciseIndex.build(make_exercises(NAMES))
+
+    assert [exercise.name for exercise in index.search("bent", limit=2, cutoff=CUTOFF)] == [
+        "Bent Over Row",
+        "Bench Press",
+    ]
+
+
+def test_search_cache_expires_indexes() -> None:
+    clock = Clock()
+    cache = ExerciseSearchCache(max_users=2, ttl=10, clock=clock)
+    user_id = uuid4()
+
+    index = cache.put(user_id, cache.begin(user_id), make_exercises(NAMES))
+    assert cache.get(user_id) is index
+
+    clock.now = 11
+    assert cache.get(user_id) is None
+
+
+def test_search_cache_evicts_least_recently_used_users() -> None:
+    cache = ExerciseSearchCache(max_users=2, ttl=10)
+    first, second, third = uuid4(), uuid4(), uuid4()
+
+    for user_id in (first, second):
+        cache.put(user_id, cache.begin(user_id), [])
+    cache.get(first)
+    cache.put(third, cache.begin(third), [])
+
+    assert list(cache.indexes) == [first, third]
+
+
+def test_search_cache_drops_indexes_invalidated_while_building() -> None:
+    cache = ExerciseSearchCache(max_users=2, ttl=10)
+    user_id = uuid4()
+
+    token = cache.begin(user_id)
+    cache.invalidate(user_id)
+    index = cache.put(user_id, token, make_exercises(NAMES))
+
+    assert index.names
+    assert cache.get(user_id) is None
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Paused", [r"(?i)\mpaused"]),
+        ("deload  week deload", [r"(?i)\mdeload", r"(?i)\mweek"]),
+        ("(.*)+", []),
+        ("back-off sets", [r"(?i)\mback", r"(?i)\moff", r"(?i)\msets"]),
+    ],
+)
+def test_search_patterns(query: str, expected: list[str]) -> None:
+    assert search_patterns(query) == expected
+
+
+def test_search_patterns_are_capped() -> None:
+    assert len(search_patterns(" ".join(f"term{index}" for index in range(20)))) == MAX_SEARCH_TERMS
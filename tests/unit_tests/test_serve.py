@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cli import serve
+from swole_v2.dependencies.settings import get_settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("setting", "option", "cpus", "expected"),
+    [
+        (None, None, 8, 8),
+        (None, None, 1, 2),
+        (3, None, 8, 3),
+        (3, 5, 8, 5),
+    ],
+)
+def test_worker_count(
+    monkeypatch: pytest.MonkeyPatch, setting: int | None, option: int | None, cpus: int, expected: int
+) -> None:
+    monkeypatch.setattr(get_settings(), "SERVER_WORKERS", setting)
+
+    assert serve.server_options(get_settings(), cpus, "0.0.0.0:5000", workers=option)["workers"] == expected
+
+
+@pytest.mark.parametrize(("cpu_max", "expected"), [("150000 100000\n", 2), ("max 100000\n", 16), ("", 16)])
+def test_available_cpus_honours_cgroup_quota(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, cpu_max: str, expected: int
+) -> None:
+    monkeypatch.setattr(serve, "CPU_MAX_PATH", tmp_path / "cpu.max")
+    monkeypatch.setattr("os.sched_getaffinity", lambda _: set(range(16)))
+    serve.CPU_MAX_PATH.write_text(cpu_max)
+
+    assert serve.available_cpus() == expected
+
+
+@pytest.mark.parametrize(("requested", "expected"), [(2048, 1024), (512, 512)])
+def test_backlog_is_capped_at_somaxconn(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, requested: int, expected: int
+) -> None:
+    monkeypatch.setattr(serve, "SOMAXCONN_PATH", tmp_path / "somaxconn")
+    serve.SOMAXCONN_PATH.write_text("1024\n")
+
+    assert serve.max_backlog(requested) == expected
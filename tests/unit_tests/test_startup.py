@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+from edgedb import ClientConnectionFailedError
+
+from swole_v2.database.warmup import warm_up
+
+if TYPE_CHECKING:
+    import pytest
+
+
+class UnreachableClient:
+    def transaction(self) -> None:
+        raise ClientConnectionFailedError("database is down")  # type: ignore[no-untyped-call]
+
+
+def test_app_import_defers_auth_libraries() -> None:
+    # Passlib and jose are only needed once a password or token is handled, not to boot a worker
+    script = "import sys, swole_v2.main; print(' '.join(sorted({'jose', 'passlib'} & set(sys.modules))))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True, text=True)
+
+    assert result.stdout.strip() == ""
+
+
+async def test_warm_up_failures_do_not_stop_the_worker(caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.WARNING):
+        await warm_up(UnreachableClient())  # type: ignore[arg-type]
+
+    assert caplog.messages == ["Could not warm up the query cache"]
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from httpx import ASGITransport, AsyncClient, Response
+
+from swole_v2.app import SwoleApp
+from swole_v2.middleware import TracingMiddleware
+from swole_v2.settings import Settings
+from swole_v2.tracing import (
+    BackgroundExporter,
+    ConsoleExporter,
+    FileExporter,
+    Span,
+    TracedRoute,
+    get_exporter,
+    span,
+)
+from swole_v2.tracing.spans import parse_traceparent
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class ListExporter:
+    def __init__(self, _: Settings | None = None) -> None:
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.traces.append(spans)
+
+
+class FailingExporter:
+    def export(self, _: list[Span]) -> None:
+        raise OSError("Collector unavailable")
+
+
+class BlockedExporter(ListExporter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.unblocked = threading.Event()
+
+    def export(self, spans: list[Span]) -> None:
+        self.started.set()
+        self.unblocked.wait()
+        super().export(spans)
+
+
+async def current_user() -> str:
+    with span("user_lookup"):
+        return "user"
+
+
+async def workouts(user: str = Depends(current_user)) -> dict[str, str]:
+    with span("query", query="workouts_get_all"):
+        return {"user": user}
+
+
+def create_app(exporter: ListExporter, sample_rate: float = 1.0) -> FastAPI:
+    router = APIRouter(route_class=TracedRoute)
+    router.add_api_route("/workouts", workouts, methods=["POST"])
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TracingMiddleware, exporter=exporter, sample_rate=sample_rate)
+    return app
+
+
+async def post(app: FastAPI, headers: dict[str, str] | None = None) -> Response:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post("/workouts", headers=headers)
+
+
+@pytest.mark.parametrize(
+    ("traceparent", "expected"),
+    [
+        (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID.upper()}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+    ],
+)
+def test_parse_traceparent(traceparent: str, expected: tuple[str, str, bool]) -> None:
+    assert parse_traceparent(traceparent) == expected
+
+
+@pytest.mark.parametrize("traceparent", ["", "00-xyz-00f067aa0ba902b7-01", f"00-{'0' * 32}-{PARENT_ID}-01"])
+def test_parse_traceparent_starts_new_traces(traceparent: str) -> None:
+    trace_id, parent_id, sampled = parse_traceparent(traceparent)
+
+    assert len(trace_id) == len(TRACE_ID)
+    assert (parent_id, sampled) == (None, None)
+
+
+def test_spans_do_nothing_outside_of_traces() -> None:
+    with span("query") as recorded:
+        assert recorded is None
+
+
+async def test_requests_are_traced_stage_by_stage() -> None:
+    exporter = ListExporter()
+
+    response = await post(create_app(exporter))
+
+    [spans] = exporter.traces
+    names = {recorded.span_id: recorded.name for recorded in spans}
+    assert [(recorded.name, names.get(recorded.parent_id or "")) for recorded in spans] == [
+        ("request", None),
+        ("route", "request"),
+        ("validate", "route"),
+        ("user_lookup", "validate"),
+        ("endpoint", "route"),
+        ("query", "endpoint"),
+        ("serialize", "route"),
+    ]
+    assert all(recorded.duration is not None for recorded in spans)
+    assert spans[0].attributes == {"method": "POST", "path": "/workouts", "status_code": 200}
+    assert response.headers["x-request-id"] == spans[0].trace_id
+
+
+async def test_incoming_trace_context_is_continued() -> None:
+    exporter = ListExporter()
+
+    response = await post(create_app(exporter, sample_rate=0.0), {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    [spans] = exporter.traces
+    assert (spans[0].trace_id, spans[0].parent_id) == (TRACE_ID, PARENT_ID)
+    assert response.headers["traceparent"] == f"00-{TRACE_ID}-{spans[0].span_id}-01"
+
+
+async def test_unsampled_requests_are_not_exported() -> None:
+    exporter = ListExporter()
+
+    response = await post(create_app(exporter), {"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"})
+
+    assert exporter.traces == []
+    assert response.headers["x-request-id"] == TRACE_ID
+    assert response.headers["traceparent"].endswith("-00")
+
+
+def test_file_exporter_appends_a_line_per_span(tmp_path: Path) -> None:
+    root = Span("request", TRACE_ID, None)
+    root.child("query", {"query": "workouts_get_all"}).finish()
+    root.finish()
+
+    exporter = FileExporter(str(tmp_path / "traces.jsonl"))
+    exporter.export(root.spans)
+    exporter.export(root.spans)
+
+    lines = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["request", "query"] * 2
+    assert lines[1]["parent_id"] == root.span_id
+
+
+def test_console_exporter_indents_children() -> None:
+    written: list[str] = []
+    root = Span("request", TRACE_ID, None)
+    root.child("query", {}).finish()
+    root.finish()
+
+    ConsoleExporter(written.append).export(root.spans)
+
+    lines = written[0].splitlines()
+    assert lines[0] == f"trace {TRACE_ID}"
+    assert lines[2].endswith("ms   query")
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        (None, type(None)),
+        ("console", ConsoleExporter),
+        ("file", FileExporter),
+        ("tests.unit_tests.test_tracing:ListExporter", ListExporter),
+    ],
+)
+def test_get_exporter(name: str | None, expected: type) -> None:
+    settings = Settings(SECRET_KEY="secret", EDGEDB_INSTANCE="test", TRACING_EXPORTER=name)
+
+    assert isinstance(get_exporter(settings), expected)
+
+
+def test_background_exporter_exports_on_its_own_thread() -> None:
+    exporter = ListExporter()
+    background = BackgroundExporter(exporter)
+    root = Span("request", TRACE_ID, None)
+
+    background.export(root.spans)
+    background.close()
+
+    assert exporter.traces == [root.spans]
+    assert background.thread is not None
+    assert not background.thread.is_alive()
+
+
+def test_background_exporter_logs_export_errors(caplog: pytest.LogCaptureFixture) -> None:
+    background = BackgroundExporter(FailingExporter())
+
+    with caplog.at_level(logging.ERROR):
+        background.export(Span("request", TRACE_ID, None).spans)
+        background.close()
+
+    assert caplog.messages == [f"Could not export trace {TRACE_ID}"]
+
+
+def test_background_exporter_drops_traces_when_behind(caplog: pytest.LogCaptureFixture) -> None:
+    exporter = BlockedExporter()
+    background = BackgroundExporter(exporter, max_queue_size=1)
+    traces = [Span("request", f"{index:032x}", None).spans for index in range(3)]
+
+    with caplog.at_level(logging.WARNING):
+        background.export(traces[0])
+        exporter.started.wait()
+        for spans in traces[1:]:
+            background.export(spans)
+        exporter.unblocked.set()
+        background.close()
+
+    # The first trace is taken by the blocked thread and the second fills the queue, so the last is dropped
+    assert len(exporter.traces) == len(traces) - 1
+    assert caplog.messages == [f"Dropped trace {traces[-1][0].trace_id}, the exporter is falling behind"]
+
+
+def test_background_exporter_closes_without_exporting() -> None:
+    BackgroundExporter(ListExporter()).close()
+
+
+async def test_app_exports_queued_traces_on_shutdown() -> None:
+    settings = Settings(SECRET_KEY="secret", EDGEDB_INSTANCE="test", TRACING_EXPORTER="console", WARM_UP_QUERIES=False)
+    swole = SwoleApp(settings)
+    assert swole.exporter is not None
+
+    async with swole.lifespan(swole.app):
+        swole.exporter.export(Span("request", TRACE_ID, None).spans)
+
+    assert swole.exporter.queue.empty()
+    assert swole.exporter.thread is not None
+    assert not swole.exporter.thread.is_alive()
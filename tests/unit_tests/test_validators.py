@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+from datetime import date
 from typing import TYPE_CHECKING
 
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from swole_v2.dependencies.fields import sparse_fields
 from swole_v2.errors.exceptions import BusinessError
 from swole_v2.errors.messages import (
+    CALENDAR_TOO_LONG,
+    END_DATE_BEFORE_START_DATE,
+    FIELD_CANNOT_BE_EMPTY,
     INCORRECT_DATE_FORMAT,
     INVALID_ID,
+    RECURRENCE_TOO_LATE,
+    UNKNOWN_FIELDS,
 )
-from swole_v2.schemas.validators import check_date_format, check_uuid
+from swole_v2.models import WorkoutRead
+from swole_v2.schemas import WorkoutCalendar, WorkoutCreate, WorkoutRecurrence
+from swole_v2.schemas.validators import MAX_CALENDAR_DAYS, check_date_format, check_uuid
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -34,3 +43,69 @@ def test_check_date_format(value: str) -> None:
     with pytest.raises(BusinessError) as ex:
         check_date_format(value)  # type: ignore
     assert str(ex.value) == INCORRECT_DATE_FORMAT
+
+
+@given(value=st.dates())
+def test_check_date_format_accepts_iso_dates(value: date) -> None:
+    assert check_date_format(value.isoformat()) == value
+
+
+@given(value=st.dates(min_value=date(1000, 1, 1)))
+def test_check_date_format_accepts_dates_without_zero_padding(value: date) -> None:
+    assert check_date_format(f"{value.year}-{value.month}-{value.day}") == value
+
+
+@given(value=st.text(alphabet=" \t\n\r\x0b\x0c\u00a0\u2003"))
+def test_check_non_empty_fails_with_whitespace(value: str) -> None:
+    with pytest.raises(BusinessError) as ex:
+        WorkoutCreate(name=value, date="2022-01-01")  # type: ignore[arg-type]
+    assert str(ex.value) == FIELD_CANNOT_BE_EMPTY.format("name")
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "message"),
+    [
+        ("2023-01-02", "2023-01-01", END_DATE_BEFORE_START_DATE),
+        ("2022-01-01", "2023-01-07", CALENDAR_TOO_LONG.format(MAX_CALENDAR_DAYS)),
+    ],
+)
+def test_workout_calendar_rejects_invalid_windows(start_date: str, end_date: str, message: str) -> None:
+    with pytest.raises(BusinessError) as ex:
+        WorkoutCalendar(start_date=start_date, end_date=end_date)  # type: ignore[arg-type]
+    assert str(ex.value) == message
+
+
+def test_workout_calendar_accepts_a_heatmap_year() -> None:
+    calendar = WorkoutCalendar(start_date="2022-01-02", end_date="2023-01-07")  # type: ignore[arg-type]
+    assert (calendar.end_date - calendar.start_date).days == MAX_CALENDAR_DAYS - 1
+
+
+def test_workout_recurrence_rejects_dates_past_the_last_one() -> None:
+    with pytest.raises(BusinessError) as ex:
+        WorkoutRecurrence(start="9999-01-01", interval_days=7, count=366)  # type: ignore[arg-type]
+    assert str(ex.value) == RECURRENCE_TOO_LATE.format(date.max)
+
+
+@pytest.mark.parametrize(
+    ("fields", "expected"),
+    [
+        (None, None),
+        ("id", ("id",)),
+        (" date,id,, name ", ("id", "name", "date")),
+    ],
+)
+def test_sparse_fields(fields: str | None, expected: tuple[str, ...] | None) -> None:
+    assert sparse_fields(WorkoutRead)(fields) == expected
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        (" , ", FIELD_CANNOT_BE_EMPTY.format("fields")),
+        ("id,sets,notes", UNKNOWN_FIELDS.format("notes, sets", "id, name, date")),
+    ],
+)
+def test_sparse_fields_rejects_invalid_fields(fields: str, message: str) -> None:
+    with pytest.raises(BusinessError) as ex:
+        sparse_fields(WorkoutRead)(fields)
+    assert str(ex.value) == message
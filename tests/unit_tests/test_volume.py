@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import datetime
+from uuid import uuid4
+
+import pytest
+
+from swole_v2.database.volume import period_start, volume_changes
+
+SQUAT = uuid4()
+THURSDAY = datetime.date(2023, 3, 2)
+MONDAY = datetime.date(2023, 2, 27)
+
+
+def make_set(date: datetime.date, weight: int = 100, rep_count: int = 5) -> dict[str, object]:
+    return {"exercise_id": str(SQUAT), "date": date.isoformat(), "weight": weight, "rep_count": rep_count}
+
+
+@pytest.mark.parametrize(
+    ("period", "date", "expected"),
+    [
+        ("Week", THURSDAY, MONDAY),
+        ("Week", MONDAY, MONDAY),
+        ("Month", THURSDAY, datetime.date(2023, 3, 1)),
+        ("Month", MONDAY, datetime.date(2023, 2, 1)),
+    ],
+)
+def test_period_start(period: str, date: datetime.date, expected: datetime.date) -> None:
+    assert period_start(period, date) == expected
+
+
+def test_volume_changes_sum_sets_per_week_and_month() -> None:
+    changes = volume_changes(added=[make_set(THURSDAY), make_set(MONDAY, weight=50)])
+
+    assert changes == {
+        (SQUAT, "Week", MONDAY): [750, 2, 10],
+        (SQUAT, "Month", datetime.date(2023, 3, 1)): [500, 1, 5],
+        (SQUAT, "Month", datetime.date(2023, 2, 1)): [250, 1, 5],
+    }
+
+
+def test_volume_changes_subtract_removed_sets() -> None:
+    changes = volume_changes(added=[make_set(THURSDAY, weight=120)], removed=[make_set(THURSDAY)])
+
+    assert changes == {
+        (SQUAT, "Week", MONDAY): [100, 0, 0],
+        (SQUAT, "Month", datetime.date(2023, 3, 1)): [100, 0, 0],
+    }
+
+
+def test_volume_changes_leave_out_moves_that_cancel_out() -> None:
+    # Moved from Monday to Thursday, so only the month changes
+    changes = volume_changes(added=[make_set(THURSDAY)], removed=[make_set(MONDAY)])
+
+    assert changes == {
+        (SQUAT, "Month", datetime.date(2023, 3, 1)): [500, 1, 5],
+        (SQUAT, "Month", datetime.date(2023, 2, 1)): [-500, -1, -5],
+    }